@@ -553,6 +553,8 @@ def main():
         st.session_state.ssh_username = ""
     if 'ssh_password' not in st.session_state:
         st.session_state.ssh_password = ""
+    if 'ssh_host_group' not in st.session_state:
+        st.session_state.ssh_host_group = []
     # Local kubectl readiness flag
     if 'kubectl_local_ready' not in st.session_state:
         st.session_state.kubectl_local_ready = False
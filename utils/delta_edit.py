@@ -0,0 +1,252 @@
+import streamlit as st
+import hashlib
+import os
+import re
+import shlex
+import uuid
+from utils.result_cache import result_cache
+from utils.sftp_utils import sftp_session, upload_private_bytes
+from utils.ssh_utils import quote_remote_path, run_ssh_command_bytes
+
+EDIT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".main_menu_cache", "edit_cache")
+EDIT_CACHE_MAX_FILES = 200        # cached file versions kept (oldest removed first)
+EDIT_MAX_BYTES = 20 * 1024 * 1024
+DELTA_MIN_BLOCK = 256
+DELTA_MAX_BLOCK = 8192
+_MOD = 1 << 16
+
+
+def choose_block_size(size):
+    """About sqrt(size), like rsync, rounded to 64 bytes and clamped."""
+    return min(max(int(size ** 0.5) // 64 * 64, DELTA_MIN_BLOCK), DELTA_MAX_BLOCK)
+
+
+def _weak(block):
+    a = sum(block) % _MOD
+    b = sum((len(block) - i) * x for i, x in enumerate(block)) % _MOD
+    return a, b
+
+
+def _strong(block):
+    return hashlib.blake2b(block, digest_size=16).digest()
+
+
+def compute_delta(base, new, block_size):
+    """rsync's algorithm: matches every block_size window of new against base's blocks.
+
+    A rolling weak checksum finds candidates in O(1) per byte and a strong hash confirms them.
+    Returns a list of ("copy", base_offset, length) and ("literal", bytes) operations that
+    rebuild new from base; adjacent copies are merged.
+    """
+    signatures = {}
+    for index in range(len(base) // block_size):
+        block = base[index * block_size:(index + 1) * block_size]
+        a, b = _weak(block)
+        signatures.setdefault((b << 16) | a, {}).setdefault(_strong(block), index * block_size)
+
+    ops, literal_start, pos, n = [], 0, 0, len(new)
+
+    def emit_literal(end):
+        if end > literal_start:
+            ops.append(("literal", new[literal_start:end]))
+
+    if signatures and n >= block_size:
+        a, b = _weak(new[:block_size])
+        while pos + block_size <= n:
+            candidates = signatures.get((b << 16) | a)
+            offset = candidates.get(_strong(new[pos:pos + block_size])) if candidates else None
+            if offset is not None:
+                emit_literal(pos)
+                if ops and ops[-1][0] == "copy" and ops[-1][1] + ops[-1][2] == offset:
+                    ops[-1] = ("copy", ops[-1][1], ops[-1][2] + block_size)
+                else:
+                    ops.append(("copy", offset, block_size))
+                pos += block_size
+                literal_start = pos
+                if pos + block_size <= n:
+                    a, b = _weak(new[pos:pos + block_size])
+                continue
+            if pos + block_size < n:
+                out_byte, in_byte = new[pos], new[pos + block_size]
+                a = (a - out_byte + in_byte) % _MOD
+                b = (b - block_size * out_byte + a) % _MOD
+            pos += 1
+    # base's last, shorter block cannot be found by the rolling search; match it at the end directly.
+    tail = len(base) % block_size
+    if tail and n - tail >= literal_start and new[n - tail:] == base[-tail:]:
+        emit_literal(n - tail)
+        if ops and ops[-1][0] == "copy" and ops[-1][1] + ops[-1][2] == len(base) - tail:
+            ops[-1] = ("copy", ops[-1][1], ops[-1][2] + tail)
+        else:
+            ops.append(("copy", len(base) - tail, tail))
+        literal_start = n
+    emit_literal(n)
+    return ops
+
+
+def apply_delta(base, ops):
+    """Local counterpart of the remote patch script."""
+    return b"".join(base[op[1]:op[1] + op[2]] if op[0] == "copy" else op[1] for op in ops)
+
+
+def build_patch_script(path, base_sha, new_sha, ops, literal_path, new_path):
+    """Shell script that rebuilds the file on the host from its current content plus the literal bytes.
+
+    The current content must still hash to base_sha, and the result must hash to new_sha before it is
+    copied over the original (cp keeps the file's owner and mode). The rebuilt copy is private to its
+    owner (umask 077), and the temporary files are removed however the script exits.
+    """
+    t, lit, tmp = shlex.quote(path), shlex.quote(literal_path), shlex.quote(new_path)
+    lines = ["set -e",
+             "umask 077",
+             f"trap 'rm -f {lit} {tmp}' EXIT",
+             f'[ "$(sha256sum < {t} | cut -c1-64)" = {base_sha} ] || {{ echo "@@CONFLICT"; exit 3; }}',
+             "{", ":"]
+    literal_offset = 0
+    for op in ops:
+        if op[0] == "copy":
+            source, skip, count = t, op[1], op[2]
+        else:
+            source, skip, count = lit, literal_offset, len(op[1])
+            literal_offset += count
+        lines.append(f"dd if={source} iflag=skip_bytes,count_bytes skip={skip} count={count} bs=65536 status=none")
+    lines += [f"}} > {tmp}",
+              f'[ "$(sha256sum < {tmp} | cut -c1-64)" = {new_sha} ] || {{ echo "@@VERIFY_FAILED"; exit 4; }}',
+              f"cp {tmp} {t}",
+              'echo "@@OK"']
+    return "\n".join(lines) + "\n"
+
+
+def _cache_path(host, sha):
+    return os.path.join(EDIT_CACHE_DIR, re.sub(r"[^\w.-]", "_", host), sha)
+
+
+def cache_store(host, data):
+    sha = hashlib.sha256(data).hexdigest()
+    path = _cache_path(host, sha)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    entries = sorted((os.path.join(d, name) for d, _, names in os.walk(EDIT_CACHE_DIR) for name in names),
+                     key=os.path.getmtime)
+    for old in entries[:-EDIT_CACHE_MAX_FILES]:
+        os.remove(old)
+    return sha
+
+
+def cache_load(host, sha):
+    path = _cache_path(host, sha)
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        data = f.read()
+    return data if hashlib.sha256(data).hexdigest() == sha else None
+
+
+def open_for_edit(host, username, password, path, use_sudo=False):
+    """Resolves path and hashes it on the host; the content is only transferred if it is not cached.
+
+    Returns {"path", "sha", "data", "transferred", "sudo"}.
+    """
+    sudo = "sudo " if use_sudo else ""
+    # sha256sum opens the file itself: a "<" redirect would be opened by the login user's shell, not sudo.
+    exit_code, out, err = run_ssh_command_bytes(host, username, password,
+                                                f'f=$({sudo}readlink -f -- {quote_remote_path(path)}) && echo "$f" && '
+                                                f'{sudo}stat -c %s -- "$f" && {sudo}sha256sum -- "$f" | cut -c1-64')
+    lines = out.decode("utf-8", errors="replace").split("\n")
+    if exit_code != 0 or len(lines) < 3:
+        raise OSError(err or f"Could not read {path} (exit status {exit_code}).")
+    resolved, size, sha = lines[0], int(lines[1]), lines[2].strip()
+    if size > EDIT_MAX_BYTES:
+        raise ValueError(f"{resolved} is {size:,} bytes; the editor is limited to {EDIT_MAX_BYTES:,}.")
+    data, transferred = cache_load(host, sha), 0
+    if data is None:
+        if use_sudo:
+            exit_code, data, err = run_ssh_command_bytes(host, username, password, f"sudo cat -- {shlex.quote(resolved)}")
+            if exit_code != 0:
+                raise OSError(err or f"sudo cat exited with status {exit_code}")
+        else:
+            with sftp_session(host, username, password) as sftp:
+                with sftp.open(resolved, "rb") as remote:
+                    remote.prefetch(size)
+                    data = remote.read()
+        transferred = len(data)
+        if hashlib.sha256(data).hexdigest() != sha:
+            raise OSError(f"{resolved} changed while it was being read; please open it again.")
+        cache_store(host, data)
+    return {"path": resolved, "sha": sha, "data": data, "transferred": transferred, "sudo": use_sudo}
+
+
+def save_delta(host, username, password, state, new_data):
+    """Sends only the delta between the opened version and new_data, then verifies it on the host.
+
+    Returns stats; raises RuntimeError on a conflict (the file changed on the host since it was opened).
+    """
+    base = state["data"]
+    ops = compute_delta(base, new_data, choose_block_size(len(base)))
+    new_sha = hashlib.sha256(new_data).hexdigest()
+    literal = b"".join(op[1] for op in ops if op[0] == "literal")
+    token = uuid.uuid4().hex
+    literal_path, script_path, new_path = (f"/tmp/.delta_{token}.lit", f"/tmp/.delta_{token}.sh",
+                                           f"/tmp/.delta_{token}.new")
+    script = build_patch_script(state["path"], state["sha"], new_sha, ops, literal_path, new_path).encode()
+    result_cache.invalidate_host(host)
+    with sftp_session(host, username, password) as sftp:
+        upload_private_bytes(sftp, literal, literal_path)
+        upload_private_bytes(sftp, script, script_path)
+    sudo = "sudo " if state["sudo"] else ""
+    exit_code, out, err = run_ssh_command_bytes(host, username, password,
+                                                f"{sudo}sh {script_path}; rc=$?; rm -f {script_path}; exit $rc")
+    output = out.decode("utf-8", errors="replace")
+    if "@@CONFLICT" in output:
+        raise RuntimeError(f"{state['path']} was changed on the host since it was opened; open it again to merge.")
+    if exit_code != 0 or "@@OK" not in output:
+        raise RuntimeError(err or output.strip() or f"Patch exited with status {exit_code}")
+    cache_store(host, new_data)
+    state.update(sha=new_sha, data=new_data, transferred=0)
+    copied = sum(op[2] for op in ops if op[0] == "copy")
+    return {"size": len(new_data), "literal_bytes": len(literal), "copied_bytes": copied, "operations": len(ops),
+            "sent_bytes": len(literal) + len(script)}
+
+
+def render_delta_editor(host, username, password):
+    """Open a file once, edit it, and save only the changed blocks."""
+    cols = st.columns([4, 1, 1])
+    path = cols[0].text_input("File to edit", key="delta_edit_path")
+    use_sudo = cols[1].checkbox("Use sudo", key="delta_edit_sudo")
+    if cols[2].button("Open for Editing") and path:
+        try:
+            state = open_for_edit(host, username, password, path, use_sudo)
+            state["data"].decode("utf-8")
+            st.session_state.delta_edit = dict(state, host=host)
+            st.session_state.pop('delta_edit_result', None)
+        except UnicodeDecodeError:
+            st.error("This looks like a binary file; only UTF-8 text can be edited here.")
+        except Exception as e:
+            st.error(f"Could not open {path}: {e}")
+
+    state = st.session_state.get('delta_edit')
+    if not state or state["host"] != host:
+        return
+    base_text = state["data"].decode("utf-8")
+    st.caption(f"`{state['path']}`: {len(state['data']):,} bytes, sha256 {state['sha'][:12]}… "
+               + (f"({state['transferred']:,} bytes downloaded)" if state["transferred"] else "(served from the local cache)"))
+    text = st.text_area("Content", value=base_text, height=400, key=f"delta_edit_text_{state['sha']}")
+    if st.button("Save Changes (delta)"):
+        if "\r\n" in base_text:
+            # Browsers hand back "\n" line endings; keep the file's CRLF so unchanged lines stay unchanged.
+            text = text.replace("\r\n", "\n").replace("\n", "\r\n")
+        new_data = text.encode("utf-8")
+        if new_data == state["data"]:
+            st.info("No changes to save.")
+        else:
+            try:
+                st.session_state.delta_edit_result = save_delta(host, username, password, state, new_data)
+                st.rerun()
+            except Exception as e:
+                st.error(f"Save failed: {e}")
+    result = st.session_state.get('delta_edit_result')
+    if result:
+        st.success(f"Saved and verified by sha256: {result['sent_bytes']:,} bytes sent for a {result['size']:,}-byte file "
+                   f"({result['literal_bytes']:,} new bytes, {result['copied_bytes']:,} reused from the host copy, "
+                   f"{result['operations']} operations).")
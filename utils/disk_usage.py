@@ -0,0 +1,213 @@
+import streamlit as st
+import posixpath
+import shlex
+import time
+import pandas as pd
+import plotly.graph_objects as go
+from utils.ssh_utils import quote_remote_path, run_ssh_command_bytes
+
+DISK_SCAN_DEPTH = 4               # directory levels aggregated below the scan root
+DISK_SCAN_MAX_DEPTH = 8
+DISK_SCAN_TIMEOUT = 900
+DISK_TOP_FILES = 200              # largest files kept per scan
+DISK_TOP_MIN_BYTES = 1024 * 1024  # smaller files never reach the remote sort
+TREEMAP_MAX_NODES = 500
+
+# One find pass: allocated bytes (%b blocks, like du) are added to every ancestor directory down to
+# `depth` levels, and files over min_bytes go through a remote sort | head for the top-N list.
+_DU_AWK = r'''
+BEGIN { FS = "\t" }
+{
+    # Like du, a file with several hard links is only counted the first time it is seen.
+    if ($1 != "d" && $3 > 1) {
+        if ($4 in seen) next
+        seen[$4] = 1
+    }
+    size = $2 * 512
+    total[""] += size
+    if ($1 == "f") {
+        files[""]++
+        if (size >= min_bytes) printf "%.0f\t%s\n", size, $5 | top
+    }
+    if ($5 == "") next
+    k = split($5, parts, "/")
+    last = ($1 == "d") ? k : k - 1
+    if (last > depth) last = depth
+    prefix = ""
+    for (j = 1; j <= last; j++) {
+        prefix = (j == 1) ? parts[1] : prefix "/" parts[j]
+        total[prefix] += size
+        if ($1 == "f") files[prefix]++
+    }
+}
+END {
+    print "@@TOP"
+    fflush()
+    close(top)
+    print "@@DIRS"
+    for (d in total) printf "%.0f\t%d\t%s\n", total[d], files[d], d
+}
+'''
+
+
+def build_scan_command(root, depth=DISK_SCAN_DEPTH, top_n=DISK_TOP_FILES):
+    quoted = quote_remote_path(root)
+    return (f'echo "@@ROOT $(readlink -f {quoted})"; '
+            f"sudo find {quoted} -xdev -printf '%y\\t%b\\t%n\\t%i\\t%P\\n' | "
+            f"awk -v depth={int(depth)} -v min_bytes={DISK_TOP_MIN_BYTES} "
+            f"-v top={shlex.quote(f'sort -rn | head -n {int(top_n)}')} {shlex.quote(_DU_AWK)}")
+
+
+def parse_scan_output(text):
+    """Returns (root, dirs, files): dirs has path, parent, depth, bytes, files; files has path, bytes."""
+    root, section, dirs, files = None, None, [], []
+    for line in text.splitlines():
+        if line.startswith("@@ROOT "):
+            root = line[7:].strip()
+        elif line in ("@@TOP", "@@DIRS"):
+            section = line
+        elif section and "\t" in line:
+            if section == "@@TOP":
+                size, _, rel = line.partition("\t")
+                files.append({"path": posixpath.join(root, rel), "bytes": int(size)})
+            else:
+                size, count, rel = line.split("\t", 2)
+                path = posixpath.join(root, rel) if rel else root
+                dirs.append({"path": path, "parent": posixpath.dirname(path) if rel else "",
+                             "depth": rel.count("/") + 1 if rel else 0, "bytes": int(size), "files": int(count)})
+    if root is None or section != "@@DIRS":
+        raise ValueError("Scan output is incomplete.")
+    return root, pd.DataFrame(dirs).sort_values("bytes", ascending=False, ignore_index=True), pd.DataFrame(files, columns=["path", "bytes"])
+
+
+def scan_disk_usage(host, username, password, root, depth=DISK_SCAN_DEPTH):
+    """Runs one scan and returns a scan dict; the remote side only sends directory totals and top files."""
+    started = time.perf_counter()
+    exit_code, out, err = run_ssh_command_bytes(host, username, password, build_scan_command(root, depth),
+                                                timeout=DISK_SCAN_TIMEOUT)
+    try:
+        resolved, dirs, files = parse_scan_output(out.decode("utf-8", errors="replace"))
+    except ValueError:
+        raise RuntimeError(err or f"Scan exited with status {exit_code}")
+    if dirs.empty:
+        raise RuntimeError(err or f"Nothing found under {root}.")
+    warnings = err.splitlines()
+    return {"root": resolved, "depth": depth, "dirs": dirs, "files": files, "warnings": warnings,
+            "scanned_at": time.time(), "duration_s": time.perf_counter() - started}
+
+
+def find_scan(scans, path):
+    """The cached scan that already covers path's children, preferring the most specific root."""
+    covering = [scan for scan in scans.values()
+                if (path == scan["root"] or path.startswith(scan["root"].rstrip("/") + "/"))
+                and _depth_below(scan["root"], path) < scan["depth"]]
+    return max(covering, key=lambda scan: len(scan["root"]), default=None)
+
+
+def _depth_below(root, path):
+    if path == root:
+        return 0
+    return path[len(root.rstrip("/")) + 1:].count("/") + 1
+
+
+def subtree(dirs, path):
+    """path and the directories below it, from one scan's directory totals."""
+    prefix = path.rstrip("/") + "/"
+    return dirs[(dirs["path"] == path) | dirs["path"].str.startswith(prefix)]
+
+
+def treemap_figure(dirs, path, max_nodes=TREEMAP_MAX_NODES):
+    """Treemap of the largest directories below path.
+
+    Directory totals include everything below them, so the largest N always form a connected tree.
+    """
+    nodes = subtree(dirs, path).nlargest(max_nodes, "bytes")
+    parents = nodes["parent"].where(nodes["path"] != path, "")
+    fig = go.Figure(go.Treemap(ids=nodes["path"], labels=nodes["path"].map(lambda p: posixpath.basename(p) or p),
+                               parents=parents, values=nodes["bytes"], branchvalues="total",
+                               customdata=nodes["bytes"].map(format_bytes),
+                               hovertemplate="%{id}<br>%{customdata}<extra></extra>"))
+    fig.update_layout(margin=dict(t=10, l=10, r=10, b=10), height=550)
+    return fig
+
+
+def format_bytes(size):
+    for unit in ["B", "KiB", "MiB", "GiB", "TiB"]:
+        if size < 1024 or unit == "TiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def _drill_down():
+    target = st.session_state.disk_usage_drill
+    if target != "(choose)":
+        st.session_state.disk_usage_path = target
+        st.session_state.disk_usage_drill = "(choose)"
+
+
+def render_disk_usage(host, username, password):
+    """Scan controls, treemap and drill-down over cached scans, plus the largest files."""
+    if 'disk_usage_scans' not in st.session_state:
+        st.session_state.disk_usage_scans = {}
+    scans = st.session_state.disk_usage_scans
+    cols = st.columns([3, 1, 1])
+    root = cols[0].text_input("Directory to analyze", value="/", key="disk_usage_root")
+    depth = cols[1].number_input("Depth", min_value=1, max_value=DISK_SCAN_MAX_DEPTH, value=DISK_SCAN_DEPTH,
+                                 key="disk_usage_depth")
+    if cols[2].button("Scan"):
+        if root:
+            st.warning("Requires `sudo` with `NOPASSWD` to see every directory; the scan stays on one filesystem (-xdev).")
+            with st.spinner(f"Scanning {root}..."):
+                try:
+                    scan = scan_disk_usage(host, username, password, root, int(depth))
+                    scans[(host, scan["root"])] = scan
+                    st.session_state.disk_usage_path = scan["root"]
+                except Exception as e:
+                    st.error(f"Scan failed: {e}")
+        else: st.warning("Please enter a directory.")
+
+    host_scans = {key: scan for key, scan in scans.items() if key[0] == host}
+    path = st.session_state.get('disk_usage_path')
+    if not host_scans or not path:
+        return
+    n_cols = st.columns([1, 3])
+    if n_cols[0].button("⬆ Up") and path != "/":
+        path = st.session_state.disk_usage_path = posixpath.dirname(path)
+    scan = find_scan(host_scans, path)
+    if scan is None:
+        st.info(f"{path} is outside or below the cached scans.")
+        if st.button(f"Scan {path}"):
+            with st.spinner(f"Scanning {path}..."):
+                try:
+                    scan = scan_disk_usage(host, username, password, path, int(depth))
+                    scans[(host, scan["root"])] = scan
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"Scan failed: {e}")
+        return
+
+    dirs = scan["dirs"]
+    current = dirs[dirs["path"] == path].iloc[0]
+    st.caption(f"`{scan['root']}` scanned to depth {scan['depth']} in {scan['duration_s']:.1f}s, "
+               f"{int(time.time() - scan['scanned_at'])}s ago ({len(dirs):,} directories cached). "
+               f"`{path}`: {format_bytes(current['bytes'])} in {current['files']:,} files.")
+    for warning in scan["warnings"][:5]:
+        st.warning(warning)
+
+    children = dirs[dirs["parent"] == path]
+    if not children.empty:
+        sizes = dict(zip(children["path"], children["bytes"]))
+        n_cols[1].selectbox("Drill down into", ["(choose)"] + children["path"].tolist(),
+                            format_func=lambda p: p if p == "(choose)" else f"{posixpath.basename(p)}  ({format_bytes(sizes[p])})",
+                            key="disk_usage_drill", on_change=_drill_down)
+
+    st.plotly_chart(treemap_figure(dirs, path), use_container_width=True)
+    view = children.assign(size=children["bytes"].map(format_bytes),
+                           share_pct=(100 * children["bytes"] / max(current["bytes"], 1)).round(1))
+    st.dataframe(view[["path", "size", "share_pct", "files", "bytes"]], use_container_width=True, hide_index=True)
+
+    prefix = path.rstrip("/") + "/"
+    files = scan["files"][scan["files"]["path"].str.startswith(prefix)]
+    st.write(f"Largest files under `{path}` (files over {format_bytes(DISK_TOP_MIN_BYTES)})")
+    st.dataframe(files.assign(size=files["bytes"].map(format_bytes))[["path", "size", "bytes"]],
+                 use_container_width=True, hide_index=True)
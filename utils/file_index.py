@@ -0,0 +1,324 @@
+import streamlit as st
+import os
+import re
+import shlex
+import sqlite3
+import time
+import posixpath
+import pandas as pd
+from utils.ssh_utils import quote_remote_path, stream_ssh_command
+
+FILE_INDEX_DIR = os.path.join(os.path.expanduser("~"), ".main_menu_cache", "file_index")
+INDEX_MAX_BYTES = 2 * 1024 * 1024 * 1024
+INDEX_MAX_LINES = 20_000_000
+INDEX_BATCH_SIZE = 5000
+INDEX_MAX_NEW_DIRS = 200          # more new directories than this in a refresh triggers a full re-index
+INDEX_QUERY_LIMIT = 1000
+
+# type, size, mtime, path; one entry per line.
+FIND_FORMAT = r"%y\t%s\t%T@\t%p\n"
+FILE_TYPES = {"f": "file", "d": "directory", "l": "symlink"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    root TEXT NOT NULL, path TEXT NOT NULL, parent TEXT NOT NULL, name TEXT NOT NULL,
+    type TEXT NOT NULL, size INTEGER, mtime REAL, PRIMARY KEY (root, path)
+);
+CREATE INDEX IF NOT EXISTS files_name ON files (root, name);
+CREATE INDEX IF NOT EXISTS files_parent ON files (root, parent);
+CREATE TABLE IF NOT EXISTS roots (
+    root TEXT PRIMARY KEY, remote_time INTEGER, indexed_at REAL, entries INTEGER, duration_s REAL, mode TEXT
+);
+"""
+
+def index_path(host):
+    return os.path.join(FILE_INDEX_DIR, re.sub(r"[^\w.-]", "_", host) + ".sqlite")
+
+
+def open_index(host):
+    os.makedirs(FILE_INDEX_DIR, exist_ok=True)
+    db = sqlite3.connect(index_path(host))
+    db.executescript(_SCHEMA)
+    return db
+
+
+def build_full_index_command(root):
+    return f'echo "@@T $(date +%s)"; sudo find {quote_remote_path(root)} -xdev -printf \'U\\t{FIND_FORMAT}\''
+
+
+def build_refresh_command(root, since):
+    """Entries whose inode changed since the last pass, plus full listings of changed directories.
+
+    A changed directory is re-listed so entries deleted or renamed away from it can be dropped.
+    """
+    target = quote_remote_path(root)
+    return (f'echo "@@T $(date +%s)"; '
+            f"sudo find {target} -xdev -newerct @{int(since)} ! -type d -printf 'U\\t{FIND_FORMAT}'; "
+            f"sudo find {target} -xdev -type d -newerct @{int(since)} -printf 'D\\t%p\\n' "
+            f"-exec find {{}} -mindepth 1 -maxdepth 1 -printf 'U\\t{FIND_FORMAT}' \\;")
+
+
+def build_subtree_command(paths):
+    targets = " ".join(shlex.quote(path) for path in paths)
+    return f"sudo find {targets} -xdev -mindepth 1 -printf 'U\\t{FIND_FORMAT}'"
+
+
+def parse_index_line(line):
+    """Returns ("T", epoch), ("D", path), ("U", (type, size, mtime, path)) or None for noise."""
+    if line.startswith("@@T "):
+        return "T", int(line[4:].strip())
+    kind, _, rest = line.partition("\t")
+    if kind == "D":
+        return "D", rest
+    if kind != "U":
+        return None
+    parts = rest.split("\t", 3)
+    if len(parts) != 4:
+        return None
+    ftype, size, mtime, path = parts
+    try:
+        return "U", (FILE_TYPES.get(ftype, ftype), int(size), float(mtime), path)
+    except ValueError:
+        return None
+
+
+def _upsert(db, root, entries):
+    db.executemany(
+        "INSERT OR REPLACE INTO files (root, path, parent, name, type, size, mtime) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [(root, path, posixpath.dirname(path), posixpath.basename(path), ftype, size, mtime)
+         for ftype, size, mtime, path in entries])
+
+
+def _delete_subtree(db, root, path):
+    # path + "0" is the first string after every "path/..." since "0" follows "/" in byte order.
+    db.execute("DELETE FROM files WHERE root = ? AND (path = ? OR (path >= ? AND path < ?))",
+               (root, path, path + "/", path + "0"))
+
+
+def _stream_index(host, username, password, command, handle, progress=None):
+    """Feeds parsed lines to handle(kind, value). Returns (remote_time, exit_code, notes)."""
+    remote_time, exit_code, notes, count = None, None, [], 0
+    for stream, line in stream_ssh_command(host, username, password, command,
+                                           max_bytes=INDEX_MAX_BYTES, max_lines=INDEX_MAX_LINES):
+        if stream == "stdout":
+            parsed = parse_index_line(line)
+            if parsed is None:
+                continue
+            if parsed[0] == "T":
+                remote_time = parsed[1]
+            else:
+                handle(*parsed)
+                count += 1
+                if progress and count % 10000 == 0:
+                    progress(count)
+        elif stream == "stderr":
+            if len(notes) < 20:
+                notes.append(line)
+        elif stream == "truncated":
+            notes.append(line)
+        elif stream == "exit":
+            exit_code = line
+    return remote_time, exit_code, notes
+
+
+def build_index(host, username, password, root, progress=None):
+    """Full pass: replaces every indexed entry under root. Returns a summary dict."""
+    started = time.perf_counter()
+    db = open_index(host)
+    batch = []
+    try:
+        db.execute("DELETE FROM files WHERE root = ?", (root,))
+
+        def handle(kind, value):
+            if kind == "U":
+                batch.append(value)
+                if len(batch) >= INDEX_BATCH_SIZE:
+                    _upsert(db, root, batch)
+                    batch.clear()
+
+        remote_time, exit_code, notes = _stream_index(host, username, password, build_full_index_command(root),
+                                                      handle, progress)
+        received = db.execute("SELECT COUNT(*) FROM files WHERE root = ?", (root,)).fetchone()[0] + len(batch)
+        if exit_code is None or remote_time is None or (exit_code != 0 and not received):
+            db.rollback()
+            return {"ok": False, "notes": notes or ["The index pass did not complete; the previous index was kept."]}
+        _upsert(db, root, batch)
+        return _finish(db, root, remote_time, started, "full", notes)
+    finally:
+        db.close()
+
+
+def _existing_paths(db, root, paths, chunk=500):
+    found = set()
+    for i in range(0, len(paths), chunk):
+        part = paths[i:i + chunk]
+        found.update(path for (path,) in db.execute(
+            f"SELECT path FROM files WHERE root = ? AND path IN ({','.join('?' * len(part))})", [root] + part))
+    return found
+
+
+def refresh_index(host, username, password, root, progress=None):
+    """Incremental pass based on inode change times since the previous pass; falls back to a full pass."""
+    db = open_index(host)
+    try:
+        row = db.execute("SELECT remote_time FROM roots WHERE root = ?", (root,)).fetchone()
+        if not row or row[0] is None:
+            return build_index(host, username, password, root, progress)
+        started = time.perf_counter()
+        changed_dirs, entries = [], []
+
+        def handle(kind, value):
+            (changed_dirs if kind == "D" else entries).append(value)
+
+        # Step back a second: ctime has sub-second precision but the reference time does not.
+        remote_time, exit_code, notes = _stream_index(host, username, password,
+                                                      build_refresh_command(root, row[0] - 1), handle, progress)
+        if exit_code is None or remote_time is None:
+            return {"ok": False, "notes": notes or ["The refresh did not complete; the index was not changed."]}
+
+        listed = {}
+        for ftype, size, mtime, path in entries:
+            listed.setdefault(posixpath.dirname(path), set()).add(path)
+        for directory in changed_dirs:
+            current = listed.get(directory, set())
+            for (path,) in db.execute("SELECT path FROM files WHERE root = ? AND parent = ?", (root, directory)).fetchall():
+                if path not in current:
+                    _delete_subtree(db, root, path)
+
+        dir_paths = [entry[3] for entry in entries if entry[0] == "directory"]
+        known = _existing_paths(db, root, dir_paths)
+        new_dirs = [path for path in dir_paths if path not in known and path not in changed_dirs]
+        if len(new_dirs) > INDEX_MAX_NEW_DIRS:
+            db.rollback()
+            return build_index(host, username, password, root, progress)
+        _upsert(db, root, entries)
+        if new_dirs:
+            # Directories moved or copied in keep their old child ctimes, so list them in full.
+            subtree = []
+            _, _, more_notes = _stream_index(host, username, password, build_subtree_command(new_dirs),
+                                             lambda kind, value: subtree.append(value), progress)
+            _upsert(db, root, subtree)
+            notes += more_notes
+        return _finish(db, root, remote_time, started, "incremental", notes,
+                       changed=len(entries), changed_dirs=len(changed_dirs))
+    finally:
+        db.close()
+
+
+def _finish(db, root, remote_time, started, mode, notes, **extra):
+    entries = db.execute("SELECT COUNT(*) FROM files WHERE root = ?", (root,)).fetchone()[0]
+    duration = time.perf_counter() - started
+    db.execute("INSERT OR REPLACE INTO roots (root, remote_time, indexed_at, entries, duration_s, mode) VALUES (?, ?, ?, ?, ?, ?)",
+               (root, remote_time, time.time(), entries, duration, mode))
+    db.commit()
+    return {"ok": True, "mode": mode, "entries": entries, "duration_s": duration, "notes": notes, **extra}
+
+
+def index_info(host):
+    """DataFrame of indexed roots for host with their age, or an empty frame."""
+    if not os.path.exists(index_path(host)):
+        return pd.DataFrame()
+    db = open_index(host)
+    try:
+        return pd.read_sql_query("SELECT root, entries, indexed_at, duration_s, mode, remote_time FROM roots ORDER BY root", db)
+    finally:
+        db.close()
+
+
+def query_index(host, root, name=None, glob=None, min_size=None, max_size=None, modified_within_days=None,
+                older_than_days=None, file_type=None, order_by="path", limit=INDEX_QUERY_LIMIT):
+    """Answers a query from the local index. Returns (DataFrame, total_matches, elapsed_ms).
+
+    Ages are measured from the remote clock at the time of the last index pass.
+    """
+    started = time.perf_counter()
+    db = open_index(host)
+    try:
+        row = db.execute("SELECT remote_time FROM roots WHERE root = ?", (root,)).fetchone()
+        reference = row[0] if row and row[0] else time.time()
+        clauses, params = ["root = ?"], [root]
+        if name:
+            clauses.append("name LIKE ? ESCAPE '\\'")
+            params.append("%" + re.sub(r"([%_\\])", r"\\\1", name) + "%")
+        if glob:
+            clauses.append("name GLOB ?")
+            params.append(glob)
+        if min_size is not None:
+            clauses.append("size >= ?")
+            params.append(int(min_size))
+        if max_size is not None:
+            clauses.append("size <= ?")
+            params.append(int(max_size))
+        if modified_within_days is not None:
+            clauses.append("mtime >= ?")
+            params.append(reference - modified_within_days * 86400)
+        if older_than_days is not None:
+            clauses.append("mtime < ?")
+            params.append(reference - older_than_days * 86400)
+        if file_type:
+            clauses.append("type = ?")
+            params.append(file_type)
+        where = " AND ".join(clauses)
+        order = {"path": "path", "size": "size DESC", "mtime": "mtime DESC", "name": "name"}[order_by]
+        total = db.execute(f"SELECT COUNT(*) FROM files WHERE {where}", params).fetchone()[0]
+        df = pd.read_sql_query(f"SELECT path, type, size, mtime FROM files WHERE {where} ORDER BY {order} LIMIT ?",
+                               db, params=params + [int(limit)])
+    finally:
+        db.close()
+    df["mtime"] = pd.to_datetime(df["mtime"], unit="s")
+    return df, total, (time.perf_counter() - started) * 1000
+
+
+def render_file_index(host, username, password):
+    """Index status, (re-)index buttons and a query form answered from the local SQLite index."""
+    root = st.text_input("Directory to index", value="/", key="file_index_root")
+    status_line = st.empty()
+    cols = st.columns(2)
+    action = None
+    if cols[0].button("Refresh Index (incremental)"):
+        action = refresh_index
+    if cols[1].button("Re-index from Scratch"):
+        action = build_index
+    if action is not None and root:
+        progress_line = st.empty()
+        result = action(host, username, password, root,
+                        lambda count: progress_line.caption(f"{count:,} entries received..."))
+        progress_line.empty()
+        if result["ok"]:
+            detail = (f", {result['changed']:,} changed entries in {result['changed_dirs']:,} changed directories"
+                      if result["mode"] == "incremental" else "")
+            st.success(f"{result['mode'].capitalize()} pass done in {result['duration_s']:.1f}s: "
+                       f"{result['entries']:,} entries indexed{detail}.")
+        else:
+            st.error("Indexing failed.")
+        for note in result["notes"][:10]:
+            st.caption(note)
+
+    info = index_info(host)
+    entry = info[info["root"] == root] if not info.empty else info
+    if entry.empty:
+        status_line.caption(f"`{root}` has not been indexed on {host} yet.")
+        return
+    row = entry.iloc[0]
+    age = int(time.time() - row["indexed_at"])
+    status_line.caption(f"Index of `{root}` on {host}: {row['entries']:,} entries, {row['mode']} pass "
+                        f"{age // 60} min {age % 60}s ago (took {row['duration_s']:.1f}s).")
+
+    st.write("#### Query the Index")
+    q_cols = st.columns(3)
+    name = q_cols[0].text_input("Name contains", key="file_index_name")
+    glob = q_cols[1].text_input("Name glob (e.g. *.log)", key="file_index_glob")
+    file_type = q_cols[2].selectbox("Type", ["(any)"] + list(FILE_TYPES.values()), key="file_index_type")
+    s_cols = st.columns(4)
+    min_mb = s_cols[0].number_input("Min size (MB)", min_value=0.0, value=0.0, key="file_index_min")
+    max_mb = s_cols[1].number_input("Max size (MB, 0 = no limit)", min_value=0.0, value=0.0, key="file_index_max")
+    within = s_cols[2].number_input("Modified within (days, 0 = any)", min_value=0, value=0, key="file_index_within")
+    older = s_cols[3].number_input("Older than (days, 0 = any)", min_value=0, value=0, key="file_index_older")
+    order_by = st.selectbox("Order by", ["path", "size", "mtime", "name"], key="file_index_order")
+    df, total, elapsed_ms = query_index(
+        host, root, name=name or None, glob=glob or None,
+        min_size=min_mb * 1024 * 1024 if min_mb else None, max_size=max_mb * 1024 * 1024 if max_mb else None,
+        modified_within_days=within or None, older_than_days=older or None,
+        file_type=None if file_type == "(any)" else file_type, order_by=order_by)
+    st.caption(f"{total:,} matches in {elapsed_ms:.1f} ms (showing up to {INDEX_QUERY_LIMIT:,}).")
+    st.dataframe(df, use_container_width=True, hide_index=True)
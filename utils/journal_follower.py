@@ -0,0 +1,130 @@
+import streamlit as st
+import json
+import shlex
+from collections import deque
+import pandas as pd
+from utils.ssh_utils import execute_ssh_command
+
+JOURNAL_INITIAL_ENTRIES = 200     # entries fetched on the first poll (no cursor yet)
+JOURNAL_FETCH_LIMIT = 2000        # max entries per poll; the next poll continues from the last cursor
+JOURNAL_MAX_RECORDS = 10000       # parsed entries kept per host and filter combination
+JOURNAL_REFRESH_SECONDS = 5
+
+# Only these fields are sent back; __CURSOR and __REALTIME_TIMESTAMP are always included.
+JOURNAL_FIELDS = ["MESSAGE", "PRIORITY", "_PID", "_SYSTEMD_UNIT", "SYSLOG_IDENTIFIER"]
+PRIORITY_NAMES = ["emerg", "alert", "crit", "err", "warning", "notice", "info", "debug"]
+RECORD_COLUMNS = ["time", "unit", "priority", "level", "pid", "message"]
+
+
+def build_journal_command(cursor=None, units=None, max_priority=None, limit=JOURNAL_FETCH_LIMIT):
+    """journalctl JSON output limited to entries after cursor (or the latest few on the first poll).
+
+    units and max_priority are applied by journalctl itself, so filtered-out entries never leave
+    the host.
+    """
+    args = ["sudo", "journalctl", "--no-pager", "-o", "json", f"--output-fields={','.join(JOURNAL_FIELDS)}"]
+    if cursor:
+        args.append(f"--after-cursor={cursor}")
+    else:
+        args += ["-n", str(JOURNAL_INITIAL_ENTRIES)]
+    for unit in units or []:
+        args += ["-u", unit]
+    if max_priority is not None:
+        args += ["-p", str(max_priority)]
+    return " ".join(shlex.quote(arg) for arg in args) + f" | head -n {int(limit)}"
+
+
+def _field_text(value):
+    # journald sends non-UTF-8 or binary fields as arrays of byte values.
+    if isinstance(value, list):
+        return bytes(value).decode("utf-8", errors="replace")
+    return value if value is not None else ""
+
+
+def parse_journal_json(output):
+    """Parses journalctl -o json lines into (records, last_cursor)."""
+    records, cursor = [], None
+    for line in output.splitlines():
+        line = line.strip()
+        if not line.startswith("{"):
+            continue
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        priority = entry.get("PRIORITY")
+        priority = int(priority) if str(priority).isdigit() else None
+        records.append({
+            "time": pd.to_datetime(int(entry.get("__REALTIME_TIMESTAMP", 0)), unit="us"),
+            "unit": _field_text(entry.get("_SYSTEMD_UNIT") or entry.get("SYSLOG_IDENTIFIER")),
+            "priority": priority,
+            "level": PRIORITY_NAMES[priority] if priority is not None and priority < len(PRIORITY_NAMES) else "",
+            "pid": int(entry["_PID"]) if str(entry.get("_PID", "")).isdigit() else None,
+            "message": _field_text(entry.get("MESSAGE")),
+        })
+        cursor = entry.get("__CURSOR", cursor)
+    return records, cursor
+
+
+def _follower_state(host, units=None, max_priority=None):
+    """Cursor and buffer for one host and filter combination.
+
+    A cursor only makes sense for the stream it came from: reusing it after the filters change
+    would skip the new stream's backfill and everything before that position.
+    """
+    if 'journal_followers' not in st.session_state:
+        st.session_state.journal_followers = {}
+    return st.session_state.journal_followers.setdefault(
+        (host, tuple(units or []), max_priority),
+        {"cursor": None, "records": deque(maxlen=JOURNAL_MAX_RECORDS), "last_batch": 0})
+
+
+def poll_journal(host, username, password, units=None, max_priority=None):
+    """Fetches entries newer than the stored cursor and appends them to the record buffer for these filters."""
+    state = _follower_state(host, units, max_priority)
+    output, error = execute_ssh_command(host, username, password,
+                                        build_journal_command(state["cursor"], units, max_priority), use_cache=False)
+    if error and not output:
+        if "cursor" in error.lower():
+            state["cursor"] = None
+            st.warning("The saved journal position is no longer valid (journal rotated?); starting from the latest entries.")
+        else:
+            st.error(error)
+        return 0
+    records, cursor = parse_journal_json(output)
+    state["records"].extend(records)
+    if cursor:
+        state["cursor"] = cursor
+    state["last_batch"] = len(records)
+    return len(records)
+
+
+def _render_journal_table(host, username, password, units, max_priority, auto):
+    if auto:
+        poll_journal(host, username, password, units, max_priority)
+    state = _follower_state(host, units, max_priority)
+    df = pd.DataFrame(list(state["records"]), columns=RECORD_COLUMNS)
+    st.caption(f"{len(state['records'])} entries buffered for these filters, {state['last_batch']} new in the last poll. "
+               f"Times are UTC.")
+    st.dataframe(df.iloc[::-1], use_container_width=True, hide_index=True)
+
+
+def render_journal_follower(host, username, password):
+    """Unit/priority filters, manual or timed polling, and a newest-first table of parsed entries."""
+    filter_cols = st.columns([3, 1, 1])
+    unit_text = filter_cols[0].text_input("Units (comma-separated, blank for all)", key="journal_units")
+    units = [unit if "." in unit else f"{unit}.service" for unit in (u.strip() for u in unit_text.split(",")) if unit]
+    level = filter_cols[1].selectbox("Priority at least", ["(any)"] + PRIORITY_NAMES, key="journal_priority")
+    max_priority = None if level == "(any)" else PRIORITY_NAMES.index(level)
+    auto = filter_cols[2].checkbox(f"Auto-refresh every {JOURNAL_REFRESH_SECONDS}s", key="journal_auto")
+
+    button_cols = st.columns(2)
+    if button_cols[0].button("Fetch New Journal Entries"):
+        poll_journal(host, username, password, units, max_priority)
+    if button_cols[1].button("Reset Journal Follower"):
+        st.session_state.get('journal_followers', {}).pop((host, tuple(units), max_priority), None)
+
+    if auto and hasattr(st, "fragment"):
+        st.fragment(run_every=JOURNAL_REFRESH_SECONDS)(_render_journal_table)(host, username, password, units, max_priority, True)
+    else:
+        _render_journal_table(host, username, password, units, max_priority, False)
@@ -0,0 +1,176 @@
+import streamlit as st
+import json
+import time
+import pandas as pd
+from utils.ssh_utils import execute_ssh_command
+
+# Machine-friendly variants of the commands behind the Linux task buttons. Each parser turns the
+# output into a DataFrame with proper dtypes so sorting/filtering can happen locally.
+DF_COMMAND = "df -B1 --output=source,fstype,size,used,avail,pcent,target"
+FREE_COMMAND = "free -b"
+PS_COMMAND = "ps -eo pid=,ppid=,user=,pcpu=,pmem=,rss=,vsz=,stat=,etimes=,args="
+SS_COMMAND = "ss -tulnpH"
+LSCPU_COMMAND = "lscpu -J"
+LSBLK_COMMAND = "lsblk -J -b -o NAME,KNAME,TYPE,SIZE,FSTYPE,MOUNTPOINT,MODEL"
+
+
+def parse_df(output):
+    rows = []
+    for line in output.splitlines()[1:]:
+        parts = line.split(None, 6)
+        if len(parts) < 7:
+            continue
+        source, fstype, size, used, avail, pcent, target = parts
+        rows.append({"filesystem": source, "type": fstype, "size_bytes": size, "used_bytes": used,
+                     "avail_bytes": avail, "use_pct": pcent.rstrip("%"), "mounted_on": target})
+    df = pd.DataFrame(rows, columns=["filesystem", "type", "size_bytes", "used_bytes", "avail_bytes", "use_pct", "mounted_on"])
+    for col in ["size_bytes", "used_bytes", "avail_bytes", "use_pct"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df
+
+
+def parse_free(output):
+    lines = output.splitlines()
+    if not lines:
+        return pd.DataFrame()
+    headers = lines[0].split()
+    rows = []
+    for line in lines[1:]:
+        label, _, values = line.partition(":")
+        if not values:
+            continue
+        row = {"kind": label.strip()}
+        row.update(zip(headers, values.split()))
+        rows.append(row)
+    df = pd.DataFrame(rows)
+    for col in headers:
+        if col in df:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df.rename(columns={col: f"{col.replace('/', '_')}_bytes" for col in headers})
+
+
+def parse_ps(output):
+    columns = ["pid", "ppid", "user", "cpu_pct", "mem_pct", "rss_kib", "vsz_kib", "stat", "elapsed_s", "command"]
+    rows = [line.split(None, 9) for line in output.splitlines() if line.strip()]
+    df = pd.DataFrame([row for row in rows if len(row) == 10], columns=columns)
+    for col in ["pid", "ppid", "rss_kib", "vsz_kib", "elapsed_s"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+    for col in ["cpu_pct", "mem_pct"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df
+
+
+def _split_host_port(address):
+    host, _, port = address.rpartition(":")
+    return host.strip("[]"), port
+
+
+def parse_ss(output):
+    rows = []
+    for line in output.splitlines():
+        parts = line.split(None, 6)
+        if len(parts) < 6:
+            continue
+        local_host, local_port = _split_host_port(parts[4])
+        peer_host, peer_port = _split_host_port(parts[5])
+        rows.append({"protocol": parts[0], "state": parts[1], "recv_q": parts[2], "send_q": parts[3],
+                     "local_address": local_host, "local_port": local_port,
+                     "peer_address": peer_host, "peer_port": peer_port,
+                     "process": parts[6] if len(parts) > 6 else ""})
+    df = pd.DataFrame(rows, columns=["protocol", "state", "recv_q", "send_q", "local_address", "local_port",
+                                     "peer_address", "peer_port", "process"])
+    for col in ["recv_q", "send_q", "local_port"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+    return df
+
+
+def parse_lscpu(output):
+    entries = json.loads(output).get("lscpu", [])
+    rows = []
+
+    def walk(items):
+        for item in items:
+            rows.append({"field": item.get("field", "").rstrip(":"), "value": item.get("data")})
+            walk(item.get("children", []))
+    walk(entries)
+    return pd.DataFrame(rows, columns=["field", "value"])
+
+
+def parse_lsblk(output):
+    rows = []
+
+    def walk(devices, parent):
+        for dev in devices:
+            rows.append({"name": dev.get("name"), "kname": dev.get("kname"), "parent": parent, "type": dev.get("type"),
+                         "size_bytes": dev.get("size"), "fstype": dev.get("fstype"),
+                         "mountpoint": dev.get("mountpoint"), "model": dev.get("model")})
+            walk(dev.get("children", []), dev.get("name"))
+    walk(json.loads(output).get("blockdevices", []), None)
+    df = pd.DataFrame(rows, columns=["name", "kname", "parent", "type", "size_bytes", "fstype", "mountpoint", "model"])
+    df["size_bytes"] = pd.to_numeric(df["size_bytes"], errors="coerce").astype("Int64")
+    return df
+
+
+# name -> (command, parser); used by the Linux views to fetch and render typed tables.
+STRUCTURED_COMMANDS = {
+    "Disk Usage": (DF_COMMAND, parse_df),
+    "Memory Usage": (FREE_COMMAND, parse_free),
+    "CPU Information": (LSCPU_COMMAND, parse_lscpu),
+    "Block Devices": (LSBLK_COMMAND, parse_lsblk),
+    "Processes": (PS_COMMAND, parse_ps),
+    "Listening Sockets": (SS_COMMAND, parse_ss),
+}
+
+
+def parse_command_output(name, output):
+    """Parses output for a STRUCTURED_COMMANDS entry. Raises ValueError if the output is unusable."""
+    _, parser = STRUCTURED_COMMANDS[name]
+    try:
+        return parser(output)
+    except (json.JSONDecodeError, KeyError, TypeError) as e:
+        raise ValueError(f"Could not parse output for {name}: {e}") from e
+
+
+def load_structured_table(host, username, password, name, sudo=False):
+    """Runs the command for name, parses it and keeps the DataFrame in session_state for local filtering."""
+    command, _ = STRUCTURED_COMMANDS[name]
+    output, error = execute_ssh_command(host, username, password, f"sudo {command}" if sudo else command)
+    if error and not output:
+        st.error(error)
+        return None
+    try:
+        df = parse_command_output(name, output)
+    except ValueError as e:
+        st.error(str(e))
+        return None
+    if 'structured_tables' not in st.session_state:
+        st.session_state.structured_tables = {}
+    st.session_state.structured_tables[(host, name)] = {"frame": df, "fetched_at": time.time()}
+    return df
+
+
+def render_structured_table(host, name, key):
+    """Shows a stored table with a text filter, sort column and row limit applied locally (no SSH)."""
+    entry = st.session_state.get('structured_tables', {}).get((host, name))
+    if not entry:
+        return
+    df = entry["frame"]
+    st.caption(f"{name}: {len(df)} rows fetched {int(time.time() - entry['fetched_at'])}s ago. "
+               "Filtering and sorting below run locally.")
+    filter_cols = st.columns([3, 2, 1, 1])
+    text = filter_cols[0].text_input("Filter (substring, any text column)", key=f"{key}_filter")
+    sort_by = filter_cols[1].selectbox("Sort by", ["(none)"] + list(df.columns), key=f"{key}_sort")
+    descending = filter_cols[2].checkbox("Descending", value=True, key=f"{key}_desc")
+    limit = filter_cols[3].number_input("Rows", min_value=10, max_value=100000, value=500, step=100, key=f"{key}_limit")
+    view = df
+    if text:
+        text_cols = [col for col in df.columns if not pd.api.types.is_numeric_dtype(df[col])]
+        mask = pd.Series(False, index=df.index)
+        for col in text_cols:
+            mask |= df[col].astype(str).str.contains(text, case=False, regex=False, na=False)
+        view = view[mask]
+    if sort_by != "(none)":
+        view = view.sort_values(sort_by, ascending=not descending, na_position="last")
+    if len(view) != len(df):
+        st.caption(f"{len(view)} of {len(df)} rows match.")
+    st.dataframe(view.head(int(limit)), use_container_width=True, hide_index=True)
@@ -0,0 +1,64 @@
+import re
+import shlex
+import time
+import uuid
+
+# Marker lines wrapped around each section of the compound script. The token is random per run so
+# command output can never be mistaken for a delimiter.
+_MARKER = "@@SNAPSHOT"
+
+
+def build_snapshot_script(commands, token):
+    """Builds one shell script that runs every command and fences each section's output.
+
+    commands is a dict {label: command}. stderr is folded into the section and the exit code is
+    recorded on the END marker, so one round trip carries everything needed to render each panel.
+    The END marker is preceded by a newline of its own, so output without a trailing newline
+    cannot run into it.
+    """
+    parts = []
+    for i, command in enumerate(commands.values()):
+        parts.append(
+            f"echo '{_MARKER}:{token}:BEGIN:{i}'; "
+            f"( {command} ) 2>&1; "
+            f"printf '\\n{_MARKER}:{token}:END:{i}:%s\\n' \"$?\""
+        )
+    return "sh -c " + shlex.quote("; ".join(parts))
+
+
+def parse_snapshot_output(output, commands, token):
+    """Splits compound-script output back into {label: {"output": str, "exit_code": int|None}}."""
+    labels = list(commands)
+    sections = {label: {"output": "", "exit_code": None} for label in labels}
+    pattern = re.compile(rf"^{_MARKER}:{re.escape(token)}:(BEGIN|END):(\d+)(?::(-?\d+))?$")
+    current, buffer = None, []
+    for line in output.splitlines():
+        match = pattern.match(line.strip())
+        if not match:
+            if current is not None:
+                buffer.append(line)
+            continue
+        kind, index = match.group(1), int(match.group(2))
+        if kind == "BEGIN":
+            current, buffer = index, []
+        elif current == index and index < len(labels):
+            # Joining the lines drops exactly the newline printed before the END marker.
+            sections[labels[index]] = {"output": "\n".join(buffer), "exit_code": int(match.group(3))}
+            current, buffer = None, []
+    return sections
+
+
+def take_snapshot(run_command, commands):
+    """Runs all commands in a single round trip using run_command(cmd) -> (output, error).
+
+    Returns {"taken_at": epoch seconds, "duration_s": float, "sections": {...}, "error": str}.
+    """
+    token = uuid.uuid4().hex[:12]
+    started = time.time()
+    output, error = run_command(build_snapshot_script(commands, token))
+    return {
+        "taken_at": started,
+        "duration_s": round(time.time() - started, 3),
+        "sections": parse_snapshot_output(output or "", commands, token),
+        "error": error,
+    }
@@ -0,0 +1,186 @@
+import streamlit as st
+import re
+import shlex
+import time
+from utils.output_buffer import capture_ssh_output
+
+LOG_SEARCH_MAX_MATCHES = 5000     # matching lines returned per search (context lines not counted)
+LOG_SEARCH_MAX_CONTEXT = 20
+
+# syslog/journald priorities, most severe first.
+SEVERITY_LEVELS = ["emerg", "alert", "crit", "err", "warning", "notice", "info", "debug"]
+# Keywords that mark a plain-text log line with each priority; used when searching files.
+SEVERITY_KEYWORDS = {
+    "emerg": ["emerg", "emergency", "panic"],
+    "alert": ["alert"],
+    "crit": ["crit", "critical", "fatal"],
+    "err": ["err", "error", "failed", "failure"],
+    "warning": ["warn", "warning"],
+    "notice": ["notice"],
+    "info": ["info"],
+    "debug": ["debug"],
+}
+
+# One awk pass does the time-range, severity and regex filtering plus grep-style context, and
+# reports how much it read. Arguments come in through the environment so awk does not reinterpret
+# backslashes in the pattern. Lines without a timestamp inherit the previous line's timestamp.
+_SEARCH_AWK = r'''
+function ts(s,  m) {
+    if (s ~ /^[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9][T ][0-9][0-9]:[0-9][0-9]:[0-9][0-9]/)
+        return substr(s, 1, 10) " " substr(s, 12, 8)
+    if (s ~ /^[A-Z][a-z][a-z] [ 0-9][0-9] [0-9][0-9]:[0-9][0-9]:[0-9][0-9]/) {
+        m = index("JanFebMarAprMayJunJulAugSepOctNovDec", substr(s, 1, 3))
+        if (m) return sprintf("%s-%02d-%02d %s", year, (m + 2) / 3, substr(s, 5, 2) + 0, substr(s, 8, 8))
+    }
+    return ""
+}
+BEGIN {
+    pat = ENVIRON["LS_PAT"]; sev = ENVIRON["LS_SEV"]; since = ENVIRON["LS_SINCE"]; until = ENVIRON["LS_UNTIL"]
+    ctx = ENVIRON["LS_CTX"] + 0; max = ENVIRON["LS_MAX"] + 0; icase = ENVIRON["LS_ICASE"] + 0; year = ENVIRON["LS_YEAR"]
+    if (icase) pat = tolower(pat)
+}
+{
+    scanned += length($0) + 1
+    if (since != "" || until != "") {
+        t = ts($0)
+        if (t != "") cur = t
+        if (cur == "" || (since != "" && cur < since) || (until != "" && cur > until)) { delete buf[NR - ctx]; next }
+    }
+    line = icase ? tolower($0) : $0
+    hit = (pat == "" || line ~ pat) && (sev == "" || tolower($0) ~ sev)
+    if (hit && matches < max) {
+        if (last && NR - ctx > last + 1) print "--"
+        for (i = NR - ctx; i < NR; i++) if (i > last && (i in buf)) print i "-" buf[i]
+        print NR ":" $0
+        matches++; last = NR; after = ctx
+    } else if (after > 0) {
+        print NR "-" $0
+        last = NR; after--
+    } else if (matches >= max) {
+        truncated = 1
+        exit
+    }
+    buf[NR] = $0
+    delete buf[NR - ctx]
+}
+END { printf "@@LOGSEARCH scanned=%d lines=%d matches=%d truncated=%d\n", scanned, NR, matches, truncated }
+'''
+
+_SAFE_PATH = re.compile(r"[\w./*?\[\]-]+")
+
+
+def _quote_path(path):
+    # Leave simple paths unquoted so globs like /var/log/messages* still expand remotely.
+    return path if _SAFE_PATH.fullmatch(path) else shlex.quote(path)
+
+
+def severity_regex(level):
+    """Regex matching the keywords of level and every more severe level, as whole words."""
+    levels = SEVERITY_LEVELS[:SEVERITY_LEVELS.index(level) + 1]
+    words = "|".join(word for name in levels for word in SEVERITY_KEYWORDS[name])
+    return f"(^|[^a-z])({words})([^a-z]|$)"
+
+
+def _awk_filter(pattern, severity, since, until, context, max_matches, ignore_case, since_hours=None):
+    env = {
+        "LC_ALL": "C",
+        "LS_PAT": shlex.quote(pattern or ""),
+        "LS_SEV": shlex.quote(severity_regex(severity) if severity else ""),
+        "LS_SINCE": shlex.quote(since or ""),
+        "LS_UNTIL": shlex.quote(until or ""),
+        "LS_CTX": str(min(int(context), LOG_SEARCH_MAX_CONTEXT)),
+        "LS_MAX": str(int(max_matches)),
+        "LS_ICASE": "1" if ignore_case else "0",
+        # Evaluated on the remote host so relative ranges and syslog years follow its clock.
+        "LS_YEAR": '"$(date +%Y)"',
+    }
+    if since_hours:
+        env["LS_SINCE"] = f'"$(date -d \'-{int(since_hours)} hours\' \'+%Y-%m-%d %H:%M:%S\')"'
+    assignments = " ".join(f"{name}={value}" for name, value in env.items())
+    return f"{assignments} awk {shlex.quote(_SEARCH_AWK)}"
+
+
+def build_file_search_command(path, pattern="", severity=None, since=None, until=None, context=0,
+                              max_matches=LOG_SEARCH_MAX_MATCHES, ignore_case=True, use_sudo=True, since_hours=None):
+    """Builds a remote command that filters log file(s) in place and prints only matches.
+
+    path may be a glob (e.g. /var/log/messages*); rotated .gz files are read through zcat -f.
+    since/until are "YYYY-MM-DD HH:MM:SS" strings compared against ISO or classic syslog
+    timestamps (the latter have no year, so the current year is assumed). since_hours, if set,
+    replaces since with "now minus N hours" on the remote clock.
+    """
+    target = _quote_path(path)
+    awk_filter = _awk_filter(pattern, severity, since, until, context, max_matches, ignore_case, since_hours)
+    script = f"stat -c '@@LOGFILE %s %n' -- {target}; zcat -f -- {target} | {awk_filter}"
+    return f"sudo sh -c {shlex.quote(script)}" if use_sudo else f"sh -c {shlex.quote(script)}"
+
+
+def build_journal_search_command(pattern="", severity=None, since=None, until=None, unit=None, context=0,
+                                 max_matches=LOG_SEARCH_MAX_MATCHES, ignore_case=True, use_sudo=True, since_hours=None):
+    """Builds a journalctl search: time range, priority and unit use the journal's own indexes,
+    the regex and context lines are applied by the same awk filter as file searches."""
+    args = ["journalctl", "--no-pager", "-o", "short-iso"]
+    if since_hours: args += ["--since", f"-{int(since_hours)}h"]
+    elif since: args += ["--since", since]
+    if until: args += ["--until", until]
+    if severity: args += ["-p", severity]
+    if unit: args += ["-u", unit]
+    journal = " ".join(shlex.quote(arg) for arg in args)
+    script = f"{journal} | {_awk_filter(pattern, None, None, None, context, max_matches, ignore_case)}"
+    return f"sudo sh -c {shlex.quote(script)}" if use_sudo else f"sh -c {shlex.quote(script)}"
+
+
+def parse_search_marker(line, stats):
+    """Consumes @@LOGFILE/@@LOGSEARCH marker lines into stats; returns False for marker lines."""
+    if line.startswith("@@LOGFILE "):
+        size, _, name = line[10:].partition(" ")
+        stats["files"].append({"file": name, "size_bytes": int(size)})
+        return False
+    if line.startswith("@@LOGSEARCH "):
+        for item in line[12:].split():
+            name, _, value = item.partition("=")
+            stats[name] = int(value)
+        return False
+    stats["returned"] += len(line.encode("utf-8", errors="replace")) + 1
+    return True
+
+
+def run_log_search(host, username, password, command, key, label=None):
+    """Streams a search command into a paged buffer under st.session_state[key], with scan stats."""
+    stats = {"files": [], "returned": 0, "scanned": None, "lines": None, "matches": None, "truncated": 0}
+    started = time.perf_counter()
+    entry = capture_ssh_output(host, username, password, command, key,
+                               line_filter=lambda line: parse_search_marker(line, stats), label=label)
+    stats["duration_s"] = time.perf_counter() - started
+    entry["stats"] = stats
+    return entry
+
+
+def _format_bytes(count):
+    for unit in ["B", "KiB", "MiB"]:
+        if count < 1024:
+            return f"{count:,.1f} {unit}" if unit != "B" else f"{count} B"
+        count /= 1024
+    return f"{count:,.1f} GiB"
+
+
+def render_search_stats(key):
+    entry = st.session_state.get(key)
+    if not entry or "stats" not in entry:
+        return
+    stats = entry["stats"]
+    if stats["scanned"] is None:
+        st.warning("The remote filter did not report its totals; the search may have failed or been cancelled.")
+        return
+    on_disk = sum(f["size_bytes"] for f in stats["files"])
+    cols = st.columns(4)
+    cols[0].metric("Bytes Scanned (remote)", _format_bytes(stats["scanned"]))
+    cols[1].metric("Bytes Returned", _format_bytes(stats["returned"]))
+    cols[2].metric("Matching Lines", f"{stats['matches']:,} of {stats['lines']:,}")
+    ratio = stats['scanned'] / stats['returned'] if stats['returned'] else None
+    cols[3].metric("Reduction", f"{ratio:,.0f}x" if ratio else "n/a")
+    if stats["files"]:
+        st.caption(f"{len(stats['files'])} file(s), {_format_bytes(on_disk)} on disk. "
+                   f"Search took {stats['duration_s']:.2f}s.")
+    if stats["truncated"]:
+        st.warning(f"Stopped after {stats['matches']} matches; narrow the pattern or time range to see the rest.")
@@ -0,0 +1,222 @@
+import streamlit as st
+import heapq
+import re
+import shlex
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from utils.multi_host import parse_host_list
+from utils.ssh_utils import dedicated_connection, stream_ssh_command
+
+TAIL_INITIAL_LINES = 50           # lines of history requested from each host on start
+TAIL_HOST_BUFFER = 2000           # unmerged lines held per host; the oldest are dropped beyond this
+TAIL_MERGED_LINES = 5000          # merged lines kept for display
+TAIL_DISPLAY_LINES = 500
+TAIL_HOLD_SECONDS = 2             # a host that sent nothing for this long no longer holds back the merge
+TAIL_MAX_SECONDS = 3600           # remote tail processes exit on their own after this
+TAIL_REFRESH_SECONDS = 2
+TAIL_MAX_BYTES = 512 * 1024 * 1024
+
+_ISO_TS = re.compile(r"^(\d{4}-\d{2}-\d{2})[T ](\d{2}:\d{2}:\d{2})(?:[.,](\d+))?(Z|[+-]\d{2}:?\d{2})?")
+_SYSLOG_TS = re.compile(r"^([A-Z][a-z]{2}) +(\d{1,2}) (\d{2}:\d{2}:\d{2})")
+_MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def _offset_seconds(text):
+    if not text or text == "Z":
+        return 0
+    text = text.replace(":", "")
+    sign = -1 if text[0] == "-" else 1
+    return sign * (int(text[1:3]) * 3600 + int(text[3:5]) * 60)
+
+
+def parse_timestamp(line, utc_offset=0, now=None):
+    """Epoch seconds of an ISO-8601 or syslog ("Oct 16 12:00:00") line prefix, or None.
+
+    Timestamps without a zone are taken to be in the host's local time (utc_offset seconds east of UTC).
+    """
+    match = _ISO_TS.match(line)
+    if match:
+        date, clock, fraction, zone = match.groups()
+        base = datetime.strptime(f"{date} {clock}", "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc).timestamp()
+        offset = _offset_seconds(zone) if zone else utc_offset
+        return base + (float(f"0.{fraction}") if fraction else 0.0) - offset
+    match = _SYSLOG_TS.match(line)
+    if match and match.group(1) in _MONTHS:
+        now = now or time.time()
+        year = datetime.fromtimestamp(now, timezone.utc).year
+        month, day, clock = _MONTHS.index(match.group(1)) + 1, int(match.group(2)), match.group(3)
+        stamp = datetime.strptime(f"{year}-{month:02d}-{day:02d} {clock}", "%Y-%m-%d %H:%M:%S")
+        ts = stamp.replace(tzinfo=timezone.utc).timestamp() - utc_offset
+        # syslog omits the year; December lines read in January belong to last year.
+        return ts if ts <= now + 86400 else stamp.replace(year=year - 1, tzinfo=timezone.utc).timestamp() - utc_offset
+    return None
+
+
+def build_tail_command(source, target, lines=TAIL_INITIAL_LINES):
+    """Prints the host's UTC offset, then follows a file (tail -F) or a journal unit (journalctl -f)."""
+    if source == "journal":
+        follow = f"sudo journalctl -f -n {int(lines)} -o short-iso-precise --no-pager"
+        if target:
+            follow += f" -u {shlex.quote(target)}"
+    else:
+        follow = f"sudo tail -n {int(lines)} -F {shlex.quote(target)}"
+    # The follower is killed as soon as the channel's stdin reaches EOF (the viewer stopped or went away),
+    # instead of lingering until its next write fails.
+    return (f'echo "@@TZ $(date +%z)"; exec 3<&0; timeout {TAIL_MAX_SECONDS} {follow} </dev/null & pid=$!; '
+            f'(cat <&3 >/dev/null 2>&1; kill $pid 2>/dev/null) >/dev/null 2>&1 & wait $pid')
+
+
+class MergedTail:
+    """Follows the same log on several hosts and merges the streams into one time-ordered feed.
+
+    Each host has a bounded buffer of (ts, seq, host, line) entries. A line is merged once every
+    host that is still talking has sent something at least as new, so the output is ordered even
+    though hosts deliver at different speeds.
+    """
+
+    def __init__(self, hosts, username, password, source, target):
+        self.hosts = list(hosts)
+        self.username, self.password = username, password
+        self.source, self.target = source, target
+        self.merged = deque(maxlen=TAIL_MERGED_LINES)
+        self.stats = {host: {"host": host, "status": "connecting", "received": 0, "dropped": 0, "buffered": 0,
+                             "last_ts": None, "error": ""} for host in self.hosts}
+        self._buffers = {host: deque(maxlen=TAIL_HOST_BUFFER) for host in self.hosts}
+        self._last_arrival = {}
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._threads = []
+
+    @property
+    def running(self):
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self):
+        started = time.monotonic()
+        for host in self.hosts:
+            self._last_arrival[host] = started
+            thread = threading.Thread(target=self._follow, args=(host,), name=f"merged-tail-{host}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._cancel.set()
+
+    def _follow(self, host):
+        command = build_tail_command(self.source, self.target)
+        stats = self.stats[host]
+        try:
+            # A dedicated connection: a follower running for up to TAIL_MAX_SECONDS must not hold a pool slot.
+            with dedicated_connection(host, self.username, self.password) as client:
+                self._read_stream(host, client, command)
+        except Exception as e:
+            stats["error"] = f"{type(e).__name__}: {e}"
+        stats["status"] = "stopped" if self._cancel.is_set() else "ended"
+
+    def _read_stream(self, host, client, command):
+        utc_offset, last_ts = 0, None
+        stats = self.stats[host]
+        for stream, line in stream_ssh_command(host, self.username, self.password, command, max_bytes=TAIL_MAX_BYTES,
+                                               cancel_event=self._cancel, client=client):
+            if stream == "exit":
+                break
+            if stream == "stdout" and line.startswith("@@TZ "):
+                utc_offset = _offset_seconds(line[5:].strip())
+                stats["status"] = "following"
+                continue
+            if stream != "stdout":
+                stats["error"] = line
+                continue
+            ts = parse_timestamp(line, utc_offset)
+            # Continuation lines (stack traces, wrapped messages) stay behind the line they belong to.
+            ts = ts if ts is not None else (last_ts if last_ts is not None else time.time())
+            last_ts = ts
+            with self._lock:
+                buffer = self._buffers[host]
+                if len(buffer) == buffer.maxlen:
+                    stats["dropped"] += 1
+                self._seq += 1
+                buffer.append((ts, self._seq, host, line))
+                self._last_arrival[host] = time.monotonic()
+                stats["received"] += 1
+                stats["last_ts"] = ts
+
+    def drain(self):
+        """Moves every line that can no longer be overtaken into the merged feed. Returns the count."""
+        now = time.monotonic()
+        with self._lock:
+            holding = [host for host in self.hosts if self.stats[host]["status"] in ("connecting", "following")
+                       and now - self._last_arrival[host] < TAIL_HOLD_SECONDS]
+            if any(not self._buffers[host] and self.stats[host]["last_ts"] is None for host in holding):
+                return 0
+            watermark = min((self.stats[host]["last_ts"] for host in holding), default=float("inf"))
+            ready = []
+            for host, buffer in self._buffers.items():
+                taken = []
+                while buffer and buffer[0][0] <= watermark:
+                    taken.append(buffer.popleft())
+                ready.append(taken)
+                self.stats[host]["buffered"] = len(buffer)
+        merged = list(heapq.merge(*ready))
+        self.merged.extend(merged)
+        return len(merged)
+
+
+def _format_line(entry, host_width):
+    ts, _, host, line = entry
+    clock = datetime.fromtimestamp(ts).strftime("%H:%M:%S.%f")[:-3]
+    return f"{clock} {host:<{host_width}} | {line}"
+
+
+def _render_merged_feed(line_filter, max_lines):
+    tail = st.session_state.get('merged_tail')
+    if tail is None:
+        return
+    tail.drain()
+    st.dataframe([{k: v for k, v in s.items() if k != "last_ts"} for s in tail.stats.values()],
+                 use_container_width=True, hide_index=True)
+    entries = list(tail.merged)
+    if line_filter:
+        entries = [e for e in entries if line_filter.lower() in e[3].lower()]
+    width = max(len(h) for h in tail.hosts)
+    status = "following" if tail.running else "stopped"
+    st.caption(f"{status}: {len(tail.merged):,} merged lines kept, showing the last {min(len(entries), max_lines)}.")
+    st.code("\n".join(_format_line(e, width) for e in entries[-max_lines:]) or "(waiting for lines)")
+
+
+def render_merged_tail(host, username, password):
+    """Host list and log source, start/stop, then a merged feed that refreshes on a timer."""
+    hosts_text = st.text_area("Hosts (one per line)", value="\n".join(st.session_state.get('ssh_host_group') or [host]),
+                              key="merged_tail_hosts", height=100)
+    cols = st.columns([1, 3])
+    source = cols[0].selectbox("Source", ["file", "journal"], key="merged_tail_source")
+    target = cols[1].text_input("Log file path" if source == "file" else "Journal unit (empty for all)",
+                                value="/var/log/messages" if source == "file" else "", key=f"merged_tail_target_{source}")
+    b_cols = st.columns(4)
+    tail = st.session_state.get('merged_tail')
+    if b_cols[0].button("Start Merged Tail"):
+        hosts = parse_host_list(hosts_text)
+        if not hosts or (source == "file" and not target):
+            st.warning("Please enter at least one host and a log file path.")
+        else:
+            if tail:
+                tail.stop()
+            tail = MergedTail(hosts, username, password, source, target)
+            tail.start()
+            st.session_state.merged_tail = tail
+    if b_cols[1].button("Stop Merged Tail") and tail:
+        tail.stop()
+    line_filter = b_cols[2].text_input("Filter", key="merged_tail_filter", label_visibility="collapsed",
+                                       placeholder="Filter lines")
+    max_lines = b_cols[3].number_input("Lines shown", min_value=50, max_value=TAIL_MERGED_LINES,
+                                       value=TAIL_DISPLAY_LINES, step=50, key="merged_tail_lines",
+                                       label_visibility="collapsed")
+    if tail is None:
+        return
+    if tail.running and hasattr(st, "fragment"):
+        st.fragment(run_every=TAIL_REFRESH_SECONDS)(_render_merged_feed)(line_filter, int(max_lines))
+    else:
+        _render_merged_feed(line_filter, int(max_lines))
@@ -0,0 +1,276 @@
+import streamlit as st
+import re
+import shlex
+import threading
+import time
+import numpy as np
+import pandas as pd
+from utils.ssh_utils import dedicated_connection, _wait_for_channel, SSH_CONNECT_TIMEOUT
+
+SAMPLER_INTERVAL = 2              # seconds between remote samples
+SAMPLER_CAPACITY = 1800           # samples kept per host (one hour at the default interval)
+SAMPLER_CHART_REFRESH = 2         # seconds between chart redraws
+SAMPLER_WINDOWS_MIN = [1, 5, 15, 30, 60]
+SAMPLER_MAX_SECONDS = 4 * 3600    # the remote loop exits on its own after this, even if never stopped
+_TIMEOUT_EXIT = 124               # exit status of timeout(1) when the limit was reached
+
+PROC_FILES = ["stat", "meminfo", "loadavg", "net/dev", "diskstats"]
+METRIC_FIELDS = ["cpu_pct", "iowait_pct", "mem_used_pct", "load1", "net_rx_bps", "net_tx_bps",
+                 "disk_reads_s", "disk_writes_s", "disk_read_bps", "disk_write_bps"]
+
+# Whole disks only; partitions and device-mapper volumes would double count the same I/O.
+WHOLE_DISK_PATTERN = re.compile(r"^(sd[a-z]+|vd[a-z]+|xvd[a-z]+|hd[a-z]+|nvme\d+n\d+|mmcblk\d+)$")
+SECTOR_BYTES = 512
+
+
+def build_sampler_command(interval=SAMPLER_INTERVAL, max_seconds=SAMPLER_MAX_SECONDS):
+    """One long-running remote loop that prints every /proc file per tick, fenced by markers."""
+    files = " ".join(PROC_FILES)
+    loop = (f"while :; do echo \"@@SAMPLE $(date +%s.%N)\"; "
+            f"for f in {files}; do echo \"@@FILE $f\"; cat /proc/$f; done; "
+            f"echo @@END; sleep {interval}; done")
+    return f"timeout {int(max_seconds)} sh -c {shlex.quote(loop)}"
+
+
+class MetricRingBuffer:
+    """Fixed-size NumPy ring buffer of timestamps plus one float column per metric."""
+
+    def __init__(self, fields=METRIC_FIELDS, capacity=SAMPLER_CAPACITY):
+        self.fields = list(fields)
+        self.capacity = capacity
+        self._ts = np.full(capacity, np.nan)
+        self._values = np.full((capacity, len(self.fields)), np.nan)
+        self._next = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def append(self, ts, values):
+        with self._lock:
+            self._ts[self._next] = ts
+            self._values[self._next] = [values.get(field, np.nan) for field in self.fields]
+            self._next = (self._next + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+
+    def __len__(self):
+        return self._count
+
+    def to_frame(self, since=None):
+        """Samples in chronological order, indexed by local time; optionally only those after since."""
+        with self._lock:
+            order = np.arange(self._next - self._count, self._next) % self.capacity
+            ts, values = self._ts[order], self._values[order]
+        if since is not None:
+            keep = ts >= since
+            ts, values = ts[keep], values[keep]
+        index = pd.to_datetime(ts, unit="s", utc=True).tz_convert(None)
+        return pd.DataFrame(values, index=index, columns=self.fields)
+
+
+def parse_proc_sample(text):
+    """Parses one @@SAMPLE block into (remote_ts, {counter: value}) of raw cumulative counters."""
+    lines = text.splitlines()
+    ts = float(lines[0].split()[1])
+    counters, section = {}, None
+    for line in lines[1:]:
+        if line.startswith("@@FILE "):
+            section = line[7:].strip()
+            continue
+        parts = line.split()
+        if not parts:
+            continue
+        if section == "stat" and parts[0] == "cpu":
+            ticks = [int(v) for v in parts[1:]]
+            counters["cpu_total"] = sum(ticks[:8])     # guest time is already included in user/nice
+            counters["cpu_idle"] = ticks[3] + ticks[4]
+            counters["cpu_iowait"] = ticks[4]
+        elif section == "meminfo" and parts[0] in ("MemTotal:", "MemAvailable:"):
+            counters[parts[0].rstrip(":")] = int(parts[1]) * 1024
+        elif section == "loadavg":
+            counters["load1"] = float(parts[0])
+        elif section == "net/dev" and ":" in line:
+            name, _, stats = line.partition(":")
+            if name.strip() == "lo":
+                continue
+            fields = stats.split()
+            counters["net_rx"] = counters.get("net_rx", 0) + int(fields[0])
+            counters["net_tx"] = counters.get("net_tx", 0) + int(fields[8])
+        elif section == "diskstats" and len(parts) >= 14 and WHOLE_DISK_PATTERN.match(parts[2]):
+            counters["disk_reads"] = counters.get("disk_reads", 0) + int(parts[3])
+            counters["disk_read_sectors"] = counters.get("disk_read_sectors", 0) + int(parts[5])
+            counters["disk_writes"] = counters.get("disk_writes", 0) + int(parts[7])
+            counters["disk_write_sectors"] = counters.get("disk_write_sectors", 0) + int(parts[9])
+    return ts, counters
+
+
+def derive_rates(previous, current, elapsed):
+    """Turns two consecutive counter dicts into the METRIC_FIELDS values (rates per second)."""
+    def delta(name):
+        if name not in previous or name not in current:
+            return np.nan
+        return max(current[name] - previous[name], 0)
+
+    values = {"load1": current.get("load1", np.nan)}
+    total = delta("cpu_total")
+    if total and not np.isnan(total):
+        values["cpu_pct"] = 100.0 * (1 - delta("cpu_idle") / total)
+        values["iowait_pct"] = 100.0 * delta("cpu_iowait") / total
+    if current.get("MemTotal"):
+        values["mem_used_pct"] = 100.0 * (1 - current.get("MemAvailable", 0) / current["MemTotal"])
+    if elapsed > 0:
+        values["net_rx_bps"] = delta("net_rx") / elapsed
+        values["net_tx_bps"] = delta("net_tx") / elapsed
+        values["disk_reads_s"] = delta("disk_reads") / elapsed
+        values["disk_writes_s"] = delta("disk_writes") / elapsed
+        values["disk_read_bps"] = delta("disk_read_sectors") * SECTOR_BYTES / elapsed
+        values["disk_write_bps"] = delta("disk_write_sectors") * SECTOR_BYTES / elapsed
+    return values
+
+
+class RemoteMetricsSampler:
+    """Background thread that keeps one exec channel open and feeds parsed samples into a ring buffer.
+
+    The channel runs on a dedicated connection outside the SSH pool, closed when the sampler stops.
+    """
+
+    def __init__(self, host, username, password, interval=SAMPLER_INTERVAL, capacity=SAMPLER_CAPACITY):
+        self.host = host
+        self.username = username
+        self.password = password
+        self.interval = interval
+        self.buffer = MetricRingBuffer(capacity=capacity)
+        self.error = None
+        self.started_at = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self.error = None
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name=f"metrics-sampler-{self.host}", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait=2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(wait)
+
+    def _run(self):
+        try:
+            with dedicated_connection(self.host, self.username, self.password) as client:
+                channel = client.get_transport().open_session(timeout=SSH_CONNECT_TIMEOUT)
+                channel.exec_command(build_sampler_command(self.interval))
+                self._read_samples(channel)
+                channel.close()
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+
+    def _read_samples(self, channel):
+        pending, previous = "", None
+        while not self._stop.is_set():
+            if channel.recv_ready():
+                pending += channel.recv(65536).decode("utf-8", errors="replace")
+                while "@@END\n" in pending:
+                    block, _, pending = pending.partition("@@END\n")
+                    start = block.find("@@SAMPLE ")
+                    if start < 0:
+                        continue
+                    ts, counters = parse_proc_sample(block[start:])
+                    if previous is not None:
+                        # Rates use the host's own clock; the chart is stamped with local receive time so
+                        # its window still works when the two clocks disagree.
+                        self.buffer.append(time.time(), derive_rates(previous[1], counters, ts - previous[0]))
+                    previous = (ts, counters)
+            elif channel.exit_status_ready():
+                stderr = channel.recv_stderr(4096).decode("utf-8", errors="replace").strip()
+                if channel.recv_exit_status() == _TIMEOUT_EXIT:
+                    self.error = f"reached its {SAMPLER_MAX_SECONDS // 3600} h limit; start it again to continue."
+                else:
+                    self.error = stderr or f"Sampler exited with status {channel.recv_exit_status()}."
+                return
+            else:
+                _wait_for_channel(channel, 0.5)
+
+
+_samplers = {}
+_samplers_lock = threading.Lock()
+
+
+def get_sampler(host, username):
+    with _samplers_lock:
+        return _samplers.get((host, username))
+
+
+def start_sampler(host, username, password, interval=SAMPLER_INTERVAL):
+    """Starts (or restarts with a new interval) the process-wide sampler for host/username."""
+    with _samplers_lock:
+        sampler = _samplers.get((host, username))
+        if sampler and sampler.running and sampler.interval == interval:
+            return sampler
+        if sampler:
+            sampler.stop()
+        sampler = RemoteMetricsSampler(host, username, password, interval=interval)
+        _samplers[(host, username)] = sampler
+    sampler.start()
+    return sampler
+
+
+def stop_sampler(host, username):
+    with _samplers_lock:
+        sampler = _samplers.get((host, username))
+    if sampler:
+        sampler.stop()
+
+
+def _render_metric_charts(host, username, window_min):
+    sampler = get_sampler(host, username)
+    if sampler is None:
+        return
+    if sampler.error:
+        st.error(f"Sampler stopped: {sampler.error}")
+    df = sampler.buffer.to_frame(since=time.time() - window_min * 60)
+    status = "running" if sampler.running else "stopped"
+    st.caption(f"Sampler {status}: {len(sampler.buffer)} samples buffered, every {sampler.interval}s over one SSH channel.")
+    if df.empty:
+        st.info("Waiting for the first two samples...")
+        return
+    latest = df.iloc[-1]
+    metric_cols = st.columns(4)
+    metric_cols[0].metric("CPU", f"{latest['cpu_pct']:.1f}%")
+    metric_cols[1].metric("Memory Used", f"{latest['mem_used_pct']:.1f}%")
+    metric_cols[2].metric("Load (1m)", f"{latest['load1']:.2f}")
+    metric_cols[3].metric("I/O Wait", f"{latest['iowait_pct']:.1f}%")
+    st.write("CPU / Memory (%)")
+    st.line_chart(df[["cpu_pct", "iowait_pct", "mem_used_pct"]])
+    st.write("Network (bytes/s, excluding lo)")
+    st.line_chart(df[["net_rx_bps", "net_tx_bps"]])
+    st.write("Disk (operations/s)")
+    st.line_chart(df[["disk_reads_s", "disk_writes_s"]])
+    st.write("Disk (bytes/s)")
+    st.line_chart(df[["disk_read_bps", "disk_write_bps"]])
+
+
+def render_live_metrics(host, username, password):
+    """Start/stop controls plus charts that redraw on a timer without re-running the whole page."""
+    control_cols = st.columns([1, 1, 1, 1])
+    interval = control_cols[0].number_input("Sample every (s)", min_value=1, max_value=60, value=SAMPLER_INTERVAL,
+                                            key="sampler_interval")
+    window_min = control_cols[1].selectbox("Show last (minutes)", SAMPLER_WINDOWS_MIN, index=1, key="sampler_window")
+    if control_cols[2].button("Start Live Monitoring"):
+        start_sampler(host, username, password, interval=int(interval))
+    if control_cols[3].button("Stop Live Monitoring"):
+        stop_sampler(host, username)
+
+    sampler = get_sampler(host, username)
+    if sampler is None:
+        return
+    if sampler.running and hasattr(st, "fragment"):
+        st.fragment(run_every=SAMPLER_CHART_REFRESH)(_render_metric_charts)(host, username, window_min)
+    else:
+        _render_metric_charts(host, username, window_min)
@@ -0,0 +1,106 @@
+import streamlit as st
+import time
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pandas as pd
+from utils.ssh_utils import paramiko, stream_ssh_command
+
+# --- Fan-out settings ---
+FANOUT_MAX_WORKERS = 16           # hosts contacted at the same time
+FANOUT_HOST_TIMEOUT = 60          # wall-clock seconds allowed per host (connect + run + drain)
+FANOUT_MAX_BYTES = 1024 * 1024    # output kept per host, so 60 chatty hosts stay bounded
+
+RESULT_COLUMNS = ["host", "status", "exit_code", "latency_s", "stdout", "stderr"]
+
+
+def parse_host_list(text):
+    """Splits a free-text host list (newlines, commas or spaces; '#' comments) into unique hosts."""
+    hosts = []
+    for line in (text or "").splitlines():
+        line = line.split("#", 1)[0]
+        for host in re.split(r"[,\s]+", line):
+            if host and host not in hosts:
+                hosts.append(host)
+    return hosts
+
+
+def run_on_host(host, username, password, command, timeout=FANOUT_HOST_TIMEOUT, max_bytes=FANOUT_MAX_BYTES):
+    """Runs one command on one host and returns a result row. Never raises; errors land in the row."""
+    started = time.monotonic()
+    stdout, stderr = [], []
+    exit_code = None
+    status = "ok"
+    try:
+        for stream, line in stream_ssh_command(host, username, password, command,
+                                               max_bytes=max_bytes, timeout=timeout):
+            if stream == "stdout":
+                stdout.append(line)
+            elif stream == "stderr":
+                stderr.append(line)
+            elif stream == "truncated":
+                status = "timeout" if line.startswith("Timed out") else "truncated"
+                stderr.append(line)
+            elif stream == "exit":
+                exit_code = line
+        if status == "ok" and exit_code != 0:
+            status = "failed"
+    except paramiko.AuthenticationException:
+        status = "error"
+        stderr.append("Authentication failed.")
+    except Exception as e:
+        status = "error"
+        stderr.append(f"{type(e).__name__}: {e}")
+    return {
+        "host": host,
+        "status": status,
+        "exit_code": exit_code,
+        "latency_s": round(time.monotonic() - started, 3),
+        "stdout": "\n".join(stdout).strip(),
+        "stderr": "\n".join(stderr).strip(),
+    }
+
+
+def iter_fanout(hosts, username, password, command, max_workers=FANOUT_MAX_WORKERS,
+                timeout=FANOUT_HOST_TIMEOUT, max_bytes=FANOUT_MAX_BYTES):
+    """Runs a command on every host concurrently and yields result rows as each host finishes."""
+    if not hosts:
+        return
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(hosts)), thread_name_prefix="ssh-fanout")
+    try:
+        futures = [executor.submit(run_on_host, host, username, password, command, timeout, max_bytes)
+                   for host in hosts]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_on_hosts(hosts, username, password, command, max_workers=FANOUT_MAX_WORKERS,
+                 timeout=FANOUT_HOST_TIMEOUT, max_bytes=FANOUT_MAX_BYTES):
+    """Blocking fan-out. Returns a DataFrame with one row per host."""
+    rows = list(iter_fanout(hosts, username, password, command, max_workers, timeout, max_bytes))
+    return results_to_frame(rows)
+
+
+def results_to_frame(rows):
+    df = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+    return df.sort_values("host", kind="stable").reset_index(drop=True)
+
+
+def render_fanout(hosts, username, password, command, max_workers=FANOUT_MAX_WORKERS,
+                  timeout=FANOUT_HOST_TIMEOUT):
+    """Runs a fan-out and redraws a progress bar and results table as each host finishes."""
+    if not paramiko:
+        st.error("Paramiko library not found. Please install it with `pip install paramiko`.")
+        return results_to_frame([])
+
+    progress = st.progress(0.0, text=f"Running on {len(hosts)} hosts...")
+    table = st.empty()
+    rows = []
+    for row in iter_fanout(hosts, username, password, command, max_workers, timeout):
+        rows.append(row)
+        progress.progress(len(rows) / len(hosts), text=f"{len(rows)}/{len(hosts)} hosts finished (last: {row['host']})")
+        table.dataframe(results_to_frame(rows)[["host", "status", "exit_code", "latency_s"]], use_container_width=True)
+    df = results_to_frame(rows)
+    progress.empty()
+    return df
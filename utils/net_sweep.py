@@ -0,0 +1,190 @@
+import streamlit as st
+import re
+import shlex
+import time
+import pandas as pd
+import plotly.express as px
+from utils.multi_host import parse_host_list
+from utils.ssh_utils import run_ssh_command_bytes
+
+SWEEP_PROBES = ["ping", "dig", "curl"]
+SWEEP_CONCURRENCY = 16            # probes running at once on the remote host
+SWEEP_MAX_TARGETS = 200
+SWEEP_PING_COUNT = 3
+SWEEP_CURL_TIMEOUT = 10
+# A leading "@" would make curl read the format from a file, so this marker has none.
+SWEEP_CURL_FORMAT = r"CURL-TIMING %{http_code} %{time_namelookup} %{time_connect} %{time_appconnect} %{time_starttransfer} %{time_total} %{remote_ip}\n"
+LATENCY_COLUMNS = ["ping_avg_ms", "dns_ms", "connect_ms", "tls_ms", "ttfb_ms"]
+
+
+def _hostname(target):
+    """Host part of a target that may be a bare host, host:port or a URL."""
+    if "://" in target:
+        target = target.split("://", 1)[1]
+    target = target.split("/", 1)[0].rsplit("@", 1)[-1]
+    if target.startswith("["):
+        return target[1:].split("]", 1)[0]
+    return target.rsplit(":", 1)[0] if target.count(":") == 1 else target
+
+
+def probe_command(probe, target):
+    host = shlex.quote(_hostname(target))
+    if probe == "ping":
+        return f"ping -c {SWEEP_PING_COUNT} -i 0.2 -W 2 -q {host}"
+    if probe == "dig":
+        return f"dig +tries=1 +time=3 {host}"
+    if probe == "curl":
+        url = target if "://" in target else f"https://{target}"
+        return (f"curl -s -o /dev/null -m {SWEEP_CURL_TIMEOUT} -w {shlex.quote(SWEEP_CURL_FORMAT)} "
+                f"{shlex.quote(url)}")
+    raise ValueError(f"Unknown probe: {probe}")
+
+
+def build_sweep_command(jobs, concurrency=SWEEP_CONCURRENCY):
+    """One remote shell that runs every (probe, target) job in the background, concurrency at a time.
+
+    Each job writes to its own file so outputs never interleave; they are printed in job order,
+    fenced by "@@RESULT <index> <exit code>" lines, once all jobs have finished.
+    """
+    parts = ['d=$(mktemp -d) || exit 1']
+    for i, (probe, target) in enumerate(jobs):
+        parts.append(f'({probe_command(probe, target)} > "$d/{i}" 2>&1; echo $? > "$d/{i}.rc") &')
+        if (i + 1) % concurrency == 0:
+            parts.append("wait")
+    parts.append("wait")
+    parts.extend(f'echo "@@RESULT {i} $(cat "$d/{i}.rc")"; cat "$d/{i}"' for i in range(len(jobs)))
+    parts.append('rm -rf "$d"')
+    return "\n".join(parts)
+
+
+def split_sweep_output(text):
+    """{job index: (exit_code, output)} from build_sweep_command output."""
+    results, current = {}, None
+    for line in text.splitlines():
+        match = re.match(r"^@@RESULT (\d+) (-?\d+)?", line)
+        if match:
+            current = int(match.group(1))
+            results[current] = (int(match.group(2)) if match.group(2) else None, [])
+        elif current is not None:
+            results[current][1].append(line)
+    return {i: (code, "\n".join(lines)) for i, (code, lines) in results.items()}
+
+
+def _last_line(output, exit_code):
+    lines = [line for line in output.splitlines() if line.strip()]
+    return lines[-1] if lines else f"exit status {exit_code}"
+
+
+def parse_ping(output, exit_code):
+    row = {}
+    match = re.search(r"(\d+) packets transmitted, (\d+) (?:packets )?received.*?([\d.]+)% packet loss", output)
+    if match:
+        row["ping_loss_pct"] = float(match.group(3))
+    match = re.search(r"= ([\d.]+)/([\d.]+)/([\d.]+)/([\d.]+) ms", output)
+    if match:
+        row.update(ping_min_ms=float(match.group(1)), ping_avg_ms=float(match.group(2)),
+                   ping_max_ms=float(match.group(3)))
+    if "ping_avg_ms" not in row:
+        row["ping_error"] = _last_line(output, exit_code)
+    return row
+
+
+def parse_dig(output, exit_code):
+    row = {}
+    match = re.search(r"status: (\w+)", output)
+    if match:
+        row["dns_status"] = match.group(1)
+    match = re.search(r"ANSWER: (\d+)", output)
+    if match:
+        row["dns_answers"] = int(match.group(1))
+    match = re.search(r";; Query time: (\d+) msec", output)
+    if match:
+        row["dns_ms"] = float(match.group(1))
+    if exit_code != 0 or "dns_status" not in row:
+        row["dns_error"] = _last_line(output, exit_code)
+    elif row["dns_status"] != "NOERROR" or not row.get("dns_answers"):
+        row["dns_error"] = f"{row['dns_status']}, {row.get('dns_answers', 0)} answers"
+    return row
+
+
+def parse_curl(output, exit_code):
+    match = re.search(r"^CURL-TIMING (\d+) ([\d.]+) ([\d.]+) ([\d.]+) ([\d.]+) ([\d.]+) ?(\S*)", output, re.M)
+    if not match:
+        return {"http_error": _last_line(output, exit_code)}
+    code = int(match.group(1))
+    lookup, connect, tls, first_byte, total = (float(v) * 1000 for v in match.groups()[1:6])
+    row = {"http_code": code, "remote_ip": match.group(7)}
+    if connect:
+        # curl's timings are cumulative from the start of the transfer; report each phase on its own.
+        row.update(connect_ms=connect - lookup, tls_ms=tls - connect if tls else None)
+    if code:
+        row.update(ttfb_ms=first_byte, total_ms=total)
+    if exit_code != 0:
+        row["http_error"] = f"curl exit status {exit_code}"
+    return row
+
+
+_PARSERS = {"ping": parse_ping, "dig": parse_dig, "curl": parse_curl}
+
+
+def run_sweep(host, username, password, targets, probes, concurrency=SWEEP_CONCURRENCY):
+    """Runs every probe against every target on the remote host. Returns (one row per target, elapsed s)."""
+    jobs = [(probe, target) for target in targets for probe in probes]
+    batches = -(-len(jobs) // concurrency)
+    started = time.perf_counter()
+    exit_code, out, err = run_ssh_command_bytes(host, username, password, build_sweep_command(jobs, concurrency),
+                                                timeout=batches * (SWEEP_CURL_TIMEOUT + 5) + 30)
+    elapsed = time.perf_counter() - started
+    results = split_sweep_output(out.decode("utf-8", errors="replace"))
+    if not results:
+        raise RuntimeError(err or f"Sweep exited with status {exit_code}")
+    rows = {target: {"target": target} for target in targets}
+    for i, (probe, target) in enumerate(jobs):
+        code, output = results.get(i, (None, "no result"))
+        rows[target].update(_PARSERS[probe](output, code))
+    return pd.DataFrame(list(rows.values())), elapsed
+
+
+def latency_histograms(df):
+    columns = [c for c in LATENCY_COLUMNS if c in df and df[c].notna().any()]
+    long = df.melt(id_vars="target", value_vars=columns, var_name="metric", value_name="ms").dropna()
+    fig = px.histogram(long, x="ms", facet_col="metric", facet_col_wrap=min(len(columns), 3), nbins=30)
+    fig.update_xaxes(matches=None, showticklabels=True)
+    fig.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
+    return fig
+
+
+def render_net_sweep(host, username, password):
+    """Target list, probe selection, results table and latency histograms."""
+    targets_text = st.text_area("Targets (hosts, host:port or URLs; one per line)", key="net_sweep_targets",
+                                placeholder="db01.example.com\nhttps://api.example.com/health", height=120)
+    cols = st.columns([3, 1])
+    probes = cols[0].multiselect("Probes", SWEEP_PROBES, default=SWEEP_PROBES, key="net_sweep_probes")
+    concurrency = cols[1].number_input("Concurrency", min_value=1, max_value=64, value=SWEEP_CONCURRENCY,
+                                       key="net_sweep_concurrency")
+    if st.button("Run Diagnostics Sweep"):
+        targets = parse_host_list(targets_text)
+        if not targets or not probes:
+            st.warning("Please enter at least one target and select at least one probe.")
+        elif len(targets) > SWEEP_MAX_TARGETS:
+            st.warning(f"Please enter at most {SWEEP_MAX_TARGETS} targets.")
+        else:
+            with st.spinner(f"Probing {len(targets)} targets from {host}..."):
+                try:
+                    df, elapsed = run_sweep(host, username, password, targets, probes, int(concurrency))
+                    st.session_state.net_sweep = {"frame": df, "elapsed": elapsed, "probes": probes}
+                except Exception as e:
+                    st.error(f"Sweep failed: {e}")
+
+    sweep = st.session_state.get('net_sweep')
+    if not sweep:
+        return
+    df = sweep["frame"]
+    st.caption(f"{len(df)} targets x {len(sweep['probes'])} probes in {sweep['elapsed']:.1f}s over one SSH session.")
+    error_cols = [c for c in df if c.endswith("_error")]
+    failing = df[df[error_cols].notna().any(axis=1)] if error_cols else df.iloc[0:0]
+    if not failing.empty:
+        st.error(f"{len(failing)} targets had at least one failing probe.")
+    st.dataframe(df.round(1), use_container_width=True, hide_index=True)
+    if any(c in df and df[c].notna().any() for c in LATENCY_COLUMNS):
+        st.plotly_chart(latency_histograms(df), use_container_width=True)
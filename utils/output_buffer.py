@@ -0,0 +1,149 @@
+import streamlit as st
+import tempfile
+from array import array
+from collections import deque
+from utils.ssh_utils import render_ssh_stream
+
+OUTPUT_MEMORY_BYTES = 2 * 1024 * 1024    # output kept in RAM before spilling to a temp file
+OUTPUT_RING_LINES = 1000                 # most recent lines always kept in RAM for the tail view
+OUTPUT_PAGE_SIZES = [100, 200, 500, 1000]
+CAPTURE_MAX_BYTES = 512 * 1024 * 1024    # captures spill to disk, so they may be far larger than a plain stream
+CAPTURE_MAX_LINES = 10_000_000
+
+
+class SpillingOutputBuffer:
+    """Line buffer that holds small outputs in memory and spills large ones to an anonymous temp file.
+
+    Every line's byte offset is indexed, so any page can be read back with one seek. The temp file
+    is deleted automatically when the buffer is closed or garbage-collected.
+    """
+
+    def __init__(self, memory_bytes=OUTPUT_MEMORY_BYTES, ring_lines=OUTPUT_RING_LINES):
+        self.memory_bytes = memory_bytes
+        self.tail = deque(maxlen=ring_lines)
+        self.line_count = 0
+        self.byte_count = 0
+        self._lines = []          # all lines, until we spill
+        self._file = None
+        self._offsets = array("Q")
+
+    @property
+    def spilled(self):
+        return self._file is not None
+
+    def _spill(self):
+        self._file = tempfile.TemporaryFile(prefix="ssh_output_")
+        for line in self._lines:
+            self._write(line)
+        self._lines = []
+
+    def _write(self, line):
+        data = line.encode("utf-8", errors="replace") + b"\n"
+        self._offsets.append(self._file.tell())
+        self._file.write(data)
+
+    def append(self, line):
+        self.line_count += 1
+        self.byte_count += len(line) + 1
+        self.tail.append(line)
+        if self._file is None:
+            self._lines.append(line)
+            if self.byte_count > self.memory_bytes:
+                self._spill()
+        else:
+            self._file.seek(0, 2)
+            self._write(line)
+
+    def extend_text(self, text):
+        for line in text.splitlines():
+            self.append(line)
+
+    def get_lines(self, start, count):
+        """Returns lines [start, start+count) without loading the rest of the output."""
+        start = max(0, start)
+        end = min(self.line_count, start + count)
+        if start >= end:
+            return []
+        if self._file is None:
+            return self._lines[start:end]
+        self._file.flush()
+        self._file.seek(self._offsets[start])
+        stop = self._offsets[end] if end < self.line_count else None
+        data = self._file.read() if stop is None else self._file.read(stop - self._offsets[start])
+        return data.decode("utf-8", errors="replace").splitlines()
+
+    def page_count(self, page_size):
+        return max(1, -(-self.line_count // page_size))
+
+    def get_page(self, page, page_size):
+        return self.get_lines(page * page_size, page_size)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._lines = []
+
+
+def _store(key, buffer):
+    old = st.session_state.get(key)
+    if isinstance(old, dict) and old.get("buffer") is not None:
+        old["buffer"].close()
+    st.session_state[key] = {"buffer": buffer, "error": ""}
+    return st.session_state[key]
+
+
+def capture_ssh_output(host, username, password, command, key, line_filter=None, label=None):
+    """Streams a remote command into a spilling buffer stored under st.session_state[key].
+
+    Pair it with render_captured_output(key) outside the button block so paging does not re-run
+    the command. Lines for which line_filter(line) returns False are left out of the buffer.
+    """
+    entry = _store(key, SpillingOutputBuffer())
+    sink = entry["buffer"].append
+    if line_filter is not None:
+        def sink(line):
+            if line_filter(line):
+                entry["buffer"].append(line)
+    _, error = render_ssh_stream(host, username, password, command, sink=sink, show_final=False, label=label,
+                                  max_bytes=CAPTURE_MAX_BYTES, max_lines=CAPTURE_MAX_LINES)
+    entry["error"] = error
+    return entry
+
+
+def capture_text_output(text, error, key):
+    """Stores already-captured text (e.g. from a local subprocess) for paginated viewing."""
+    buffer = SpillingOutputBuffer()
+    buffer.extend_text(text or "")
+    entry = _store(key, buffer)
+    entry["error"] = error or ""
+    return entry
+
+
+def render_captured_output(key, default_page_size=200):
+    """Paginated viewer: only the selected page of a captured output is sent to the browser."""
+    entry = st.session_state.get(key)
+    if not entry:
+        return
+    buffer = entry["buffer"]
+    if buffer.line_count:
+        if buffer.line_count <= default_page_size:
+            st.code("\n".join(buffer.get_lines(0, buffer.line_count)))
+        else:
+            col_p1, col_p2, col_p3 = st.columns([1, 1, 2])
+            with col_p1:
+                page_size = st.selectbox("Lines per page", OUTPUT_PAGE_SIZES,
+                                         index=OUTPUT_PAGE_SIZES.index(default_page_size) if default_page_size in OUTPUT_PAGE_SIZES else 0,
+                                         key=f"{key}_page_size")
+            pages = buffer.page_count(page_size)
+            with col_p2:
+                page = st.number_input(f"Page (1-{pages})", min_value=1, max_value=pages, value=1, key=f"{key}_page_{page_size}")
+            with col_p3:
+                storage = "spilled to disk" if buffer.spilled else "in memory"
+                st.caption(f"{buffer.line_count:,} lines, {buffer.byte_count / 1024:,.0f} KiB ({storage}).")
+            if st.checkbox(f"Show only the last {len(buffer.tail)} lines", key=f"{key}_tail"):
+                st.code("\n".join(buffer.tail))
+            else:
+                st.code("\n".join(buffer.get_page(int(page) - 1, page_size)))
+    if entry.get("error"):
+        st.error(entry["error"])
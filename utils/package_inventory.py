@@ -0,0 +1,193 @@
+import streamlit as st
+import re
+import time
+import numpy as np
+import pandas as pd
+from utils.multi_host import iter_fanout
+
+RPM_QUERYFORMAT = r"%{NAME}\t%{EPOCH}\t%{VERSION}\t%{RELEASE}\t%{ARCH}\t%{INSTALLTIME}\t%{SIZE}\n"
+RPM_INVENTORY_COMMAND = f"rpm -qa --queryformat '{RPM_QUERYFORMAT}'"
+INVENTORY_MAX_BYTES = 32 * 1024 * 1024
+INVENTORY_TIMEOUT = 120
+INVENTORY_COLUMNS = ["name", "epoch", "version", "release", "arch", "evr", "installed", "size_bytes"]
+
+
+def parse_rpm_inventory(output):
+    """Parses RPM_INVENTORY_COMMAND output into a DataFrame, one row per installed package."""
+    rows = [line.split("\t") for line in output.splitlines()]
+    df = pd.DataFrame([row for row in rows if len(row) == 7],
+                      columns=["name", "epoch", "version", "release", "arch", "installed", "size_bytes"])
+    df["epoch"] = pd.to_numeric(df["epoch"].replace("(none)", "0"), errors="coerce").fillna(0).astype(int)
+    df["arch"] = df["arch"].replace("(none)", "")
+    df["evr"] = np.where(df["epoch"] > 0, df["epoch"].astype(str) + ":", "") + df["version"] + "-" + df["release"]
+    df["installed"] = pd.to_datetime(pd.to_numeric(df["installed"], errors="coerce"), unit="s")
+    df["size_bytes"] = pd.to_numeric(df["size_bytes"], errors="coerce").astype("Int64")
+    return df[INVENTORY_COLUMNS].sort_values(["name", "arch"]).reset_index(drop=True)
+
+
+def _vercmp(a, b):
+    # rpmvercmp: compare alternating numeric/alpha segments; "~" sorts before everything.
+    if a == b:
+        return 0
+    segs_a = re.findall(r"~|[0-9]+|[a-zA-Z]+", a)
+    segs_b = re.findall(r"~|[0-9]+|[a-zA-Z]+", b)
+    for x, y in zip(segs_a, segs_b):
+        if x == y:
+            continue
+        if x == "~" or y == "~":
+            return -1 if x == "~" else 1
+        if x.isdigit() != y.isdigit():
+            return 1 if x.isdigit() else -1
+        if x.isdigit():
+            x, y = int(x), int(y)
+        return 1 if x > y else -1
+    rest_a, rest_b = segs_a[len(segs_b):], segs_b[len(segs_a):]
+    if rest_a:
+        return -1 if rest_a[0] == "~" else 1
+    if rest_b:
+        return 1 if rest_b[0] == "~" else -1
+    return 0
+
+
+def compare_evr(a, b):
+    """Orders two "[epoch:]version-release" strings like rpm does. Returns -1, 0 or 1."""
+    def split(evr):
+        epoch, _, rest = evr.rpartition(":")
+        version, _, release = rest.rpartition("-")
+        return int(epoch or 0), version, release
+    ea, va, ra = split(a)
+    eb, vb, rb = split(b)
+    if ea != eb:
+        return 1 if ea > eb else -1
+    return _vercmp(va, vb) or _vercmp(ra, rb)
+
+
+def snapshot_inventories(hosts, username, password, on_result=None):
+    """Takes an rpm -qa snapshot on every host concurrently. Returns {host: entry}."""
+    snapshots = {}
+    for row in iter_fanout(hosts, username, password, RPM_INVENTORY_COMMAND,
+                           timeout=INVENTORY_TIMEOUT, max_bytes=INVENTORY_MAX_BYTES):
+        entry = {"taken_at": time.time(), "latency_s": row["latency_s"], "error": "", "frame": None}
+        if row["status"] == "ok":
+            entry["frame"] = parse_rpm_inventory(row["stdout"])
+        else:
+            entry["error"] = row["stderr"] or f"rpm exited with status {row['exit_code']}"
+        snapshots[row["host"]] = entry
+        if on_result:
+            on_result(row["host"], entry)
+    return snapshots
+
+
+def combined_inventory(snapshots):
+    """All hosts' inventories stacked with a host column."""
+    frames = [entry["frame"].assign(host=host) for host, entry in snapshots.items() if entry["frame"] is not None]
+    if not frames:
+        return pd.DataFrame(columns=["host"] + INVENTORY_COLUMNS)
+    return pd.concat(frames, ignore_index=True)[["host"] + INVENTORY_COLUMNS]
+
+
+def hosts_with_package(combined, name, version=None):
+    """Per-host installed versions of one package; hosts without it (or another version) are listed too."""
+    hosts = combined["host"].unique()
+    matches = combined[combined["name"] == name]
+    if version:
+        matches = matches[matches["evr"].str.contains(version, regex=False)]
+    per_host = matches.groupby("host")["evr"].agg(lambda s: ", ".join(sorted(s.unique())))
+    return pd.DataFrame({"host": hosts, "installed": per_host.reindex(hosts).fillna("").values,
+                         "has_match": np.isin(hosts, per_host.index)})
+
+
+def _collapse(frame):
+    # Packages like kernel can be installed in several versions; compare the whole set per name/arch.
+    return frame.groupby(["name", "arch"], as_index=False)["evr"].agg(lambda s: ", ".join(sorted(s.unique())))
+
+
+def diff_inventories(frame_a, frame_b, label_a="A", label_b="B", include_same=False):
+    """Vectorized diff of two inventories on (name, arch).
+
+    status is one of only_<a>, only_<b>, newer_on_<a>, newer_on_<b>, different or same.
+    """
+    merged = _collapse(frame_a).merge(_collapse(frame_b), on=["name", "arch"], how="outer",
+                                      suffixes=(f"_{label_a}", f"_{label_b}"), indicator=True)
+    col_a, col_b = f"evr_{label_a}", f"evr_{label_b}"
+    merged["status"] = np.select(
+        [merged["_merge"] == "left_only", merged["_merge"] == "right_only", merged[col_a] == merged[col_b]],
+        [f"only_{label_a}", f"only_{label_b}", "same"], default="different")
+    changed = merged["status"] == "different"
+    single = changed & ~merged[col_a].str.contains(",", na=True) & ~merged[col_b].str.contains(",", na=True)
+    order = [compare_evr(a, b) for a, b in zip(merged.loc[single, col_a], merged.loc[single, col_b])]
+    merged.loc[single, "status"] = [f"newer_on_{label_a}" if o > 0 else f"newer_on_{label_b}" if o < 0 else "same"
+                                    for o in order]
+    if not include_same:
+        merged = merged[merged["status"] != "same"]
+    return merged.drop(columns="_merge").sort_values(["status", "name"]).reset_index(drop=True)
+
+
+def render_package_inventory(host, username, password):
+    """Snapshot controls plus local search, version lookup and a two-host diff."""
+    if 'package_inventories' not in st.session_state:
+        st.session_state.package_inventories = {}
+    snapshots = st.session_state.package_inventories
+    candidates = list(dict.fromkeys([host] + list(st.session_state.get('ssh_host_group') or []) + list(snapshots)))
+    hosts = st.multiselect("Hosts to snapshot (add more on the Multi-Host Command page)", candidates, default=[host],
+                           key="inventory_hosts")
+    if st.button("Take Package Inventory Snapshot (rpm -qa)"):
+        if hosts:
+            progress = st.progress(0.0, text="Querying rpm database...")
+            done = []
+
+            def on_result(result_host, entry):
+                done.append(result_host)
+                progress.progress(len(done) / len(hosts), text=f"{len(done)}/{len(hosts)} hosts done")
+
+            snapshots.update(snapshot_inventories(hosts, username, password, on_result))
+            progress.empty()
+        else: st.warning("Please select at least one host.")
+
+    if not snapshots:
+        return
+    status = pd.DataFrame([{"host": h, "packages": len(e["frame"]) if e["frame"] is not None else None,
+                            "age_s": int(time.time() - e["taken_at"]), "latency_s": e["latency_s"], "error": e["error"]}
+                           for h, e in snapshots.items()])
+    st.dataframe(status, use_container_width=True, hide_index=True)
+    combined = combined_inventory(snapshots)
+    if combined.empty:
+        return
+
+    st.write("#### Search Packages (local)")
+    s_cols = st.columns(4)
+    name_filter = s_cols[0].text_input("Name contains", key="inventory_name")
+    version_filter = s_cols[1].text_input("Version contains", key="inventory_version")
+    arch_filter = s_cols[2].selectbox("Arch", ["(any)"] + sorted(combined["arch"].unique()), key="inventory_arch")
+    host_filter = s_cols[3].selectbox("Host", ["(all)"] + list(snapshots), key="inventory_host_filter")
+    view = combined
+    if name_filter:
+        view = view[view["name"].str.contains(name_filter, case=False, regex=False)]
+    if version_filter:
+        view = view[view["evr"].str.contains(version_filter, regex=False)]
+    if arch_filter != "(any)":
+        view = view[view["arch"] == arch_filter]
+    if host_filter != "(all)":
+        view = view[view["host"] == host_filter]
+    st.caption(f"{len(view):,} of {len(combined):,} package rows.")
+    st.dataframe(view.head(2000), use_container_width=True, hide_index=True)
+
+    st.write("#### Which Hosts Have...")
+    w_cols = st.columns(2)
+    which_name = w_cols[0].text_input("Exact package name (e.g., openssl)", key="inventory_which_name")
+    which_version = w_cols[1].text_input("Version contains (optional)", key="inventory_which_version")
+    if which_name:
+        st.dataframe(hosts_with_package(combined, which_name, which_version or None), use_container_width=True,
+                     hide_index=True)
+
+    ready = [h for h, e in snapshots.items() if e["frame"] is not None]
+    if len(ready) >= 2:
+        st.write("#### Compare Two Hosts")
+        d_cols = st.columns(3)
+        host_a = d_cols[0].selectbox("Host A", ready, index=0, key="inventory_diff_a")
+        host_b = d_cols[1].selectbox("Host B", ready, index=1, key="inventory_diff_b")
+        include_same = d_cols[2].checkbox("Include identical packages", key="inventory_diff_same")
+        if host_a != host_b:
+            diff = diff_inventories(snapshots[host_a]["frame"], snapshots[host_b]["frame"], "A", "B", include_same)
+            st.caption(" | ".join(f"{status}: {count}" for status, count in diff["status"].value_counts().items()) or "No differences.")
+            st.dataframe(diff, use_container_width=True, hide_index=True)
@@ -0,0 +1,340 @@
+import streamlit as st
+import json
+import os
+import re
+import time
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+from utils.ssh_utils import run_ssh_command_bytes
+
+PERF_CAPTURE_DIR = os.path.join(os.path.expanduser("~"), ".main_menu_cache", "perf_captures")
+PERF_TOOLS = ["vmstat", "iostat", "pidstat", "sar"]
+CAPTURE_MAX_SECONDS = 600
+CAPTURE_TOP_PROCESSES = 8
+
+# Each tool's first report covers one interval, so sample k of every tool spans the same wall-clock
+# interval; vmstat's since-boot line and iostat's since-boot report are dropped (-y).
+_TOOL_COMMANDS = {
+    "vmstat": "vmstat -n -t {interval} {count_plus_one}",
+    "iostat": "iostat -d -x -y -t {interval} {count}",
+    "pidstat": "pidstat -h -u -r -d {interval} {count}",
+    "sar": "sar -q -n DEV {interval} {count}",
+}
+
+
+def build_capture_command(duration, interval):
+    """Runs all PERF_TOOLS side by side in one remote session, then prints each tool's output fenced by markers."""
+    count = max(int(duration) // int(interval), 1)
+    runs = " ".join(
+        f"({template.format(interval=interval, count=count, count_plus_one=count + 1)} > {tool}.out 2>&1; "
+        f"echo $? > {tool}.rc) &"
+        for tool, template in _TOOL_COMMANDS.items())
+    prints = "; ".join(f'echo "@@TOOL {tool} $(cat {tool}.rc)"; cat {tool}.out' for tool in PERF_TOOLS)
+    return (f'd=$(mktemp -d) && cd "$d" || exit 1; export LC_ALL=C S_TIME_FORMAT=ISO; '
+            f'echo "@@CAPTURE $(date +%s) {interval} {count}"; {runs} wait; {prints}; cd / && rm -rf "$d"')
+
+
+def split_capture_output(text):
+    """Splits raw capture output into ({"start", "interval", "count"}, {tool: (exit_code, output)})."""
+    meta, sections, tool = {}, {}, None
+    for line in text.splitlines():
+        if line.startswith("@@CAPTURE "):
+            start, interval, count = line.split()[1:4]
+            meta = {"start": int(start), "interval": int(interval), "count": int(count)}
+        elif line.startswith("@@TOOL "):
+            parts = line.split()
+            tool = parts[1]
+            exit_code = int(parts[2]) if len(parts) > 2 and parts[2].lstrip("-").isdigit() else None
+            sections[tool] = (exit_code, [])
+        elif tool:
+            sections[tool][1].append(line)
+    return meta, {tool: (code, "\n".join(lines)) for tool, (code, lines) in sections.items()}
+
+
+def _is_number(token):
+    return re.fullmatch(r"-?\d+(\.\d+)?", token) is not None
+
+
+def parse_vmstat(output):
+    """vmstat -n -t rows (since-boot line dropped), numbered by sample."""
+    header, rows = None, []
+    for line in output.splitlines():
+        parts = line.split()
+        if parts and parts[0] == "r" and "free" in parts:
+            # -t appends one header field (the zone: "UTC", "+03", ...) and two row fields (date, time).
+            header = parts[:-1]
+        elif header and parts and _is_number(parts[0]):
+            rows.append([float(v) for v in parts[:-2]])
+    df = pd.DataFrame(rows[1:], columns=header)
+    df.insert(0, "sample", range(1, len(df) + 1))
+    return df
+
+
+def parse_iostat(output):
+    """iostat -d -x -y -t reports as a long frame: sample, device, one column per statistic."""
+    rows, header, sample = [], None, 0
+    for line in output.splitlines():
+        parts = line.split()
+        if not parts:
+            header = None
+        elif parts[0].startswith("Device"):
+            header = [p.rstrip(":") for p in parts]
+            sample += 1
+        elif header and len(parts) == len(header):
+            rows.append([sample, parts[0]] + [float(v) for v in parts[1:]])
+    if not rows:
+        return pd.DataFrame(columns=["sample", "device"])
+    return pd.DataFrame(rows, columns=["sample", "device"] + header[1:])
+
+
+def parse_pidstat(output, start, interval):
+    """pidstat -h rows (epoch timestamps) mapped onto the capture's sample grid."""
+    rows, header = [], None
+    for line in output.splitlines():
+        parts = line.split()
+        if parts[:2] == ["#", "Time"]:
+            header = parts[1:]
+        elif header and parts and parts[0].isdigit() and len(parts) >= len(header):
+            command = " ".join(parts[len(header) - 1:])
+            rows.append(parts[:len(header) - 1] + [command])
+    if not rows:
+        return pd.DataFrame(columns=["sample", "PID", "Command"])
+    df = pd.DataFrame(rows, columns=header)
+    numeric = [c for c in header if c != "Command"]
+    df[numeric] = df[numeric].apply(pd.to_numeric, errors="coerce")
+    df.insert(0, "sample", ((df["Time"] - start) / interval).round().astype(int).clip(lower=1))
+    return df.drop(columns="Time")
+
+
+def parse_sar(output):
+    """sar reports as {first column name: frame}, e.g. "runq-sz" for -q and "IFACE" for -n DEV.
+
+    Reports are numbered by the order of their timestamps, so a midnight roll-over is harmless.
+    """
+    blocks, header, new_block, times = {}, None, True, {}
+    for line in output.splitlines():
+        parts = line.split()
+        if not parts:
+            new_block = True
+            continue
+        if new_block:
+            # The first line of each block is its column header, prefixed by the interval start time.
+            new_block = False
+            header = parts[1:] if ":" in parts[0] and not parts[0].startswith("Average") else None
+            if header:
+                blocks.setdefault(header[0], (header, []))
+            continue
+        if header and len(parts) == len(header) + 1 and not parts[0].startswith("Average"):
+            sample = times.setdefault(parts[0], len(times) + 1)
+            blocks[header[0]][1].append([sample] + parts[1:])
+    frames = {}
+    for name, (columns, rows) in blocks.items():
+        df = pd.DataFrame(rows, columns=["sample"] + columns)
+        numeric = columns[1:] if name == "IFACE" else columns
+        df[numeric] = df[numeric].apply(pd.to_numeric, errors="coerce")
+        frames[name] = df
+    return frames
+
+
+def parse_capture(raw):
+    """Parses a raw capture into aligned frames.
+
+    Returns {"timeline": one row per sample indexed by time, "processes": pidstat rows,
+    "devices": iostat rows, "errors": {tool: message}}.
+    """
+    meta, sections = split_capture_output(raw)
+    start, interval = meta["start"], meta["interval"]
+    index = pd.RangeIndex(1, meta["count"] + 1, name="sample")
+    timeline = pd.DataFrame(index=index)
+    errors = {tool: (output.strip().splitlines() or [f"exit status {code}"])[-1]
+              for tool, (code, output) in sections.items() if code != 0}
+    for tool in PERF_TOOLS:
+        if tool not in sections:
+            errors[tool] = "no output"
+
+    vmstat = parse_vmstat(sections.get("vmstat", (None, ""))[1]).set_index("sample")
+    if not vmstat.empty:
+        timeline["cpu_busy_pct"] = vmstat["us"] + vmstat["sy"]
+        timeline["iowait_pct"] = vmstat["wa"]
+        timeline["steal_pct"] = vmstat["st"]
+        timeline["running"] = vmstat["r"]
+        timeline["blocked"] = vmstat["b"]
+        timeline["free_mib"] = vmstat["free"] / 1024
+        timeline["swap_in_kbs"] = vmstat["si"]
+        timeline["swap_out_kbs"] = vmstat["so"]
+        timeline["context_switches_s"] = vmstat["cs"]
+
+    devices = parse_iostat(sections.get("iostat", (None, ""))[1])
+    if not devices.empty:
+        per_sample = devices.groupby("sample")
+        timeline["disk_util_max_pct"] = per_sample["%util"].max()
+        timeline["disk_iops"] = per_sample["r/s"].sum() + per_sample["w/s"].sum()
+        awaits = [c for c in ("r_await", "w_await", "await") if c in devices]
+        timeline["disk_await_max_ms"] = devices.assign(a=devices[awaits].max(axis=1)).groupby("sample")["a"].max()
+
+    sar = parse_sar(sections.get("sar", (None, ""))[1])
+    if "runq-sz" in sar:
+        queue = sar["runq-sz"].groupby("sample").last()
+        timeline["runq_sz"] = queue["runq-sz"]
+        timeline["load1"] = queue["ldavg-1"]
+    if "IFACE" in sar:
+        net = sar["IFACE"][sar["IFACE"]["IFACE"] != "lo"].groupby("sample")
+        timeline["net_rx_kbs"] = net["rxkB/s"].sum()
+        timeline["net_tx_kbs"] = net["txkB/s"].sum()
+
+    timeline.index = pd.to_datetime(start + index * interval, unit="s", utc=True).tz_convert(None)
+    timeline.index.name = "time"
+    processes = parse_pidstat(sections.get("pidstat", (None, ""))[1], start, interval)
+    return {"meta": meta, "timeline": timeline, "processes": processes, "devices": devices, "errors": errors}
+
+
+def run_capture(host, username, password, duration, interval):
+    """Runs the capture (blocking for about duration seconds) and returns the raw output."""
+    exit_code, out, err = run_ssh_command_bytes(host, username, password, build_capture_command(duration, interval),
+                                                timeout=duration + 60)
+    raw = out.decode("utf-8", errors="replace")
+    if "@@CAPTURE " not in raw:
+        raise RuntimeError(err or f"Capture exited with status {exit_code}")
+    return raw
+
+
+def save_capture(host, raw):
+    """Stores the raw capture under PERF_CAPTURE_DIR; it is re-parsed on load. Returns the file name."""
+    os.makedirs(PERF_CAPTURE_DIR, exist_ok=True)
+    meta, _ = split_capture_output(raw)
+    safe_host = re.sub(r"[^\w.-]", "_", host)
+    name = f"{safe_host}_{time.strftime('%Y%m%d-%H%M%S', time.localtime(meta['start']))}.json"
+    with open(os.path.join(PERF_CAPTURE_DIR, name), "w") as f:
+        json.dump({"host": host, "raw": raw}, f)
+    return name
+
+
+def list_captures():
+    if not os.path.isdir(PERF_CAPTURE_DIR):
+        return []
+    return sorted((f for f in os.listdir(PERF_CAPTURE_DIR) if f.endswith(".json")), reverse=True)
+
+
+def load_capture(name):
+    with open(os.path.join(PERF_CAPTURE_DIR, name)) as f:
+        saved = json.load(f)
+    capture = parse_capture(saved["raw"])
+    capture["host"] = saved["host"]
+    return capture
+
+
+def summarize(timeline):
+    """mean / p95 / max per timeline column."""
+    return timeline.agg(["mean", lambda s: s.quantile(0.95), "max"]).T.set_axis(["mean", "p95", "max"], axis=1).round(2)
+
+
+def top_processes(processes, n=CAPTURE_TOP_PROCESSES):
+    """%CPU per sample for the n processes with the highest mean %CPU (columns "command (pid)")."""
+    if processes.empty or "%CPU" not in processes:
+        return pd.DataFrame()
+    labelled = processes.assign(process=processes["Command"] + " (" + processes["PID"].astype(str) + ")")
+    top = labelled.groupby("process")["%CPU"].sum().nlargest(n).index
+    return labelled[labelled["process"].isin(top)].pivot_table(index="sample", columns="process", values="%CPU",
+                                                               aggfunc="sum").fillna(0)
+
+
+_CHART_ROWS = [
+    ("CPU (%)", ["cpu_busy_pct", "iowait_pct", "steal_pct"]),
+    ("Run queue", ["running", "blocked", "runq_sz", "load1"]),
+    ("Memory / swap", ["free_mib", "swap_in_kbs", "swap_out_kbs"]),
+    ("Disk", ["disk_util_max_pct", "disk_await_max_ms", "disk_iops"]),
+    ("Network (kB/s)", ["net_rx_kbs", "net_tx_kbs"]),
+]
+
+
+def correlated_figure(timeline):
+    """Stacked charts sharing one time axis, with a unified hover across all of them."""
+    rows = [(title, [c for c in cols if c in timeline]) for title, cols in _CHART_ROWS]
+    rows = [(title, cols) for title, cols in rows if cols]
+    fig = make_subplots(rows=len(rows), cols=1, shared_xaxes=True, vertical_spacing=0.04,
+                        subplot_titles=[title for title, _ in rows])
+    for i, (_, cols) in enumerate(rows, start=1):
+        for col in cols:
+            fig.add_trace(go.Scatter(x=timeline.index, y=timeline[col], name=col, mode="lines"), row=i, col=1)
+    fig.update_layout(height=220 * len(rows), hovermode="x unified", margin=dict(t=40, b=20))
+    return fig
+
+
+def _render_capture(capture):
+    meta = capture["meta"]
+    st.caption(f"{capture.get('host', '')}: {meta['count']} samples every {meta['interval']}s from "
+               f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(meta['start']))}.")
+    for tool, error in capture["errors"].items():
+        st.warning(f"{tool}: {error}")
+    timeline = capture["timeline"].dropna(axis=1, how="all")
+    if timeline.empty:
+        return
+    st.plotly_chart(correlated_figure(timeline), use_container_width=True)
+    st.dataframe(summarize(timeline), use_container_width=True)
+    top = top_processes(capture["processes"])
+    if not top.empty:
+        st.write("Top processes by CPU (pidstat, %CPU per sample)")
+        st.line_chart(top)
+    with st.expander("Raw samples"):
+        st.dataframe(timeline, use_container_width=True)
+        if not capture["devices"].empty:
+            st.dataframe(capture["devices"], use_container_width=True, hide_index=True)
+        if not capture["processes"].empty:
+            st.dataframe(capture["processes"], use_container_width=True, hide_index=True)
+
+
+def render_perf_capture(host, username, password):
+    """Capture controls, the latest capture's charts, and a comparison of two saved captures."""
+    cols = st.columns(3)
+    duration = cols[0].number_input("Duration (s)", min_value=5, max_value=CAPTURE_MAX_SECONDS, value=60, step=5,
+                                    key="perf_capture_duration")
+    interval = cols[1].number_input("Interval (s)", min_value=1, max_value=60, value=2, key="perf_capture_interval")
+    if cols[2].button("Start Capture"):
+        st.warning("Requires the `sysstat` package (iostat, pidstat, sar) on the remote host.")
+        with st.spinner(f"Capturing for {int(duration)}s..."):
+            try:
+                raw = run_capture(host, username, password, int(duration), int(interval))
+                name = save_capture(host, raw)
+                st.session_state.perf_capture_selected = name
+                st.success(f"Saved as {name}.")
+            except Exception as e:
+                st.error(f"Capture failed: {e}")
+
+    saved = list_captures()
+    if not saved:
+        return
+    selected = st.session_state.get('perf_capture_selected')
+    name = st.selectbox("Capture", saved, index=saved.index(selected) if selected in saved else 0,
+                        key="perf_capture_view")
+    try:
+        capture = load_capture(name)
+    except Exception as e:
+        st.error(f"Could not load {name}: {e}")
+        return
+    _render_capture(capture)
+
+    if len(saved) < 2:
+        return
+    st.write("#### Compare Captures")
+    c_cols = st.columns(3)
+    other = c_cols[0].selectbox("Compare with", [s for s in saved if s != name], key="perf_capture_compare")
+    try:
+        baseline = load_capture(other)
+    except Exception as e:
+        st.error(f"Could not load {other}: {e}")
+        return
+    both = summarize(capture["timeline"]).join(summarize(baseline["timeline"]), lsuffix=" (this)", rsuffix=" (other)")
+    st.dataframe(both.dropna(how="all"), use_container_width=True)
+    metrics = [c for c in capture["timeline"] if c in baseline["timeline"]]
+    if metrics:
+        metric = c_cols[1].selectbox("Overlay metric", metrics, key="perf_capture_overlay")
+        # Align both captures on seconds since their start so runs taken at different times overlay.
+        overlay = pd.DataFrame({
+            name: pd.Series(capture["timeline"][metric].values,
+                            index=capture["timeline"].index.to_series().sub(capture["timeline"].index[0]).dt.total_seconds().values),
+            other: pd.Series(baseline["timeline"][metric].values,
+                             index=baseline["timeline"].index.to_series().sub(baseline["timeline"].index[0]).dt.total_seconds().values),
+        })
+        overlay.index.name = "seconds since start"
+        st.line_chart(overlay)
@@ -0,0 +1,127 @@
+import streamlit as st
+import shlex
+from utils.ssh_utils import run_ssh_command_bytes
+from utils.sftp_utils import sftp_session, to_sftp_path
+
+RANGE_WINDOW_BYTES = 256 * 1024           # default bytes read per page
+RANGE_WINDOW_CHOICES = [64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024]
+
+
+def remote_file_size(host, username, password, path, use_sudo=False):
+    if use_sudo:
+        exit_code, out, err = run_ssh_command_bytes(host, username, password,
+                                                    f"sudo stat -L -c %s -- {shlex.quote(path)}")
+        if exit_code != 0:
+            raise OSError(err or f"stat exited with status {exit_code}")
+        return int(out.strip())
+    with sftp_session(host, username, password) as sftp:
+        return sftp.stat(to_sftp_path(path)).st_size
+
+
+def read_range(host, username, password, path, offset, length, use_sudo=False):
+    """Reads at most length bytes starting at offset, without touching the rest of the file.
+
+    SFTP seeks on the open handle; the sudo variant uses dd with byte-granular skip/count for
+    files the SSH user cannot read directly.
+    """
+    offset, length = max(int(offset), 0), max(int(length), 0)
+    if use_sudo:
+        command = (f"sudo dd if={shlex.quote(path)} iflag=skip_bytes,count_bytes skip={offset} count={length} "
+                   f"bs=65536 status=none")
+        exit_code, out, err = run_ssh_command_bytes(host, username, password, command)
+        if exit_code != 0:
+            raise OSError(err or f"dd exited with status {exit_code}")
+        return out
+    with sftp_session(host, username, password) as sftp:
+        with sftp.open(to_sftp_path(path), "rb") as remote:
+            remote.seek(offset)
+            return remote.read(length)
+
+
+def split_window(data, offset, size):
+    """Cuts a byte window down to whole lines. Returns [(line_offset, text)], first_offset, end_offset.
+
+    A partial first line is dropped unless the window starts at 0, and a partial last line is
+    dropped unless the window reaches end of file, so page boundaries always fall on line starts.
+    """
+    start, end = 0, len(data)
+    if offset > 0:
+        newline = data.find(b"\n")
+        start = newline + 1 if newline >= 0 else end
+    if offset + end < size:
+        newline = data.rfind(b"\n", start)
+        end = newline + 1 if newline >= 0 else end
+    chunk = data[start:end]
+    if chunk.endswith(b"\n"):
+        chunk = chunk[:-1]
+    lines, position = [], start
+    for raw in chunk.split(b"\n") if chunk else []:
+        lines.append((offset + position, raw.decode("utf-8", errors="replace")))
+        position += len(raw) + 1
+    return lines, offset + start, offset + end
+
+
+def _load(state, host, username, password, offset):
+    offset = min(max(int(offset), 0), max(state["size"] - 1, 0))
+    data = read_range(host, username, password, state["path"], offset, state["window"], state["sudo"])
+    lines, first, end = split_window(data, offset, state["size"])
+    if not lines and data:
+        # A single line longer than the window: show the raw bytes rather than nothing.
+        lines, first, end = [(offset, data.decode("utf-8", errors="replace"))], offset, offset + len(data)
+    state.update(offset=offset, lines=lines, first=first, end=end)
+
+
+def render_ranged_reader(host, username, password):
+    """Head/tail/paging/jump viewer that keeps only the current window in session state."""
+    selected = st.session_state.get('remote_tree_selected')
+    if selected and selected != st.session_state.get('ranged_reader_last_selected'):
+        # A file picked in the directory tree becomes the file to read.
+        st.session_state.ranged_reader_path = selected
+        st.session_state.ranged_reader_last_selected = selected
+    cols = st.columns([4, 1, 1])
+    path = cols[0].text_input("File to read", key="ranged_reader_path")
+    window = cols[1].selectbox("Window", RANGE_WINDOW_CHOICES, index=RANGE_WINDOW_CHOICES.index(RANGE_WINDOW_BYTES),
+                               format_func=lambda b: f"{b // 1024} KiB", key="ranged_reader_window")
+    use_sudo = cols[2].checkbox("Use sudo (dd)", key="ranged_reader_sudo")
+
+    state = st.session_state.get('ranged_reader')
+    b_cols = st.columns(6)
+    target = None
+    try:
+        if b_cols[0].button("Head") and path:
+            state = {"path": path, "window": window, "sudo": use_sudo,
+                     "size": remote_file_size(host, username, password, path, use_sudo)}
+            target = 0
+        if b_cols[1].button("Tail") and path:
+            state = {"path": path, "window": window, "sudo": use_sudo,
+                     "size": remote_file_size(host, username, password, path, use_sudo)}
+            target = max(state["size"] - window, 0)
+        if state and state["path"] == path:
+            state["window"] = window
+            if b_cols[2].button("◀ Previous"):
+                target = max(state["first"] - window, 0)
+            if b_cols[3].button("Next ▶"):
+                target = state["end"] if state["end"] < state["size"] else state["offset"]
+            jump = b_cols[4].text_input("Jump to byte or %", key="ranged_reader_jump", label_visibility="collapsed",
+                                        placeholder="e.g. 1048576 or 50%")
+            if b_cols[5].button("Jump") and jump:
+                jump = jump.strip()
+                target = int(float(jump[:-1]) / 100 * state["size"]) if jump.endswith("%") else int(jump)
+        if target is not None:
+            _load(state, host, username, password, target)
+            st.session_state.ranged_reader = state
+    except ValueError:
+        st.error("Enter a byte offset (e.g. 1048576) or a percentage (e.g. 50%).")
+    except Exception as e:
+        st.error(f"Could not read {path}: {e}")
+        return
+
+    if not state or "lines" not in state or state["path"] != path:
+        return
+    size = state["size"]
+    st.caption(f"`{state['path']}`: {size:,} bytes. Showing bytes {state['first']:,}–{state['end']:,} "
+               f"({len(state['lines'])} lines, {state['end'] / size:.1%} through the file)." if size else "Empty file.")
+    if size:
+        st.progress(min(state["end"] / size, 1.0))
+    width = len(str(size))
+    st.code("\n".join(f"{line_offset:>{width}}  {text}" for line_offset, text in state["lines"]) or "(no complete lines in this window)")
@@ -0,0 +1,202 @@
+import streamlit as st
+import posixpath
+import stat
+import threading
+import time
+from collections import OrderedDict
+from contextlib import ExitStack
+from utils.sftp_utils import sftp_session
+
+DIR_CACHE_FRESH_SECONDS = 5       # listings younger than this are served without contacting the host
+DIR_CACHE_MAX_ENTRIES = 2000      # directories kept across all hosts (least recently used dropped)
+TREE_MAX_ENTRIES = 200            # entries drawn per directory level
+
+
+class RemoteDirCache:
+    """Process-wide LRU cache of directory listings keyed by (host, user, path), revalidated by mtime."""
+
+    def __init__(self, max_entries=DIR_CACHE_MAX_ENTRIES):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()    # key -> {"mtime", "entries", "checked_at"}
+        self.max_entries = max_entries
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, mtime, entries):
+        with self._lock:
+            self._entries[key] = {"mtime": mtime, "entries": entries, "checked_at": time.time()}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def touch(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries[key]["checked_at"] = time.time()
+
+    def invalidate_host(self, host):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == host]:
+                del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+dir_cache = RemoteDirCache()
+
+
+def _entry_type(mode):
+    if stat.S_ISDIR(mode):
+        return "directory"
+    if stat.S_ISLNK(mode):
+        return "symlink"
+    return "file" if stat.S_ISREG(mode) else "other"
+
+
+def read_listing(sftp, path):
+    """One SFTP readdir of path; directories first, then by name."""
+    entries = [{"name": attr.filename, "path": posixpath.join(path, attr.filename), "type": _entry_type(attr.st_mode or 0),
+                "size": attr.st_size, "mtime": attr.st_mtime, "mode": stat.filemode(attr.st_mode or 0)}
+               for attr in sftp.listdir_attr(path)]
+    return sorted(entries, key=lambda e: (e["type"] != "directory", e["name"]))
+
+
+class TreeLister:
+    """Lists directories for one render pass.
+
+    Fresh cached listings cost nothing; older ones are revalidated with a single stat of the
+    directory and re-read only when its mtime changed. At most one SFTP session is opened per
+    pass, and only if something actually has to be checked.
+    """
+
+    def __init__(self, host, username, password, fresh_seconds=DIR_CACHE_FRESH_SECONDS):
+        self.host, self.username, self.password = host, username, password
+        self.fresh_seconds = fresh_seconds
+        self.stats = {"cached": 0, "revalidated": 0, "read": 0}
+        self._stack = ExitStack()
+        self._sftp = None
+
+    def _session(self):
+        if self._sftp is None:
+            self._sftp = self._stack.enter_context(sftp_session(self.host, self.username, self.password))
+        return self._sftp
+
+    def resolve(self, path):
+        """Absolute form of path; "~" and relative paths resolve against the SFTP home directory."""
+        if path.startswith("/"):
+            return posixpath.normpath(path)
+        key = (self.host, self.username, "<home>")
+        cached = dir_cache.get(key)
+        home = cached["entries"] if cached else None
+        if home is None:
+            home = posixpath.normpath(self._session().normalize("."))
+            dir_cache.put(key, None, home)
+        rest = path[1:].lstrip("/") if path.startswith("~") else path
+        return posixpath.normpath(posixpath.join(home, rest)) if rest else home
+
+    def list(self, path):
+        key = (self.host, self.username, path)
+        cached = dir_cache.get(key)
+        if cached and time.time() - cached["checked_at"] < self.fresh_seconds:
+            self.stats["cached"] += 1
+            return cached["entries"]
+        sftp = self._session()
+        mtime = sftp.stat(path).st_mtime
+        if cached and cached["mtime"] == mtime:
+            dir_cache.touch(key)
+            self.stats["revalidated"] += 1
+            return cached["entries"]
+        entries = read_listing(sftp, path)
+        dir_cache.put(key, mtime, entries)
+        self.stats["read"] += 1
+        return entries
+
+    def close(self):
+        self._stack.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _format_size(size):
+    for unit in ["B", "K", "M", "G"]:
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}T"
+
+
+def _render_level(lister, path, expanded, depth):
+    try:
+        entries = lister.list(path)
+    except (IOError, OSError) as e:
+        st.caption(f"{chr(0xa0) * 4 * depth}⚠ {path}: {e}")
+        return
+    indent = "\u00a0" * 4 * depth    # markdown collapses normal spaces in button labels
+    for entry in entries[:TREE_MAX_ENTRIES]:
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["mtime"])) if entry["mtime"] else ""
+        if entry["type"] in ("directory", "symlink"):
+            is_open = entry["path"] in expanded
+            marker = "▾" if is_open else "▸"
+            suffix = " →" if entry["type"] == "symlink" else "/"
+            if st.button(f"{indent}{marker} {entry['name']}{suffix}", key=f"tree_{entry['path']}"):
+                if is_open:
+                    expanded.discard(entry["path"])
+                else:
+                    expanded.add(entry["path"])
+                st.rerun()
+            if is_open:
+                _render_level(lister, entry["path"], expanded, depth + 1)
+        else:
+            cols = st.columns([6, 1, 2, 2])
+            if cols[0].button(f"{indent}{entry['name']}", key=f"tree_{entry['path']}"):
+                st.session_state.remote_tree_selected = entry["path"]
+            cols[1].caption(_format_size(entry["size"] or 0))
+            cols[2].caption(entry["mode"])
+            cols[3].caption(when)
+    if len(entries) > TREE_MAX_ENTRIES:
+        st.caption(f"{indent}… {len(entries) - TREE_MAX_ENTRIES} more entries not shown.")
+
+
+def _toggle_tree(host):
+    st.session_state.remote_tree_open_host = host
+
+
+def render_remote_tree(host, username, password):
+    """Expandable directory tree; each level is listed on demand and cached with mtime revalidation."""
+    if 'remote_tree_expanded' not in st.session_state:
+        st.session_state.remote_tree_expanded = set()
+    expanded = st.session_state.remote_tree_expanded
+    cols = st.columns([4, 1, 1])
+    root = cols[0].text_input("Tree root", value="~", key="remote_tree_root")
+    # Nothing contacts the host until the tree is opened; an expander still runs its body on every rerun.
+    is_open = st.session_state.get('remote_tree_open_host') == host
+    cols[1].button("Close Tree" if is_open else "Open Tree", key="remote_tree_toggle",
+                   on_click=_toggle_tree, args=(None if is_open else host,))
+    if cols[2].button("Collapse All"):
+        expanded.clear()
+    if not is_open:
+        return
+    try:
+        with TreeLister(host, username, password) as lister:
+            root_path = lister.resolve(root or "~")
+            st.caption(f"`{root_path}`")
+            _render_level(lister, root_path, expanded, 0)
+            stats = lister.stats
+    except Exception as e:
+        st.error(f"SFTP error: {e}")
+        return
+    st.caption(f"This view: {stats['cached']} listings from cache, {stats['revalidated']} revalidated by mtime, "
+               f"{stats['read']} read from the host. {len(dir_cache)} directories cached.")
+    if st.session_state.get('remote_tree_selected'):
+        st.caption("Selected file:")
+        st.code(st.session_state.remote_tree_selected)
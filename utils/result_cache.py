@@ -0,0 +1,128 @@
+import streamlit as st
+import re
+import threading
+import time
+
+# (pattern, ttl seconds) for read-only commands whose output is stable. First match wins;
+# commands that match nothing are never cached.
+CACHE_TTL_RULES = [
+    (r"^(sudo )?hostname$", 3600),
+    (r"^(sudo )?uname( -\w+)*$", 3600),
+    (r"^(sudo )?cat /etc/os-release$", 3600),
+    (r"^(sudo )?lscpu\b", 3600),
+    (r"^(sudo )?lsblk\b", 600),
+    (r"^(sudo )?rpm -q[a-z]*\b", 1800),
+    (r"^(sudo )?dnf (list installed|search|info)\b", 1800),
+    (r"^(sudo )?docker (version|info)$", 1800),
+    (r"^(sudo )?docker (images|image ls|network ls|volume ls)$", 60),
+    (r"^(sudo )?(whoami|id)$", 3600),
+    (r"^(sudo )?cat /etc/(passwd|group)$", 300),
+    (r"^(sudo )?firewall-cmd --list-all$", 120),
+    (r"^(sudo )?(df -h|free -h|free -b|df -B1 --output=\S+)$", 15),
+]
+
+# Commands that change host state; any of these drops every cached entry for that host.
+MUTATING_PATTERN = re.compile(
+    r"\b(dnf|yum)\s+(-\S+\s+)*(install|remove|erase|update|upgrade|downgrade|reinstall|makecache)\b"
+    r"|\brpm\s+-[a-zA-Z]*[iUeF]"
+    r"|\bsystemctl\s+(start|stop|restart|reload|enable|disable|mask|unmask|daemon-reload)\b"
+    r"|\bdocker(-compose)?\s+(\S+\s+)?(rm|rmi|run|start|stop|restart|kill|pull|push|build|tag|create|prune|up|down|load|import|login|swarm|join|init)\b"
+    r"|\b(useradd|userdel|usermod|groupadd|groupdel|chpasswd|passwd)\b"
+    r"|\b(mkdir|rm|cp|mv|chmod|chown|ln|tee|touch|truncate)\s"
+    r"|\bfirewall-cmd\b.*--(add|remove|reload)"
+    r"|\bcrontab\s+(-u\s+\S+\s+)?-\s*$|\|\s*crontab\b"
+    r"|(?<![\d&>])>{1,2}\s*(?!&|/dev/null)\S"
+)
+
+
+def normalize_command(command):
+    return re.sub(r"\s+", " ", command or "").strip()
+
+
+def ttl_for(command):
+    """Returns the TTL in seconds for a normalized command, or 0 if it must not be cached."""
+    for pattern, ttl in CACHE_TTL_RULES:
+        if re.search(pattern, command):
+            return ttl
+    return 0
+
+
+class CommandResultCache:
+    """Process-wide TTL cache of (output, error) keyed by (host, user, normalized command)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}     # (host, user, command) -> (expires_at, stored_at, output, error)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, host, username, command):
+        """Returns (output, error, age_seconds) or None on a miss/expired entry."""
+        command = normalize_command(command)
+        if not ttl_for(command):
+            return None
+        key = (host, username, command)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self.hits += 1
+                return entry[2], entry[3], now - entry[1]
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+    def put(self, host, username, command, output, error):
+        command = normalize_command(command)
+        ttl = ttl_for(command)
+        if not ttl:
+            return
+        now = time.time()
+        with self._lock:
+            self._entries[(host, username, command)] = (now + ttl, now, output, error)
+
+    def note_command(self, host, username, command):
+        """Invalidates the host's cached results if the command mutates state. Returns True if it did."""
+        if not MUTATING_PATTERN.search(normalize_command(command)):
+            return False
+        self.invalidate_host(host)
+        return True
+
+    def invalidate_host(self, host):
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == host]
+            for key in stale:
+                del self._entries[key]
+            if stale:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
+
+
+result_cache = CommandResultCache()
+
+
+def render_cache_panel():
+    """Sidebar controls: hit ratio, a bypass toggle for fresh results, and a clear button."""
+    stats = result_cache.stats()
+    st.sidebar.subheader("SSH Result Cache")
+    st.sidebar.metric("Hit Ratio", f"{stats['hit_ratio']:.0%}", help=f"{stats['hits']} hits / {stats['misses']} misses")
+    st.sidebar.caption(f"{stats['entries']} cached results, {stats['invalidations']} host invalidations.")
+    st.sidebar.checkbox("Always fetch fresh results (bypass cache)", key="ssh_cache_bypass")
+    if st.sidebar.button("Clear Result Cache", key="clear_ssh_result_cache"):
+        result_cache.clear()
+        st.sidebar.success("Result cache cleared.")
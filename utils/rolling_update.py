@@ -0,0 +1,193 @@
+import streamlit as st
+import re
+import shlex
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import pandas as pd
+from utils.multi_host import iter_fanout, parse_host_list
+from utils.ssh_utils import paramiko, stream_ssh_command
+
+UPDATE_BATCH_SIZE = 5             # hosts per wave
+UPDATE_MAX_CONCURRENCY = 5        # hosts updating at the same time within a wave
+UPDATE_MAX_FAILURES = 1           # failed hosts tolerated before the remaining waves are cancelled
+UPDATE_HOST_TIMEOUT = 3600
+MAKECACHE_TIMEOUT = 600
+UPDATE_LOG_LINES = 200            # output lines kept per host for the log view
+UPDATE_REFRESH_INTERVAL = 0.5
+
+MAKECACHE_COMMAND = "sudo dnf -q -y makecache"
+# dnf transaction lines end in "<n>/<total>", e.g. "  Upgrading : openssl-libs-1:3.0.7-27.el9.x86_64  5/42".
+_TRANSACTION_LINE = re.compile(r"^\s*(Upgrading|Installing|Cleanup|Erasing|Obsoleting|Downgrading|Reinstalling|"
+                               r"Verifying|Running scriptlet)\s*:.*?(\d+)/(\d+)\s*$")
+
+
+def build_update_command(packages=None, security_only=False, exclude=None):
+    command = "sudo dnf -y update"
+    if security_only:
+        command += " --security"
+    for pattern in exclude or []:
+        command += f" --exclude={shlex.quote(pattern)}"
+    return command + "".join(f" {shlex.quote(p)}" for p in packages or [])
+
+
+def plan_waves(hosts, batch_size):
+    return [hosts[i:i + batch_size] for i in range(0, len(hosts), batch_size)]
+
+
+class RollingUpdate:
+    """Per-host state of one rollout, written by worker threads and read by the page while it redraws."""
+
+    def __init__(self, hosts, batch_size):
+        self.waves = plan_waves(hosts, batch_size)
+        self.hosts = {host: {"host": host, "wave": n, "status": "pending", "phase": "", "progress": 0.0,
+                             "makecache_s": None, "duration_s": None, "exit_code": None, "last_line": ""}
+                      for n, wave in enumerate(self.waves, start=1) for host in wave}
+        self.logs = {host: deque(maxlen=UPDATE_LOG_LINES) for host in hosts}
+        self.halted = None
+        self._lock = threading.Lock()
+
+    def update(self, host, **fields):
+        with self._lock:
+            self.hosts[host].update(fields)
+
+    def failures(self):
+        with self._lock:
+            return sum(1 for row in self.hosts.values() if row["status"] in ("failed", "makecache failed"))
+
+    def frame(self):
+        with self._lock:
+            return pd.DataFrame([dict(row) for row in self.hosts.values()])
+
+
+def prewarm_cache(rollout, username, password):
+    """Runs dnf makecache on every host in parallel, so the waves only spend time on the transaction."""
+    hosts = list(rollout.hosts)
+    for row in iter_fanout(hosts, username, password, MAKECACHE_COMMAND, max_workers=len(hosts),
+                           timeout=MAKECACHE_TIMEOUT):
+        if row["status"] == "ok":
+            rollout.update(row["host"], makecache_s=row["latency_s"], status="ready")
+        else:
+            output = (row["stderr"] or row["stdout"]).splitlines()
+            rollout.update(row["host"], makecache_s=row["latency_s"], status="makecache failed",
+                           last_line=output[-1] if output else f"exit status {row['exit_code']}")
+
+
+def update_host(rollout, host, username, password, command):
+    """Streams one host's update into the rollout state."""
+    started = time.monotonic()
+    rollout.update(host, status="updating", phase="resolving")
+    exit_code, status = None, "failed"
+    try:
+        for stream, line in stream_ssh_command(host, username, password, command, timeout=UPDATE_HOST_TIMEOUT):
+            if stream == "exit":
+                exit_code = line
+                continue
+            rollout.logs[host].append(line)
+            match = _TRANSACTION_LINE.match(line)
+            if match:
+                rollout.update(host, phase=match.group(1), progress=int(match.group(2)) / int(match.group(3)))
+            if line.strip():
+                rollout.update(host, last_line=line.strip())
+        if exit_code == 0:
+            status = "updated"
+    except paramiko.AuthenticationException:
+        rollout.update(host, last_line="Authentication failed.")
+    except Exception as e:
+        rollout.update(host, last_line=f"{type(e).__name__}: {e}")
+    rollout.update(host, status=status, exit_code=exit_code, duration_s=round(time.monotonic() - started, 1),
+                   progress=1.0 if status == "updated" else rollout.hosts[host]["progress"])
+
+
+def run_rollout(rollout, username, password, command, concurrency, max_failures, on_tick=None):
+    """Updates wave by wave; stops before the next wave once max_failures hosts have failed.
+
+    on_tick(rollout) is called from this thread every UPDATE_REFRESH_INTERVAL while a wave runs.
+    """
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="rolling-update") as executor:
+        for n, wave in enumerate(rollout.waves, start=1):
+            if rollout.failures() >= max_failures:
+                rollout.halted = f"Stopped before wave {n}: {rollout.failures()} hosts failed (limit {max_failures})."
+                for row in rollout.hosts.values():
+                    if row["status"] in ("pending", "ready"):
+                        rollout.update(row["host"], status="skipped")
+                break
+            ready = [host for host in wave if rollout.hosts[host]["status"] in ("pending", "ready")]
+            pending = {executor.submit(update_host, rollout, host, username, password, command) for host in ready}
+            while pending:
+                _, pending = wait(pending, timeout=UPDATE_REFRESH_INTERVAL, return_when=FIRST_COMPLETED)
+                if on_tick:
+                    on_tick(rollout)
+    if on_tick:
+        on_tick(rollout)
+
+
+_STATUS_COLUMNS = ["host", "wave", "status", "phase", "progress", "makecache_s", "duration_s", "exit_code", "last_line"]
+
+
+def render_rolling_update(host, username, password):
+    """Host group, wave settings, makecache pre-warm and a live per-host progress table."""
+    if not paramiko:
+        st.error("Paramiko library not found. Please install it with `pip install paramiko`.")
+        return
+    hosts_text = st.text_area("Hosts (one per line)", value="\n".join(st.session_state.get('ssh_host_group') or [host]),
+                              key="rolling_update_hosts", height=100)
+    cols = st.columns(3)
+    batch_size = cols[0].number_input("Batch size (hosts per wave)", min_value=1, max_value=100,
+                                      value=UPDATE_BATCH_SIZE, key="rolling_update_batch")
+    concurrency = cols[1].number_input("Max concurrency", min_value=1, max_value=50, value=UPDATE_MAX_CONCURRENCY,
+                                       key="rolling_update_concurrency")
+    max_failures = cols[2].number_input("Stop after failed hosts", min_value=1, max_value=100,
+                                        value=UPDATE_MAX_FAILURES, key="rolling_update_max_failures")
+    o_cols = st.columns(3)
+    packages = o_cols[0].text_input("Only these packages (optional)", key="rolling_update_packages")
+    exclude = o_cols[1].text_input("Exclude (optional, e.g. kernel*)", key="rolling_update_exclude")
+    security_only = o_cols[2].checkbox("Security updates only", key="rolling_update_security")
+    hosts = parse_host_list(hosts_text)
+    command = build_update_command(parse_host_list(packages), security_only, parse_host_list(exclude))
+    waves = plan_waves(hosts, int(batch_size))
+    st.caption(f"`{command}` on {len(hosts)} hosts in {len(waves)} waves of up to {int(batch_size)}, "
+               f"{int(min(concurrency, batch_size))} at a time.")
+    confirmed = st.checkbox(f"Confirm updating {len(hosts)} hosts", key="rolling_update_confirm")
+
+    if st.button("Start Rolling Update"):
+        if not hosts:
+            st.warning("Please enter at least one host.")
+        elif not confirmed:
+            st.warning("Please tick the confirmation box first.")
+        else:
+            st.warning("Requires `sudo` with `NOPASSWD` on every host.")
+            rollout = RollingUpdate(hosts, int(batch_size))
+            started = time.monotonic()
+            with st.spinner(f"Pre-warming dnf metadata on {len(hosts)} hosts..."):
+                prewarm_cache(rollout, username, password)
+            progress = st.progress(0.0)
+            table = st.empty()
+
+            def on_tick(current):
+                df = current.frame()
+                done = df["status"].isin(["updated", "failed", "makecache failed", "skipped"]).sum()
+                progress.progress(done / len(df), text=f"{done}/{len(df)} hosts done, {current.failures()} failed")
+                table.dataframe(df[_STATUS_COLUMNS], use_container_width=True, hide_index=True)
+
+            run_rollout(rollout, username, password, command, int(concurrency), int(max_failures), on_tick)
+            progress.empty()
+            table.empty()
+            st.session_state.rolling_update = {"rollout": rollout, "command": command,
+                                               "elapsed_s": time.monotonic() - started}
+
+    last = st.session_state.get('rolling_update')
+    if not last:
+        return
+    rollout = last["rollout"]
+    df = rollout.frame()
+    if rollout.halted:
+        st.error(rollout.halted)
+    counts = df["status"].value_counts()
+    st.caption(f"`{last['command']}`: {counts.get('updated', 0)} updated, {rollout.failures()} failed, "
+               f"{counts.get('skipped', 0)} skipped in {last['elapsed_s']:.0f}s wall clock "
+               f"(sum of host durations {df['duration_s'].sum():.0f}s).")
+    st.dataframe(df[_STATUS_COLUMNS], use_container_width=True, hide_index=True)
+    log_host = st.selectbox("Show output of", list(rollout.logs), key="rolling_update_log_host")
+    st.code("\n".join(rollout.logs[log_host]) or "(no output)")
@@ -0,0 +1,131 @@
+import streamlit as st
+import shlex
+import time
+import pandas as pd
+from utils.multi_host import iter_fanout, parse_host_list
+
+# Properties fetched for every unit in one `systemctl show` call per host.
+SERVICE_PROPERTIES = ["Id", "LoadState", "ActiveState", "SubState", "UnitFileState", "MainPID",
+                      "MemoryCurrent", "CPUUsageNSec", "NRestarts", "ActiveEnterTimestamp"]
+SERVICE_ACTIONS = ["start", "stop", "restart", "reload", "enable", "disable"]
+SERVICE_TIMEOUT = 120
+# systemd reports "not available" counters as the maximum uint64.
+_UNSET = {"", "[not set]", "18446744073709551615"}
+
+
+def build_show_command(units):
+    return f"systemctl show --no-pager -p {','.join(SERVICE_PROPERTIES)} " + " ".join(shlex.quote(u) for u in units)
+
+
+def build_action_command(action, units):
+    if action not in SERVICE_ACTIONS:
+        raise ValueError(f"Unsupported systemctl action: {action}")
+    return f"sudo systemctl {action} " + " ".join(shlex.quote(u) for u in units)
+
+
+def parse_show_output(output, units):
+    """Splits `systemctl show` output for several units (blank-line separated, same order) into rows."""
+    blocks, current = [], {}
+    for line in output.splitlines():
+        if not line.strip():
+            if current:
+                blocks.append(current)
+                current = {}
+            continue
+        key, _, value = line.partition("=")
+        current[key] = value
+    if current:
+        blocks.append(current)
+    rows = []
+    for unit, block in zip(units, blocks):
+        row = {"unit": unit}
+        row.update({prop: block.get(prop, "") for prop in SERVICE_PROPERTIES})
+        rows.append(row)
+    df = pd.DataFrame(rows, columns=["unit"] + SERVICE_PROPERTIES)
+    for col in ["MainPID", "MemoryCurrent", "CPUUsageNSec", "NRestarts"]:
+        df[col] = pd.to_numeric(df[col].where(~df[col].isin(_UNSET)), errors="coerce")
+    df["memory_mib"] = (df["MemoryCurrent"] / 1024 / 1024).round(1)
+    df["cpu_s"] = (df["CPUUsageNSec"] / 1e9).round(2)
+    return df.drop(columns=["MemoryCurrent", "CPUUsageNSec"])
+
+
+def fetch_service_matrix(hosts, username, password, units):
+    """One `systemctl show` per host for all units, hosts in parallel. Returns a long DataFrame."""
+    frames, errors = [], {}
+    for row in iter_fanout(hosts, username, password, build_show_command(units), timeout=SERVICE_TIMEOUT):
+        if row["status"] == "ok":
+            frames.append(parse_show_output(row["stdout"], units).assign(host=row["host"]))
+        else:
+            errors[row["host"]] = row["stderr"] or f"systemctl exited with status {row['exit_code']}"
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return df, errors
+
+
+def run_bulk_action(hosts, username, password, action, units):
+    """Runs one `systemctl <action> unit...` per host, hosts in parallel. Returns the fan-out rows."""
+    return pd.DataFrame(list(iter_fanout(hosts, username, password, build_action_command(action, units),
+                                         timeout=SERVICE_TIMEOUT)))
+
+
+def status_grid(df):
+    """host x unit grid of "ActiveState (SubState)"."""
+    cells = df.assign(state=df["ActiveState"] + " (" + df["SubState"] + ")")
+    return cells.pivot(index="host", columns="unit", values="state")
+
+
+def render_service_matrix(host, username, password):
+    hosts_text = st.text_area("Hosts (one per line)", value="\n".join(st.session_state.get('ssh_host_group') or [host]),
+                              key="service_matrix_hosts", height=100)
+    units_text = st.text_input("Units (comma or space separated)", value="sshd, crond, firewalld",
+                               key="service_matrix_units")
+    hosts = parse_host_list(hosts_text)
+    units = [u if "." in u else f"{u}.service" for u in parse_host_list(units_text)]
+
+    if st.button("Load Service Matrix"):
+        if hosts and units:
+            with st.spinner(f"Querying {len(units)} units on {len(hosts)} hosts..."):
+                started = time.perf_counter()
+                df, errors = fetch_service_matrix(hosts, username, password, units)
+            st.session_state.service_matrix = {"frame": df, "errors": errors, "units": units, "hosts": hosts,
+                                               "duration_s": time.perf_counter() - started}
+        else: st.warning("Please enter at least one host and one unit.")
+
+    matrix = st.session_state.get('service_matrix')
+    if not matrix:
+        return
+    df = matrix["frame"]
+    st.caption(f"{len(matrix['units'])} units on {len(matrix['hosts'])} hosts in {matrix['duration_s']:.2f}s "
+               f"({len(matrix['hosts'])} SSH calls).")
+    for failed_host, error in matrix["errors"].items():
+        st.error(f"{failed_host}: {error}")
+    if df.empty:
+        return
+    st.dataframe(status_grid(df), use_container_width=True)
+    with st.expander("Details"):
+        st.dataframe(df[["host", "unit", "LoadState", "ActiveState", "SubState", "UnitFileState", "MainPID",
+                         "memory_mib", "cpu_s", "NRestarts", "ActiveEnterTimestamp"]],
+                     use_container_width=True, hide_index=True)
+
+    st.write("#### Bulk Action")
+    a_cols = st.columns(3)
+    action = a_cols[0].selectbox("Action", SERVICE_ACTIONS, key="service_matrix_action")
+    target_units = a_cols[1].multiselect("Units", matrix["units"], default=matrix["units"], key="service_matrix_target_units")
+    target_hosts = a_cols[2].multiselect("Hosts", matrix["hosts"], default=matrix["hosts"], key="service_matrix_target_hosts")
+    confirmed = st.checkbox(f"Confirm `sudo systemctl {action}` on {len(target_hosts)} hosts", key="service_matrix_confirm")
+    if st.button("Run Bulk Action"):
+        if not (target_units and target_hosts):
+            st.warning("Please select at least one unit and one host.")
+        elif not confirmed:
+            st.warning("Please tick the confirmation box first.")
+        else:
+            st.warning("Requires `sudo` with `NOPASSWD` on every host.")
+            with st.spinner(f"Running systemctl {action} on {len(target_hosts)} hosts..."):
+                results = run_bulk_action(target_hosts, username, password, action, target_units)
+                df, errors = fetch_service_matrix(matrix["hosts"], username, password, matrix["units"])
+            matrix.update(frame=df, errors=errors, last_action={"action": action, "results": results})
+            st.rerun()
+    last_action = matrix.get("last_action")
+    if last_action:
+        st.caption(f"Last bulk action: systemctl {last_action['action']} (one call per host; the grid above was refreshed afterwards).")
+        st.dataframe(last_action["results"][["host", "status", "exit_code", "latency_s", "stderr"]],
+                     use_container_width=True, hide_index=True)
@@ -0,0 +1,214 @@
+import streamlit as st
+import io
+import os
+import posixpath
+import shlex
+import stat
+import time
+import uuid
+from contextlib import contextmanager
+from utils.ssh_utils import ssh_pool, run_ssh_command
+from utils.result_cache import result_cache
+from utils.ssh_metrics import ssh_metrics
+
+SFTP_CHUNK_SIZE = 256 * 1024      # bytes per write; pipelined so writes do not wait for acks
+
+
+def to_sftp_path(path):
+    """SFTP does not expand '~'; paths relative to the SFTP session already start in the home directory."""
+    if path == "~":
+        return "."
+    if path.startswith("~/"):
+        return path[2:]
+    return path
+
+
+def streamlit_progress(label):
+    """Returns a progress(done, total) callback that drives an st.progress bar."""
+    bar = st.progress(0.0, text=label)
+
+    def update(done, total):
+        fraction = done / total if total else 1.0
+        bar.progress(min(fraction, 1.0), text=f"{label} {done / 1024:,.0f} / {total / 1024:,.0f} KiB")
+    return update
+
+
+@contextmanager
+def sftp_session(host, username, password):
+    """Opens an SFTP subsystem on a pooled transport and hands the transport back afterwards."""
+    started = time.perf_counter()
+    client = ssh_pool.acquire(host, username, password)
+    phases = client.take_connect_phases()
+    phases["pool_wait_s"] = max(time.perf_counter() - started - sum(phases.values()), 0.0)
+    sftp = None
+    broken = False
+    try:
+        sftp = client.open_sftp()
+        yield sftp
+    except Exception:
+        broken = not client.get_transport() or not client.get_transport().is_active()
+        raise
+    finally:
+        if sftp is not None:
+            sftp.close()
+        ssh_pool.release(client, host, username, password, discard=broken)
+        phases["total_s"] = time.perf_counter() - started
+        ssh_metrics.record(host, "<sftp session>", phases, ok=not broken, kind="sftp")
+
+
+def remote_makedirs(sftp, remote_dir):
+    """mkdir -p over SFTP."""
+    parts = []
+    path = remote_dir.rstrip("/")
+    while path and path not in ("/", "."):
+        try:
+            sftp.stat(path)
+            break
+        except FileNotFoundError:
+            parts.append(path)
+            path = posixpath.dirname(path)
+    for part in reversed(parts):
+        sftp.mkdir(part)
+
+
+def _remote_size(sftp, remote_path):
+    try:
+        return sftp.stat(remote_path).st_size
+    except FileNotFoundError:
+        return None
+
+
+def _upload_stream(sftp, fileobj, total, remote_path, resume=False, progress=None, chunk_size=SFTP_CHUNK_SIZE):
+    offset = 0
+    if resume:
+        existing = _remote_size(sftp, remote_path)
+        if existing is not None and existing <= total:
+            offset = existing
+    fileobj.seek(offset)
+    with sftp.open(remote_path, "ab" if offset else "wb") as remote:
+        remote.set_pipelined(True)
+        done = offset
+        if progress: progress(done, total)
+        while True:
+            chunk = fileobj.read(chunk_size)
+            if not chunk:
+                break
+            remote.write(chunk)
+            done += len(chunk)
+            if progress: progress(done, total)
+    return done - offset
+
+
+def upload_bytes(sftp, data, remote_path, resume=False, progress=None):
+    """Writes bytes to a remote file. Returns the number of bytes actually sent."""
+    return _upload_stream(sftp, io.BytesIO(data), len(data), remote_path, resume, progress)
+
+
+def upload_private_bytes(sftp, data, remote_path, progress=None):
+    """upload_bytes for staging files in shared places like /tmp: the file is 0600 before any data is written."""
+    with sftp.open(remote_path, "wb"):
+        pass
+    sftp.chmod(remote_path, 0o600)
+    return upload_bytes(sftp, data, remote_path, progress=progress)
+
+
+def upload_file(sftp, local_path, remote_path, resume=False, progress=None):
+    """Uploads a local file with chunked, pipelined writes; resume continues a partial remote copy."""
+    with open(local_path, "rb") as f:
+        return _upload_stream(sftp, f, os.path.getsize(local_path), remote_path, resume, progress)
+
+
+def download_file(sftp, remote_path, local_path, resume=False, progress=None, chunk_size=SFTP_CHUNK_SIZE):
+    """Downloads a remote file with read-ahead; resume continues a partial local copy."""
+    total = sftp.stat(remote_path).st_size
+    offset = os.path.getsize(local_path) if resume and os.path.exists(local_path) else 0
+    if offset > total:
+        offset = 0
+    with sftp.open(remote_path, "rb") as remote, open(local_path, "ab" if offset else "wb") as local:
+        remote.seek(offset)
+        remote.prefetch(total)    # the end offset to read ahead to, not a byte count
+        done = offset
+        if progress: progress(done, total)
+        while True:
+            chunk = remote.read(chunk_size)
+            if not chunk:
+                break
+            local.write(chunk)
+            done += len(chunk)
+            if progress: progress(done, total)
+    return done - offset
+
+
+def upload_directory(sftp, local_dir, remote_dir, resume=False, progress=None):
+    """Recursively uploads a local directory. progress(done_bytes, total_bytes) covers the whole tree."""
+    files = []
+    for root, _, names in os.walk(local_dir):
+        for name in names:
+            local_path = os.path.join(root, name)
+            rel = os.path.relpath(local_path, local_dir).replace(os.sep, "/")
+            files.append((local_path, posixpath.join(remote_dir, rel), os.path.getsize(local_path)))
+    total = sum(size for _, _, size in files)
+    done = 0
+    remote_makedirs(sftp, remote_dir)
+    for local_path, remote_path, size in files:
+        remote_makedirs(sftp, posixpath.dirname(remote_path))
+        base = done
+        upload_file(sftp, local_path, remote_path, resume,
+                    (lambda d, t, base=base: progress(base + d, total)) if progress else None)
+        done = base + size
+    return len(files), total
+
+
+def download_directory(sftp, remote_dir, local_dir, resume=False, progress=None):
+    """Recursively downloads a remote directory. progress(done_bytes, total_bytes) covers the whole tree."""
+    files = []
+    pending = [remote_dir]
+    while pending:
+        current = pending.pop()
+        for entry in sftp.listdir_attr(current):
+            remote_path = posixpath.join(current, entry.filename)
+            if stat.S_ISDIR(entry.st_mode):
+                pending.append(remote_path)
+            elif stat.S_ISREG(entry.st_mode):
+                files.append((remote_path, entry.st_size))
+    total = sum(size for _, size in files)
+    done = 0
+    for remote_path, size in files:
+        rel = posixpath.relpath(remote_path, remote_dir)
+        local_path = os.path.join(local_dir, *rel.split("/"))
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        base = done
+        download_file(sftp, remote_path, local_path, resume,
+                      (lambda d, t, base=base: progress(base + d, total)) if progress else None)
+        done = base + size
+    return len(files), total
+
+
+def write_remote_file(host, username, password, remote_path, content, use_sudo=False, progress=None):
+    """Writes text or bytes to a remote path over SFTP. Returns (output, error) like execute_ssh_command.
+
+    SFTP runs as the login user, so with use_sudo the file is staged in /tmp (mode 0600) and copied
+    into place with `sudo tee`, which keeps arbitrary (binary, quoted, multi-MB) content intact and
+    leaves an existing file's owner and mode alone.
+    """
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    remote_path = to_sftp_path(remote_path)
+    result_cache.invalidate_host(host)
+    target = f"/tmp/.upload_{uuid.uuid4().hex}" if use_sudo else remote_path
+    try:
+        with sftp_session(host, username, password) as sftp:
+            upload = upload_private_bytes if use_sudo else upload_bytes
+            upload(sftp, data, target, progress=progress)
+    except Exception as e:
+        return "", f"SFTP upload to '{target}' failed: {e}"
+    if not use_sudo:
+        return f"{len(data)} bytes written to {remote_path}", ""
+    try:
+        exit_code, output, error = run_ssh_command(
+            host, username, password, f"sudo tee -- {shlex.quote(remote_path)} < {shlex.quote(target)} > /dev/null; rc=$?; "
+            f"rm -f {shlex.quote(target)}; exit $rc")
+    except Exception as e:
+        return "", f"Moving uploaded file into place failed: {e}"
+    if exit_code != 0:
+        return output, error or f"sudo tee exited with status {exit_code}"
+    return f"{len(data)} bytes written to {remote_path}", ""
@@ -0,0 +1,108 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from utils.ssh_utils import paramiko, ssh_pool, run_ssh_command, exec_on_transport, SSH_CONNECT_TIMEOUT
+from utils.ssh_metrics import ssh_metrics
+
+# OpenSSH's default MaxSessions is 10; stay under it so the server never refuses a channel.
+MAX_CHANNELS_PER_TRANSPORT = 8
+
+
+async def arun_ssh_commands(host, username, password, commands, max_channels=MAX_CHANNELS_PER_TRANSPORT, timeout=None):
+    """Runs several commands concurrently over ONE pooled transport, one exec channel per command.
+
+    commands is a dict {label: command}. Returns {label: {"exit_code", "output", "error", "latency_s"}}.
+    Per-command failures are reported in "error"; connection/auth failures raise.
+    """
+    loop = asyncio.get_running_loop()
+    client = await loop.run_in_executor(None, ssh_pool.acquire, host, username, password)
+    connect_phases = client.take_connect_phases()
+    if connect_phases:
+        ssh_metrics.record(host, "<connect>", connect_phases, kind="connect")
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_channels, len(commands))), thread_name_prefix="ssh-channel")
+    broken = False
+    try:
+        transport = client.get_transport()
+
+        async def run_one(label, command):
+            started = time.perf_counter()
+            phases = {}
+            try:
+                exit_code, out, err, phases["exec_s"], phases["drain_s"] = await loop.run_in_executor(
+                    executor, exec_on_transport, transport, command, timeout)
+                output = out.decode('utf-8', errors='replace').strip()
+                error = err.decode('utf-8', errors='replace').strip()
+            except Exception as e:
+                exit_code, out, err = None, b"", b""
+                output, error = "", f"{type(e).__name__}: {e}"
+            phases["total_s"] = time.perf_counter() - started
+            ssh_metrics.record(host, command, phases, len(out), len(err), ok=exit_code == 0, kind="multiplexed")
+            return label, {"exit_code": exit_code, "output": output, "error": error,
+                           "latency_s": round(phases["total_s"], 3)}
+
+        results = await asyncio.gather(*(run_one(label, cmd) for label, cmd in commands.items()))
+        broken = not transport.is_active()
+        return dict(results)
+    finally:
+        executor.shutdown(wait=False)
+        ssh_pool.release(client, host, username, password, discard=broken)
+
+
+async def arun_ssh_command(host, username, password, command, timeout=None):
+    """Async counterpart of run_ssh_command. Returns (exit_code, stdout, stderr)."""
+    result = (await arun_ssh_commands(host, username, password, {command: command}, timeout=timeout))[command]
+    return result["exit_code"], result["output"], result["error"]
+
+
+def run_ssh_commands_multiplexed(host, username, password, commands, max_channels=MAX_CHANNELS_PER_TRANSPORT, timeout=None):
+    """Blocking wrapper around arun_ssh_commands for use from Streamlit scripts."""
+    return asyncio.run(arun_ssh_commands(host, username, password, commands, max_channels, timeout))
+
+
+def _run_unpooled(host, username, password, command):
+    # The original execute_ssh_command path: fresh TCP + key exchange + auth for every command.
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    client.connect(hostname=host, username=username, password=password, timeout=SSH_CONNECT_TIMEOUT)
+    try:
+        stdin, stdout, stderr = client.exec_command(command)
+        stdout.read()
+        stderr.read()
+    finally:
+        client.close()
+
+
+def benchmark_multiplexing(host, username, password, commands, rounds=1):
+    """Times the same command set three ways and returns a DataFrame of wall-clock seconds.
+
+    - one connection per call: the pre-pool behaviour, run sequentially
+    - pooled, sequential: one warm transport, one command after another
+    - pooled, multiplexed: one warm transport, all commands on concurrent channels
+    """
+    timings = {"one connection per call (sequential)": [], "pooled transport, sequential": [],
+               "pooled transport, multiplexed channels": []}
+    # Warm the pool first so the pooled variants measure steady state, not the first handshake.
+    run_ssh_command(host, username, password, "true")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for command in commands.values():
+            _run_unpooled(host, username, password, command)
+        timings["one connection per call (sequential)"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for command in commands.values():
+            run_ssh_command(host, username, password, command)
+        timings["pooled transport, sequential"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        run_ssh_commands_multiplexed(host, username, password, commands)
+        timings["pooled transport, multiplexed channels"].append(time.perf_counter() - started)
+
+    baseline = sum(timings["one connection per call (sequential)"]) / rounds
+    rows = []
+    for mode, samples in timings.items():
+        mean = sum(samples) / rounds
+        rows.append({"mode": mode, "commands": len(commands), "mean_s": round(mean, 3),
+                     "min_s": round(min(samples), 3), "speedup_vs_baseline": round(baseline / mean, 2) if mean else None})
+    return pd.DataFrame(rows)
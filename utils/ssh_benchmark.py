@@ -0,0 +1,44 @@
+import gzip
+import time
+import pandas as pd
+from utils.ssh_utils import CONNECTION_PROFILES, open_ssh_connection, exec_on_transport, wrap_remote_gzip
+
+
+def benchmark_connection_profiles(host, username, password, command, profile_names=None, rounds=3):
+    """Runs the same read-only command under each connection profile and compares throughput.
+
+    Each profile gets its own fresh, unpooled connection so the pool is left untouched. Returns a
+    DataFrame with connect time, mean transfer time, bytes on the wire vs. payload bytes and
+    effective throughput (payload bytes per second).
+    """
+    rows = []
+    for name in profile_names or list(CONNECTION_PROFILES):
+        profile = CONNECTION_PROFILES[name]
+        started = time.perf_counter()
+        connection = open_ssh_connection(host, username, password, profile=profile)
+        connect_s = time.perf_counter() - started
+        remote_command = wrap_remote_gzip(command) if profile["remote_gzip"] else command
+        durations, wire_bytes, payload_bytes = [], 0, 0
+        try:
+            for _ in range(rounds):
+                started = time.perf_counter()
+                _, out, _, _, _ = exec_on_transport(connection.get_transport(), remote_command)
+                payload = gzip.decompress(out) if profile["remote_gzip"] else out
+                durations.append(time.perf_counter() - started)
+                wire_bytes, payload_bytes = len(out), len(payload)
+        finally:
+            connection.close()
+        mean_s = sum(durations) / len(durations)
+        rows.append({
+            "profile": name,
+            "connect_s": round(connect_s, 3),
+            "transfer_mean_s": round(mean_s, 3),
+            "transfer_min_s": round(min(durations), 3),
+            "payload_kib": round(payload_bytes / 1024, 1),
+            "stdout_bytes_received_kib": round(wire_bytes / 1024, 1),
+            "throughput_kib_s": round(payload_bytes / 1024 / mean_s, 1) if mean_s else None,
+        })
+    df = pd.DataFrame(rows)
+    if not df.empty and df["throughput_kib_s"].iloc[0]:
+        df["speedup_vs_first"] = (df["throughput_kib_s"] / df["throughput_kib_s"].iloc[0]).round(2)
+    return df
@@ -0,0 +1,107 @@
+import streamlit as st
+import hashlib
+import hmac
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+import pandas as pd
+
+METRICS_MAX_RECORDS = 20000     # most recent calls kept in memory
+
+# Phases recorded per call, in the order they happen. Connection phases are only present when
+# the call had to open a new transport; reused pooled connections record them as None.
+SSH_PHASES = ["pool_wait_s", "dns_s", "tcp_s", "kex_s", "auth_s", "exec_s", "drain_s", "total_s"]
+_PROGRAM_WORD = re.compile(r"^[\w./+-]+$")
+_REDACT_KEY = os.urandom(16)      # per process, so a short hash cannot be brute-forced back into a password
+
+
+def redact_command(command):
+    """Program name plus a short hash of the full text, e.g. "sudo docker … [3f9a1c2e]".
+
+    Command lines can carry passwords (chpasswd, docker login), so only this form is ever stored;
+    the hash still tells repeated calls of the same command apart. "<...>" placeholders pass through.
+    """
+    if command.startswith("<") and command.endswith(">"):
+        return command
+    words = command.split(None, 2)
+    shown = words[:2] if len(words) > 1 and words[0] == "sudo" else words[:1]
+    prefix = " ".join(shown) if shown and all(_PROGRAM_WORD.match(w) for w in shown) else "<command>"
+    digest = hmac.new(_REDACT_KEY, command.encode("utf-8", errors="replace"), hashlib.sha256).hexdigest()[:8]
+    return f"{prefix} … [{digest}]"
+
+
+class SSHMetricsStore:
+    """Thread-safe in-process store of per-call SSH phase timings and byte counts."""
+
+    def __init__(self, max_records=METRICS_MAX_RECORDS):
+        self._lock = threading.Lock()
+        self._records = deque(maxlen=max_records)
+
+    def record(self, host, command, phases, bytes_out=0, bytes_err=0, ok=True, kind="exec"):
+        row = {"ts": time.time(), "host": host, "kind": kind, "command": redact_command(command), "ok": ok,
+               "reused": phases.get("tcp_s") is None, "bytes_out": bytes_out, "bytes_err": bytes_err}
+        for phase in SSH_PHASES:
+            value = phases.get(phase)
+            row[phase] = round(value, 6) if value is not None else None
+        with self._lock:
+            self._records.append(row)
+
+    def records(self):
+        with self._lock:
+            return list(self._records)
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    def to_frame(self):
+        return pd.DataFrame(self.records(), columns=["ts", "host", "kind", "command", "ok", "reused",
+                                                     "bytes_out", "bytes_err"] + SSH_PHASES)
+
+    def summary(self):
+        """Per-host p50/p95 (in ms) for each phase, plus call counts and bytes transferred."""
+        df = self.to_frame()
+        if df.empty:
+            return df
+        rows = []
+        for host, group in df.groupby("host"):
+            row = {"host": host, "calls": len(group), "new_connections": int((~group["reused"]).sum()),
+                   "bytes_out": int(group["bytes_out"].sum()), "bytes_err": int(group["bytes_err"].sum())}
+            for phase in SSH_PHASES:
+                values = group[phase].dropna()
+                name = phase[:-2]
+                row[f"{name}_p50_ms"] = round(values.quantile(0.5) * 1000, 1) if not values.empty else None
+                row[f"{name}_p95_ms"] = round(values.quantile(0.95) * 1000, 1) if not values.empty else None
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    def export_jsonl(self):
+        return "\n".join(json.dumps(row) for row in self.records()) + "\n"
+
+
+ssh_metrics = SSHMetricsStore()
+
+
+def render_perf_panel():
+    """Sidebar panel with per-host phase percentiles and a JSONL export of the raw records."""
+    st.sidebar.subheader("SSH Performance")
+    summary = ssh_metrics.summary()
+    if summary.empty:
+        st.sidebar.caption("No SSH calls recorded yet.")
+        return
+    for _, row in summary.iterrows():
+        st.sidebar.caption(f"**{row['host']}**: {row['calls']} calls, {row['new_connections']} new connections, "
+                           f"{(row['bytes_out'] + row['bytes_err']) / 1024:,.0f} KiB received")
+        phase_table = pd.DataFrame(
+            [{"phase": phase[:-2], "p50 (ms)": row[f"{phase[:-2]}_p50_ms"], "p95 (ms)": row[f"{phase[:-2]}_p95_ms"]}
+             for phase in SSH_PHASES]
+        ).set_index("phase")
+        st.sidebar.dataframe(phase_table, use_container_width=True)
+    st.sidebar.download_button("Export SSH Metrics (JSONL)", ssh_metrics.export_jsonl(),
+                               file_name=f"ssh_metrics_{int(time.time())}.jsonl", mime="application/jsonl",
+                               key="export_ssh_metrics")
+    if st.sidebar.button("Reset SSH Metrics", key="reset_ssh_metrics"):
+        ssh_metrics.clear()
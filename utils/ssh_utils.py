@@ -1,26 +1,616 @@
 import streamlit as st
-import paramiko
+import gzip
+import hashlib
+import re
+import select
+import shlex
+import socket
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from utils.result_cache import result_cache, MUTATING_PATTERN
+from utils.ssh_metrics import ssh_metrics, redact_command
 
-def execute_ssh_command(host, username, password, command):
-    """Executes a command over SSH and returns stdout and stderr."""
+# Conditional imports
+try:
+    import paramiko
+except ImportError:
+    paramiko = None
+
+# --- Connection pool settings ---
+SSH_PORT = 22
+SSH_CONNECT_TIMEOUT = 10          # seconds for TCP connect + handshake + auth
+POOL_MAX_PER_HOST = 4             # max open connections to a single host
+POOL_IDLE_TIMEOUT = 300           # close connections unused for this many seconds
+POOL_KEEPALIVE_INTERVAL = 30      # SSH keepalive packets so NAT/firewalls keep the session
+POOL_ACQUIRE_TIMEOUT = 30         # how long to wait for a free slot when a host is at its cap
+
+# --- Connection profiles ---
+# window_size / max_packet_size of None keep paramiko's defaults (2 MiB window, 32 KiB packets).
+# remote_gzip compresses command stdout on the host before it crosses the link.
+CONNECTION_PROFILES = {
+    "LAN (default)": {"compress": False, "window_size": None, "max_packet_size": None, "remote_gzip": False},
+    "WAN / VPN (zlib compression)": {"compress": True, "window_size": 8 * 1024 * 1024, "max_packet_size": 32768,
+                                     "remote_gzip": False},
+    "WAN bulk output (zlib + remote gzip)": {"compress": True, "window_size": 8 * 1024 * 1024,
+                                             "max_packet_size": 32768, "remote_gzip": True},
+}
+DEFAULT_PROFILE = "LAN (default)"
+_host_profiles = {}     # host -> profile dict; process-wide like the pool
+
+
+def set_host_profile(host, profile):
+    """Sets the connection profile (a CONNECTION_PROFILES name or a dict) used for new connections to host."""
+    _host_profiles[host] = dict(CONNECTION_PROFILES[profile]) if isinstance(profile, str) else dict(profile)
+
+
+def get_host_profile(host):
+    return _host_profiles.get(host, CONNECTION_PROFILES[DEFAULT_PROFILE])
+
+
+class SSHConnection:
+    """An authenticated paramiko Transport exposing the parts of the SSHClient API the dashboard uses.
+
+    Built by hand (rather than via SSHClient.connect) so DNS, TCP connect, key exchange and auth
+    can each be timed; those timings are handed to the first caller via take_connect_phases().
+    """
+
+    def __init__(self, transport, connect_phases, profile=None):
+        self.transport = transport
+        self.profile = profile or CONNECTION_PROFILES[DEFAULT_PROFILE]
+        self.pool_key = None
+        self._connect_phases = connect_phases
+
+    def get_transport(self):
+        return self.transport
+
+    def take_connect_phases(self):
+        phases, self._connect_phases = self._connect_phases, {}
+        return phases
+
+    def exec_command(self, command, timeout=None):
+        channel = self.transport.open_session(timeout=SSH_CONNECT_TIMEOUT)
+        channel.settimeout(timeout)
+        channel.exec_command(command)
+        return channel.makefile_stdin("wb"), channel.makefile("r"), channel.makefile_stderr("r")
+
+    def open_sftp(self):
+        return paramiko.SFTPClient.from_transport(self.transport)
+
+    def close(self):
+        self.transport.close()
+
+
+def open_ssh_connection(host, username, password, keepalive_interval=0, profile=None):
+    """Opens and authenticates a new SSHConnection, timing each connection phase.
+
+    profile (see CONNECTION_PROFILES) controls zlib compression and the channel window/packet size.
+    """
+    profile = profile or get_host_profile(host)
+    phases = {}
+    started = time.perf_counter()
+    addresses = socket.getaddrinfo(host, SSH_PORT, 0, socket.SOCK_STREAM)
+    phases["dns_s"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    sock, last_error = None, None
+    for family, socktype, proto, _, address in addresses:
+        candidate = socket.socket(family, socktype, proto)
+        try:
+            candidate.settimeout(SSH_CONNECT_TIMEOUT)
+            candidate.connect(address)
+            sock = candidate
+            break
+        except OSError as e:
+            candidate.close()
+            last_error = e
+    if sock is None:
+        raise last_error or OSError(f"Could not connect to {host}:{SSH_PORT}")
+    phases["tcp_s"] = time.perf_counter() - started
+
+    transport_options = {}
+    if profile.get("window_size"):
+        transport_options["default_window_size"] = int(profile["window_size"])
+    if profile.get("max_packet_size"):
+        transport_options["default_max_packet_size"] = int(profile["max_packet_size"])
+    transport = paramiko.Transport(sock, **transport_options)
+    try:
+        transport.use_compression(bool(profile.get("compress")))
+        transport.banner_timeout = SSH_CONNECT_TIMEOUT
+        transport.auth_timeout = SSH_CONNECT_TIMEOUT
+        started = time.perf_counter()
+        transport.start_client(timeout=SSH_CONNECT_TIMEOUT)
+        phases["kex_s"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        transport.auth_password(username, password)
+        phases["auth_s"] = time.perf_counter() - started
+    except Exception:
+        transport.close()
+        raise
+    if keepalive_interval:
+        transport.set_keepalive(keepalive_interval)
+    return SSHConnection(transport, phases, profile)
+
+
+class SSHConnectionPool:
+    """Process-wide pool of authenticated paramiko clients keyed by (host, user, auth)."""
+
+    def __init__(self, max_per_host=POOL_MAX_PER_HOST, idle_timeout=POOL_IDLE_TIMEOUT,
+                 keepalive_interval=POOL_KEEPALIVE_INTERVAL):
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self.keepalive_interval = keepalive_interval
+        self._cond = threading.Condition()
+        self._idle = {}        # key -> [(client, last_used), ...]
+        self._open = {}        # host -> number of open connections (idle + leased)
+        self._created = 0
+        self._reused = 0
+
+    @staticmethod
+    def make_key(host, username, password):
+        # The password is hashed so the raw secret never sits in the pool's keys. The profile is part
+        # of the key so switching a host's profile never hands out a transport built with the old one.
+        auth = hashlib.sha256((password or "").encode("utf-8")).hexdigest()
+        profile = tuple(sorted(get_host_profile(host).items()))
+        return (host, username, auth, profile)
+
+    @staticmethod
+    def is_healthy(client):
+        """Cheap liveness check before handing out a pooled client."""
+        transport = client.get_transport() if client else None
+        if transport is None or not transport.is_active():
+            return False
+        try:
+            transport.send_ignore()
+        except Exception:
+            return False
+        return True
+
+    def _connect(self, host, username, password):
+        return open_ssh_connection(host, username, password, self.keepalive_interval)
+
+    def _close(self, host, client):
+        try:
+            client.close()
+        except Exception:
+            pass
+        self._open[host] = max(self._open.get(host, 1) - 1, 0)
+
+    def _evict_idle_locked(self):
+        now = time.monotonic()
+        for key, entries in self._idle.items():
+            keep = []
+            for client, last_used in entries:
+                if now - last_used > self.idle_timeout:
+                    self._close(key[0], client)
+                else:
+                    keep.append((client, last_used))
+            entries[:] = keep
+
+    def acquire(self, host, username, password, timeout=POOL_ACQUIRE_TIMEOUT):
+        """Returns a healthy client for (host, username, password), reusing an idle one if possible."""
+        key = self.make_key(host, username, password)
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                self._evict_idle_locked()
+                entries = self._idle.get(key, [])
+                while entries:
+                    client, _ = entries.pop()
+                    if self.is_healthy(client):
+                        self._reused += 1
+                        client.pool_key = key
+                        return client
+                    self._close(host, client)
+                if self._open.get(host, 0) < self.max_per_host:
+                    self._open[host] = self._open.get(host, 0) + 1
+                    break
+                # Host is at its cap: close an idle connection held for other credentials, or wait.
+                other = next((k for k, e in self._idle.items() if k[0] == host and e), None)
+                if other:
+                    client, _ = self._idle[other].pop()
+                    self._close(host, client)
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"No free SSH connection to {host} (limit {self.max_per_host}).")
+                self._cond.wait(remaining)
+
+        # Connect outside the lock so a slow host does not block the rest of the pool.
+        try:
+            client = self._connect(host, username, password)
+        except Exception:
+            with self._cond:
+                self._open[host] = max(self._open.get(host, 1) - 1, 0)
+                self._cond.notify()
+            raise
+        client.pool_key = key
+        with self._cond:
+            self._created += 1
+        return client
+
+    def release(self, client, host, username, password, discard=False):
+        """Returns a client to the pool, or closes it if it is broken or discard is set."""
+        key = getattr(client, "pool_key", None) or self.make_key(host, username, password)
+        with self._cond:
+            if discard or not self.is_healthy(client):
+                self._close(host, client)
+            else:
+                self._idle.setdefault(key, []).append((client, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, host, username, password):
+        """Context manager that leases a pooled client and hands it back afterwards."""
+        client = self.acquire(host, username, password)
+        discard = False
+        try:
+            yield client
+        except Exception:
+            discard = True
+            raise
+        finally:
+            self.release(client, host, username, password, discard=discard)
+
+    def close_host(self, host):
+        """Closes every idle connection to a host (e.g. after the user disconnects)."""
+        with self._cond:
+            for key, entries in self._idle.items():
+                if key[0] == host:
+                    for client, _ in entries:
+                        self._close(host, client)
+                    entries.clear()
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "open": dict(self._open),
+                "idle": sum(len(e) for e in self._idle.values()),
+                "created": self._created,
+                "reused": self._reused,
+            }
+
+
+# Module-level singleton: Streamlit keeps imported modules alive across reruns and sessions,
+# so every page and every user in this process shares the same warm transports.
+ssh_pool = SSHConnectionPool()
+
+
+@contextmanager
+def dedicated_connection(host, username, password):
+    """A connection of its own, outside the pool, for channels that stay open for minutes or hours.
+
+    Followers and samplers would otherwise each hold one of the host's POOL_MAX_PER_HOST slots and
+    starve every other page. Its connect phases are recorded in utils.ssh_metrics; it is closed on exit.
+    """
+    client = open_ssh_connection(host, username, password, POOL_KEEPALIVE_INTERVAL)
+    ssh_metrics.record(host, "<connect>", client.take_connect_phases(), kind="connect")
+    try:
+        yield client
+    finally:
+        client.close()
+
+
+def _wait_for_channel(channel, timeout):
+    # A paramiko Channel exposes a pipe fd that becomes readable when stdout data arrives.
+    try:
+        select.select([channel], [], [], timeout)
+    except (OSError, ValueError, TypeError):
+        time.sleep(timeout)
+
+
+def exec_on_transport(transport, command, timeout=None, read_size=32768):
+    """Runs a command on a new exec channel of an existing transport.
+
+    Returns (exit_code, stdout_bytes, stderr_bytes, exec_s, drain_s): exec_s is the time until the
+    first output (or the exit status) came back, drain_s the time spent reading the rest.
+    """
+    return exec_on_channel(transport.open_session(timeout=SSH_CONNECT_TIMEOUT), command, timeout, read_size)
+
+
+def exec_on_channel(channel, command, timeout=None, read_size=32768):
+    """Like exec_on_transport, on an already opened session channel (which is closed afterwards)."""
+    try:
+        channel.settimeout(timeout)
+        started = time.perf_counter()
+        channel.exec_command(command)
+        first_byte = None
+        out, err = [], []
+        # Drain both streams together so a chatty stderr can never stall stdout on the channel window.
+        while True:
+            got_data = False
+            if channel.recv_ready():
+                out.append(channel.recv(read_size))
+                got_data = True
+            if channel.recv_stderr_ready():
+                err.append(channel.recv_stderr(read_size))
+                got_data = True
+            if got_data and first_byte is None:
+                first_byte = time.perf_counter()
+            if not got_data:
+                if channel.exit_status_ready() and not channel.recv_ready() and not channel.recv_stderr_ready():
+                    break
+                if timeout is not None and time.perf_counter() - started > timeout:
+                    raise socket.timeout(f"Command did not finish within {timeout} seconds.")
+                _wait_for_channel(channel, 0.02)
+        exit_code = channel.recv_exit_status()
+        finished = time.perf_counter()
+    finally:
+        channel.close()
+    first_byte = first_byte or finished
+    return exit_code, b"".join(out), b"".join(err), first_byte - started, finished - first_byte
+
+
+_SHELL_SAFE_PATH = re.compile(r"[\w./~-]+")
+
+
+def quote_remote_path(path):
+    """shlex.quote for paths in remote commands, except that simple paths stay unquoted so a
+    leading ~ still expands to the SSH user's home directory."""
+    return path if _SHELL_SAFE_PATH.fullmatch(path) else shlex.quote(path)
+
+
+def wrap_remote_gzip(command):
+    """Pipes a command's stdout through gzip on the remote side, keeping its exit status."""
+    return "bash -c " + shlex.quote(f"set -o pipefail; {{ {command}\n}} | gzip -1 -c")
+
+
+def run_ssh_command(host, username, password, command, timeout=None, bulk=None):
+    """Runs a command on a pooled connection. Returns (exit_code, stdout, stderr); raises on SSH errors.
+
+    Safe to call from worker threads (no Streamlit calls). A stale pooled transport is retried once,
+    but only if no channel could be opened on it, so the command itself never runs twice.
+    Per-phase timings and byte counts (as sent over the wire) are recorded in utils.ssh_metrics.
+    bulk=True gzips stdout on the remote host; None follows the host's connection profile, but
+    never for state-changing commands, whose output is small and which must not be retried.
+    """
+    if bulk is None:
+        bulk = get_host_profile(host).get("remote_gzip", False) and not MUTATING_PATTERN.search(command)
+    if bulk:
+        exit_code, output, error = _run_ssh_command(host, username, password, wrap_remote_gzip(command), timeout, decode=False)
+        try:
+            return exit_code, gzip.decompress(output).decode('utf-8', errors='replace').strip(), error
+        except (OSError, EOFError):
+            note = "Remote gzip output could not be decompressed (is gzip installed on the host?)."
+            return exit_code, output.decode('utf-8', errors='replace').strip(), f"{error}\n{note}".strip()
+    return _run_ssh_command(host, username, password, command, timeout)
+
+
+def run_ssh_command_bytes(host, username, password, command, timeout=None):
+    """run_ssh_command for byte-exact output: returns (exit_code, stdout_bytes, stderr_text).
+
+    Goes through the same pool, retry and metrics path, so no caller needs to lease a connection itself.
+    """
+    return _run_ssh_command(host, username, password, command, timeout, decode=False)
+
+
+def _run_ssh_command(host, username, password, command, timeout=None, decode=True):
+    # decode=False returns stdout as raw bytes (used for gzip-compressed bulk output).
+    result_cache.note_command(host, username, command)
+    for attempt in range(2):
+        started = time.perf_counter()
+        try:
+            client = ssh_pool.acquire(host, username, password)
+        except Exception:
+            ssh_metrics.record(host, command, {"total_s": time.perf_counter() - started}, ok=False)
+            raise
+        phases = client.take_connect_phases()
+        phases["pool_wait_s"] = max(time.perf_counter() - started - sum(phases.values()), 0.0)
+        try:
+            channel = client.get_transport().open_session(timeout=SSH_CONNECT_TIMEOUT)
+        except paramiko.SSHException:
+            ssh_pool.release(client, host, username, password, discard=True)
+            phases["total_s"] = time.perf_counter() - started
+            ssh_metrics.record(host, command, phases, ok=False)
+            if attempt == 0:
+                continue
+            raise
+        try:
+            exit_code, out, err, phases["exec_s"], phases["drain_s"] = exec_on_channel(channel, command, timeout)
+        except Exception:
+            ssh_pool.release(client, host, username, password, discard=True)
+            phases["total_s"] = time.perf_counter() - started
+            ssh_metrics.record(host, command, phases, ok=False)
+            raise
+        ssh_pool.release(client, host, username, password)
+        phases["total_s"] = time.perf_counter() - started
+        ssh_metrics.record(host, command, phases, len(out), len(err), ok=exit_code == 0)
+        output = out.decode('utf-8', errors='replace').strip() if decode else out
+        error = err.decode('utf-8', errors='replace').strip()
+        return exit_code, output, error
+
+
+def execute_ssh_command(host, username, password, command, use_cache=True):
+    """Executes a command over SSH and returns stdout and stderr.
+
+    Idempotent commands (see utils.result_cache) are answered from the TTL cache unless the
+    sidebar's bypass toggle is on; a fresh successful result refreshes the cache entry.
+    """
     if not paramiko:
         return "", "Paramiko library not found. Please install it with `pip install paramiko`."
 
+    if use_cache and not st.session_state.get("ssh_cache_bypass", False):
+        cached = result_cache.get(host, username, command)
+        if cached:
+            output, error, age = cached
+            st.caption(f"Cached result from {age:.0f}s ago. Tick \"bypass cache\" in the sidebar to re-run.")
+            return output, error
+
     try:
         with st.spinner(f"Executing '{command}' on {host}..."):
-            client = paramiko.SSHClient()
-            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            client.connect(hostname=host, username=username, password=password, timeout=10)
+            exit_code, output, error = run_ssh_command(host, username, password, command)
+            if exit_code == 0:
+                result_cache.put(host, username, command, output, error)
+            return output, error
+    except paramiko.AuthenticationException:
+        return "", "Authentication failed. Please check your username and password."
+    except paramiko.SSHException as ssh_err:
+        return "", f"SSH connection error: {ssh_err}. Ensure SSH server is running and accessible (e.g., SSH service is active, firewall allows port 22)."
+    except Exception as e:
+        return "", f"An unexpected error occurred during SSH command execution: {e}"
 
-            stdin, stdout, stderr = client.exec_command(command)
-            output = stdout.read().decode('utf-8').strip()
-            error = stderr.read().decode('utf-8').strip()
 
-            client.close()
-            return output, error
+# --- Streaming execution ---
+STREAM_MAX_BYTES = 50 * 1024 * 1024   # stop reading after this many bytes of output
+STREAM_MAX_LINES = 200_000            # ...or this many lines, whichever comes first
+STREAM_CHUNK_SIZE = 32768
+STREAM_DISPLAY_LINES = 500            # lines kept on screen by render_ssh_stream
+STREAM_REFRESH_INTERVAL = 0.25        # seconds between placeholder redraws
+
+
+def stream_ssh_command(host, username, password, command, max_bytes=STREAM_MAX_BYTES,
+                       max_lines=STREAM_MAX_LINES, cancel_event=None, timeout=None, client=None):
+    """Runs a command on a pooled connection (or on client, e.g. a dedicated_connection) and yields
+    output lines as they arrive.
+
+    Yields (stream, line) tuples where stream is "stdout" or "stderr". When the byte/line budget
+    is exhausted a ("truncated", message) item is yielded and the channel is closed. The last item
+    is always ("exit", exit_code); exit_code is None if the command was cut short. Setting
+    cancel_event (a threading.Event) or closing the generator closes the remote channel.
+    """
+    result_cache.note_command(host, username, command)
+    call_started = time.perf_counter()
+    pooled = client is None
+    if pooled:
+        client = ssh_pool.acquire(host, username, password)
+    phases = client.take_connect_phases()
+    phases["pool_wait_s"] = max(time.perf_counter() - call_started - sum(phases.values()), 0.0)
+    stream_bytes = {"stdout": 0, "stderr": 0}
+    exec_started = first_byte = None
+    exit_code = None
+    channel = None
+    broken = False
+    try:
+        channel = client.get_transport().open_session()
+        exec_started = time.perf_counter()
+        channel.exec_command(command)
+        started = time.monotonic()
+        pending = {"stdout": b"", "stderr": b""}
+        total_bytes = 0
+        total_lines = 0
+        stopped = None
+
+        while stopped is None:
+            got_data = False
+            for stream, ready, recv in (("stdout", channel.recv_ready, channel.recv),
+                                        ("stderr", channel.recv_stderr_ready, channel.recv_stderr)):
+                if not ready():
+                    continue
+                chunk = recv(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    continue
+                got_data = True
+                if first_byte is None:
+                    first_byte = time.perf_counter()
+                total_bytes += len(chunk)
+                stream_bytes[stream] += len(chunk)
+                *lines, pending[stream] = (pending[stream] + chunk).split(b"\n")
+                for line in lines:
+                    total_lines += 1
+                    yield stream, line.decode('utf-8', errors='replace').rstrip("\r")
+                    if total_lines >= max_lines:
+                        break
+                if total_bytes >= max_bytes or total_lines >= max_lines:
+                    stopped = f"Output budget reached ({total_lines} lines, {total_bytes} bytes); stream stopped."
+                    break
+            if stopped:
+                break
+            if cancel_event is not None and cancel_event.is_set():
+                stopped = "Cancelled by user."
+                break
+            if timeout is not None and time.monotonic() - started > timeout:
+                stopped = f"Timed out after {timeout} seconds."
+                break
+            if not got_data:
+                if channel.exit_status_ready() and not channel.recv_ready() and not channel.recv_stderr_ready():
+                    break
+                _wait_for_channel(channel, 0.05)
+
+        if stopped:
+            yield "truncated", stopped
+            yield "exit", None
+            return
+        for stream, rest in pending.items():
+            if rest:
+                yield stream, rest.decode('utf-8', errors='replace').rstrip("\r")
+        exit_code = channel.recv_exit_status()
+        yield "exit", exit_code
+    except paramiko.SSHException:
+        broken = True
+        raise
+    finally:
+        if channel is not None:
+            channel.close()
+        if pooled:
+            ssh_pool.release(client, host, username, password, discard=broken)
+        finished = time.perf_counter()
+        if exec_started is not None:
+            first_byte = first_byte or finished
+            phases["exec_s"] = first_byte - exec_started
+            phases["drain_s"] = finished - first_byte
+        phases["total_s"] = finished - call_started
+        ssh_metrics.record(host, command, phases, stream_bytes["stdout"], stream_bytes["stderr"],
+                           ok=exit_code == 0, kind="stream")
+
+
+def render_ssh_stream(host, username, password, command, display_lines=STREAM_DISPLAY_LINES,
+                      max_bytes=STREAM_MAX_BYTES, max_lines=STREAM_MAX_LINES, sink=None, show_final=True, label=None):
+    """Streams a command's output into a placeholder, redrawing as lines arrive.
+
+    Only the last display_lines stdout/stderr lines are kept, so memory stays bounded however much
+    the command prints. Returns (output, error) like execute_ssh_command, where output/error hold
+    those retained tail lines. Pressing Streamlit's Stop button closes the remote channel.
+    Every stdout line is also passed to sink(line) if given; with show_final=False the live view is
+    cleared at the end so the caller can render the full output itself. The status caption shows
+    label, or only the command's redacted form, since command lines can carry passwords.
+    """
+    if not paramiko:
+        return "", "Paramiko library not found. Please install it with `pip install paramiko`."
+
+    st.caption(f"Streaming `{label or redact_command(command)}` on {host} — press Stop (top right) to cancel.")
+    placeholder = st.empty()
+    out_lines = deque(maxlen=display_lines)
+    err_lines = deque(maxlen=display_lines)
+    live_lines = deque(maxlen=display_lines)   # stdout and stderr interleaved, as they arrive
+    notes = []
+    exit_code = None
+    last_draw = 0.0
+    try:
+        for stream, line in stream_ssh_command(host, username, password, command,
+                                               max_bytes=max_bytes, max_lines=max_lines):
+            if stream == "stdout":
+                out_lines.append(line)
+                live_lines.append(line)
+                if sink is not None:
+                    sink(line)
+            elif stream == "stderr":
+                err_lines.append(line)
+                live_lines.append(line)
+            elif stream == "truncated":
+                notes.append(line)
+            elif stream == "exit":
+                exit_code = line
+            now = time.monotonic()
+            if now - last_draw >= STREAM_REFRESH_INTERVAL:
+                placeholder.code("\n".join(live_lines) or "(waiting for output...)")
+                last_draw = now
     except paramiko.AuthenticationException:
         return "", "Authentication failed. Please check your username and password."
     except paramiko.SSHException as ssh_err:
         return "", f"SSH connection error: {ssh_err}. Ensure SSH server is running and accessible (e.g., SSH service is active, firewall allows port 22)."
     except Exception as e:
-        return "", f"An unexpected error occurred during SSH command execution: {e}"
\ No newline at end of file
+        return "", f"An unexpected error occurred during SSH command execution: {e}"
+
+    output = "\n".join(out_lines).strip()
+    if output and show_final:
+        placeholder.code(output)
+    else:
+        placeholder.empty()
+    for note in notes:
+        st.warning(note)
+    if exit_code not in (None, 0):
+        st.caption(f"Exit code: {exit_code}")
+    return output, "\n".join(err_lines).strip()
@@ -1,8 +1,12 @@
 import streamlit as st
 import json
 import time
-import os
-from utils.ssh_utils import execute_ssh_command
+import posixpath
+from utils.ssh_utils import execute_ssh_command, render_ssh_stream
+from utils.result_cache import render_cache_panel
+from utils.ssh_metrics import render_perf_panel
+from utils.output_buffer import capture_ssh_output, render_captured_output
+from utils.sftp_utils import sftp_session, remote_makedirs, upload_bytes, to_sftp_path
 
 def display_docker_container_management_tasks(host, username, password):
     st.subheader("Docker Container Management")
@@ -52,10 +56,10 @@ def display_docker_container_management_tasks(host, username, password):
 
     if st.button("View Container Logs (docker logs)"):
         if container_name_id:
-            output, error = execute_ssh_command(host, username, password, f"sudo docker logs {container_name_id}")
-            if output: st.code(output)
-            if error: st.error(error)
+            capture_ssh_output(host, username, password, f"sudo docker logs {container_name_id} 2>&1", key="docker_logs_output",
+                               label=f"docker logs {container_name_id}")
         else: st.warning("Please enter a container name or ID.")
+    render_captured_output("docker_logs_output")
 
     run_image_name = st.text_input("Image to Run (e.g., nginx:latest)", key="docker_run_image")
     run_container_name = st.text_input("New Container Name (optional)", key="docker_new_container_name")
@@ -150,16 +154,15 @@ def display_docker_image_management_tasks(host, username, password):
             temp_dir = f"/tmp/docker_build_{int(time.time())}"
             dockerfile_path = f"{temp_dir}/Dockerfile"
 
-            output, error = execute_ssh_command(host, username, password, f"mkdir -p {temp_dir}")
-            if error: st.error(f"Error creating temp dir: {error}"); return
-
-            escaped_dockerfile_content = dockerfile_content.replace("'", "'\\''")
-            output, error = execute_ssh_command(host, username, password, f"echo '{escaped_dockerfile_content}' > {dockerfile_path}")
-            if error: st.error(f"Error writing Dockerfile: {error}"); return
+            try:
+                with sftp_session(host, username, password) as sftp:
+                    remote_makedirs(sftp, temp_dir)
+                    upload_bytes(sftp, dockerfile_content.encode("utf-8"), dockerfile_path)
+            except Exception as e:
+                st.error(f"Error writing Dockerfile: {e}"); return
 
             build_cmd = f"sudo docker build -t {image_name_to_build} {temp_dir}"
-            output, error = execute_ssh_command(host, username, password, build_cmd)
-            if output: st.code(output)
+            output, error = render_ssh_stream(host, username, password, build_cmd, label=f"docker build -t {image_name_to_build}")
             if error: st.error(error)
             if not error: st.success(f"Image '{image_name_to_build}' built successfully.")
 
@@ -180,8 +183,7 @@ def display_docker_image_management_tasks(host, username, password):
                 if registry_username and registry_password:
                     login_cmd = f"echo '{registry_password}' | sudo docker login --username {registry_username} --password-stdin && "
                 cmd = f"{login_cmd}sudo docker push {registry_image_name}"
-                output, error = execute_ssh_command(host, username, password, cmd)
-                if output: st.code(output)
+                output, error = render_ssh_stream(host, username, password, cmd, label=f"docker push {registry_image_name}")
                 if error: st.error(error)
                 if not error: st.success(f"Image '{registry_image_name}' pushed.")
             else: st.warning("Please enter an image name for the registry.")
@@ -192,8 +194,7 @@ def display_docker_image_management_tasks(host, username, password):
                 if registry_username and registry_password:
                     login_cmd = f"echo '{registry_password}' | sudo docker login --username {registry_username} --password-stdin && "
                 cmd = f"{login_cmd}sudo docker pull {registry_image_name}"
-                output, error = execute_ssh_command(host, username, password, cmd)
-                if output: st.code(output)
+                output, error = render_ssh_stream(host, username, password, cmd, label=f"docker pull {registry_image_name}")
                 if error: st.error(error)
                 if not error: st.success(f"Image '{registry_image_name}' pulled.")
             else: st.warning("Please enter an image name for the registry.")
@@ -335,18 +336,17 @@ def display_docker_compose_tasks(host, username, password):
     if st.button("Deploy Docker Compose (Up)"):
         if docker_compose_content and compose_project_path:
             st.warning("This will create a temporary directory and `docker-compose.yml` on the remote server.")
-            compose_file_path = os.path.join(compose_project_path, "docker-compose.yml")
+            compose_file_path = posixpath.join(to_sftp_path(compose_project_path), "docker-compose.yml")
 
-            output, error = execute_ssh_command(host, username, password, f"mkdir -p {compose_project_path}")
-            if error: st.error(f"Error creating project dir: {error}"); return
-
-            escaped_compose_content = docker_compose_content.replace("'", "'\\''")
-            output, error = execute_ssh_command(host, username, password, f"echo '{escaped_compose_content}' > {compose_file_path}")
-            if error: st.error(f"Error writing docker-compose.yml: {error}"); return
+            try:
+                with sftp_session(host, username, password) as sftp:
+                    remote_makedirs(sftp, to_sftp_path(compose_project_path))
+                    upload_bytes(sftp, docker_compose_content.encode("utf-8"), compose_file_path)
+            except Exception as e:
+                st.error(f"Error writing docker-compose.yml: {e}"); return
 
             cmd = f"cd {compose_project_path} && sudo docker-compose up -d"
-            output, error = execute_ssh_command(host, username, password, cmd)
-            if output: st.code(output)
+            output, error = render_ssh_stream(host, username, password, cmd, label="docker-compose up -d")
             if error: st.error(error)
             if not error: st.success("Docker Compose application deployed.")
         else: st.warning("Please provide docker-compose.yml content and a project path.")
@@ -497,6 +497,9 @@ def display_docker_tasks_detail():
     username = st.session_state.ssh_username
     password = st.session_state.ssh_password
 
+    render_cache_panel()
+    render_perf_panel()
+
     if st.session_state.selected_sub_category == "Container Management":
         display_docker_container_management_tasks(host, username, password)
     elif st.session_state.selected_sub_category == "Image Management":
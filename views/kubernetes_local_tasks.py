@@ -3,6 +3,7 @@ import streamlit as st
 import subprocess
 import time
 import os
+from utils.output_buffer import capture_text_output, render_captured_output
 
 # Helper function to execute local kubectl commands
 def execute_kubectl_command_local(command, working_dir=None):
@@ -169,9 +170,9 @@ def display_k8s_workloads_tasks_content():
     if st.button("Get Pod Logs (kubectl logs)"):
         if pod_name_logs:
             output, error = execute_kubectl_command_local(f"logs {pod_name_logs}")
-            if output: st.code(output)
-            if error: st.error(error)
+            capture_text_output(output, error, key="k8s_pod_logs_output")
         else: st.warning("Please enter a pod name.")
+    render_captured_output("k8s_pod_logs_output")
         
     # 18
     pod_name_exec = st.text_input("Pod Name for Exec", key="k8s_pod_exec_name")
@@ -664,8 +665,8 @@ def display_k8s_troubleshooting_tasks_content():
     # 63
     if st.button("Get All Resources in All Namespaces (kubectl get all -A)"):
         output, error = execute_kubectl_command_local("get all --all-namespaces")
-        if output: st.code(output)
-        if error: st.error(error)
+        capture_text_output(output, error, key="k8s_get_all_output")
+    render_captured_output("k8s_get_all_output")
 
     # 64
     if st.button("Get Top Nodes (kubectl top nodes)"):
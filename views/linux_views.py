@@ -1,10 +1,80 @@
 import streamlit as st
-from utils.ssh_utils import execute_ssh_command
+from utils.ssh_utils import execute_ssh_command, render_ssh_stream, CONNECTION_PROFILES, DEFAULT_PROFILE, set_host_profile
+from utils.ssh_benchmark import benchmark_connection_profiles
+from utils.result_cache import render_cache_panel
+from utils.ssh_metrics import render_perf_panel
+from utils.output_buffer import capture_ssh_output, render_captured_output
+from utils.multi_host import parse_host_list, render_fanout
+from utils.ssh_async import run_ssh_commands_multiplexed, benchmark_multiplexing
+from utils.linux_snapshot import take_snapshot
+from utils.metrics_sampler import render_live_metrics
+from utils.log_search import (SEVERITY_LEVELS, LOG_SEARCH_MAX_MATCHES, build_file_search_command,
+                               build_journal_search_command, run_log_search, render_search_stats)
+from utils.journal_follower import render_journal_follower
+from utils.file_index import render_file_index
+from utils.package_inventory import render_package_inventory
+from utils.service_matrix import render_service_matrix
+from utils.remote_tree import render_remote_tree
+from utils.ranged_reader import render_ranged_reader
+from utils.perf_capture import render_perf_capture
+from utils.net_sweep import render_net_sweep
+from utils.disk_usage import render_disk_usage
+from utils.rolling_update import render_rolling_update
+from utils.merged_tail import render_merged_tail
+from utils.delta_edit import render_delta_editor
+from utils.linux_parsers import load_structured_table, render_structured_table
+from utils.sftp_utils import (sftp_session, remote_makedirs, write_remote_file, upload_bytes, upload_directory,
+                              download_directory, to_sftp_path, streamlit_progress)
+import os
+import io
+import time
+
+# Read-only commands behind the System Information buttons; safe to run concurrently.
+LINUX_SYSTEM_INFO_COMMANDS = {
+    "Hostname": "hostname",
+    "Kernel Version": "uname -a",
+    "Disk Usage": "df -h",
+    "Memory Usage": "free -h",
+    "System Uptime": "uptime",
+    "OS Release Info": "cat /etc/os-release",
+    "CPU Information": "lscpu",
+    "Block Devices": "lsblk",
+}
 
 def display_linux_system_info_tasks(host, username, password):
     st.subheader("Linux System Information")
     st.info("Retrieve basic system details from the remote Linux machine.")
 
+    st.write("### System Snapshot")
+    st.caption("Collects every section below in one SSH round trip and keeps the result, so panels can be re-viewed without contacting the host again.")
+    if 'linux_snapshots' not in st.session_state:
+        st.session_state.linux_snapshots = {}
+    if st.button("Take System Snapshot (single round trip)"):
+        snapshot = take_snapshot(lambda cmd: execute_ssh_command(host, username, password, cmd), LINUX_SYSTEM_INFO_COMMANDS)
+        if snapshot["error"] and not any(sec["output"] for sec in snapshot["sections"].values()):
+            st.error(snapshot["error"])
+        else:
+            st.session_state.linux_snapshots[host] = snapshot
+
+    snapshot = st.session_state.linux_snapshots.get(host)
+    if snapshot:
+        age = int(time.time() - snapshot["taken_at"])
+        st.caption(f"Snapshot of {host} taken {age}s ago in {snapshot['duration_s']:.2f}s. Take a new snapshot to refresh.")
+        panel_labels = list(snapshot["sections"])
+        for row_start in range(0, len(panel_labels), 2):
+            panel_cols = st.columns(2)
+            for col, label in zip(panel_cols, panel_labels[row_start:row_start + 2]):
+                section = snapshot["sections"][label]
+                with col:
+                    with st.expander(label, expanded=True):
+                        if section["output"]: st.code(section["output"])
+                        if section["exit_code"] not in (None, 0): st.error(f"Exited with status {section['exit_code']}")
+                        if section["exit_code"] is None: st.warning("Section missing from snapshot output.")
+        if snapshot["error"]: st.error(snapshot["error"])
+
+    st.markdown("---")
+    st.write("### Individual Commands")
+
     if st.button("Get Hostname"):
         output, error = execute_ssh_command(host, username, password, "hostname")
         if output: st.code(output)
@@ -45,6 +115,40 @@ def display_linux_system_info_tasks(host, username, password):
         if output: st.code(output)
         if error: st.error(error)
 
+    st.markdown("---")
+    st.write("### Structured Tables")
+    st.caption("Fetches machine-readable output once and parses it into a typed table you can filter and sort without re-running the command.")
+    table_cols = st.columns(4)
+    for col, name in zip(table_cols, ["Disk Usage", "Memory Usage", "CPU Information", "Block Devices"]):
+        if col.button(f"Load {name} Table", key=f"load_table_{name}"):
+            load_structured_table(host, username, password, name)
+    for name in ["Disk Usage", "Memory Usage", "CPU Information", "Block Devices"]:
+        render_structured_table(host, name, key=f"table_{name.replace(' ', '_').lower()}")
+
+    st.markdown("---")
+    st.write("### All System Information at Once")
+    st.info("Runs all of the commands above concurrently, each on its own channel of a single SSH connection.")
+    if st.button("Fetch All (multiplexed channels)"):
+        try:
+            with st.spinner(f"Running {len(LINUX_SYSTEM_INFO_COMMANDS)} commands on {host}..."):
+                results = run_ssh_commands_multiplexed(host, username, password, LINUX_SYSTEM_INFO_COMMANDS)
+            for label, result in results.items():
+                with st.expander(f"{label} ({result['latency_s']:.2f}s)", expanded=True):
+                    if result["output"]: st.code(result["output"])
+                    if result["error"]: st.error(result["error"])
+        except Exception as e:
+            st.error(f"SSH error: {e}")
+
+    bench_rounds = st.number_input("Benchmark rounds", min_value=1, max_value=10, value=3, key="linux_bench_rounds")
+    if st.button("Compare Latency (per-call connect vs pooled vs multiplexed)"):
+        try:
+            with st.spinner("Benchmarking..."):
+                bench_df = benchmark_multiplexing(host, username, password, LINUX_SYSTEM_INFO_COMMANDS, rounds=int(bench_rounds))
+            st.dataframe(bench_df, use_container_width=True)
+            st.bar_chart(bench_df.set_index("mode")["mean_s"])
+        except Exception as e:
+            st.error(f"SSH error: {e}")
+
 def display_linux_file_system_tasks(host, username, password):
     st.subheader("Linux File System Management")
     st.info("Perform file and folder operations on the remote Linux machine.")
@@ -55,6 +159,10 @@ def display_linux_file_system_tasks(host, username, password):
         if output: st.code(output)
         if error: st.error(error)
 
+    with st.expander("Browse Directory Tree (SFTP)"):
+        st.caption("Folders are listed one level at a time over the pooled SFTP connection and cached; revisits only check the folder's mtime.")
+        render_remote_tree(host, username, password)
+
     if st.button("Get Current Working Directory (pwd)"):
         output, error = execute_ssh_command(host, username, password, "pwd")
         if output: st.code(output)
@@ -111,18 +219,86 @@ def display_linux_file_system_tasks(host, username, password):
             if error: st.error(error)
         else: st.warning("Please enter a file path.")
 
-    echo_file = st.text_input("File to write to (echo >)", key="echo_file")
+    with st.expander("Read Large File in Pages (byte ranges)"):
+        st.caption("Reads only the selected window via SFTP seek/read (or `sudo dd` with byte skip/count), so multi-GB files are safe to open.")
+        render_ranged_reader(host, username, password)
+
+    echo_file = st.text_input("File to write to", key="echo_file")
     echo_content = st.text_area("Content to write", key="echo_content")
+    echo_sudo = st.checkbox("Write with sudo (for root-owned paths)", key="echo_sudo")
     if st.button("Create/Overwrite File"):
         if echo_file and echo_content:
             st.warning("Writing to restricted files/paths may require `sudo`.")
-            escaped_content = echo_content.replace("'", "'\\''")
-            output, error = execute_ssh_command(host, username, password, f"sudo echo '{escaped_content}' > {echo_file}")
+            output, error = write_remote_file(host, username, password, echo_file, echo_content, use_sudo=echo_sudo,
+                                              progress=streamlit_progress(f"Uploading {echo_file}"))
             if output: st.code(output)
             if error: st.error(error)
             if not error: st.success(f"Content written to '{echo_file}'.")
         else: st.warning("Please enter file path and content.")
 
+    with st.expander("Edit Remote File (delta save)"):
+        st.caption("The file is downloaded once and cached locally by checksum; saving sends only the changed blocks, rebuilt and sha256-verified on the host.")
+        render_delta_editor(host, username, password)
+
+    st.markdown("---")
+    st.write("### File Transfer (SFTP)")
+    upload_target_dir = st.text_input("Remote directory for uploads", key="sftp_upload_dir", value="~")
+    uploaded_files = st.file_uploader("Files to upload", accept_multiple_files=True, key="sftp_upload_files")
+    upload_resume = st.checkbox("Resume partial uploads", key="sftp_upload_resume")
+    if st.button("Upload Files (SFTP)"):
+        if uploaded_files and upload_target_dir:
+            try:
+                with sftp_session(host, username, password) as sftp:
+                    for uploaded in uploaded_files:
+                        remote_path = f"{to_sftp_path(upload_target_dir).rstrip('/')}/{uploaded.name}"
+                        upload_bytes(sftp, uploaded.getvalue(), remote_path, resume=upload_resume,
+                                     progress=streamlit_progress(f"Uploading {uploaded.name}"))
+                st.success(f"Uploaded {len(uploaded_files)} file(s) to '{upload_target_dir}'.")
+            except Exception as e:
+                st.error(f"SFTP upload failed: {e}")
+        else: st.warning("Please choose files and a remote directory.")
+
+    download_remote_path = st.text_input("Remote file to download", key="sftp_download_path")
+    if st.button("Download File (SFTP)"):
+        if download_remote_path:
+            try:
+                buffer = io.BytesIO()
+                with sftp_session(host, username, password) as sftp:
+                    sftp.getfo(to_sftp_path(download_remote_path), buffer,
+                               callback=streamlit_progress(f"Downloading {download_remote_path}"))
+                st.download_button("Save Downloaded File", buffer.getvalue(), file_name=os.path.basename(download_remote_path) or "download")
+            except Exception as e:
+                st.error(f"SFTP download failed: {e}")
+        else: st.warning("Please enter a remote file path.")
+
+    st.caption("Directory transfers use paths on the machine running this dashboard.")
+    dir_local_path = st.text_input("Local directory", key="sftp_local_dir")
+    dir_remote_path = st.text_input("Remote directory", key="sftp_remote_dir")
+    dir_resume = st.checkbox("Resume partial transfers", key="sftp_dir_resume")
+    col_dir1, col_dir2 = st.columns(2)
+    with col_dir1:
+        if st.button("Upload Directory (SFTP)"):
+            if dir_local_path and dir_remote_path and os.path.isdir(dir_local_path):
+                try:
+                    with sftp_session(host, username, password) as sftp:
+                        count, total = upload_directory(sftp, dir_local_path, to_sftp_path(dir_remote_path), resume=dir_resume,
+                                                        progress=streamlit_progress(f"Uploading {dir_local_path}"))
+                    st.success(f"Uploaded {count} file(s), {total / 1024:,.0f} KiB.")
+                except Exception as e:
+                    st.error(f"SFTP upload failed: {e}")
+            else: st.warning("Please enter an existing local directory and a remote directory.")
+    with col_dir2:
+        if st.button("Download Directory (SFTP)"):
+            if dir_local_path and dir_remote_path:
+                try:
+                    with sftp_session(host, username, password) as sftp:
+                        count, total = download_directory(sftp, to_sftp_path(dir_remote_path), dir_local_path, resume=dir_resume,
+                                                          progress=streamlit_progress(f"Downloading {dir_remote_path}"))
+                    st.success(f"Downloaded {count} file(s), {total / 1024:,.0f} KiB.")
+                except Exception as e:
+                    st.error(f"SFTP download failed: {e}")
+            else: st.warning("Please enter a local and a remote directory.")
+
     chmod_path = st.text_input("File/Directory for chmod", key="chmod_path")
     chmod_perms = st.text_input("Permissions (e.g., 755)", key="chmod_perms")
     if st.button("Change Permissions (chmod)"):
@@ -150,10 +326,20 @@ def display_linux_file_system_tasks(host, username, password):
     if st.button("Find Files"):
         if find_path and find_name:
             st.warning("Searching restricted directories may require `sudo`.")
-            output, error = execute_ssh_command(host, username, password, f"sudo find {find_path} -name '{find_name}'")
-            if output: st.code(output)
-            if error: st.error(error)
+            capture_ssh_output(host, username, password, f"sudo find {find_path} -name '{find_name}'", key="linux_find_output",
+                               label=f"find {find_path} -name '{find_name}'")
         else: st.warning("Please enter search path and file name pattern.")
+    render_captured_output("linux_find_output")
+
+    st.markdown("---")
+    st.write("### Indexed File Search")
+    st.caption("One `find -printf` pass is stored in a local SQLite index per host; later refreshes only walk what changed, and queries never touch the host.")
+    render_file_index(host, username, password)
+
+    st.markdown("---")
+    st.write("### Disk Usage Analyzer")
+    st.caption("One `find -printf` pass is summed into directory totals on the host; only those totals and the largest files come back, and drilling down reuses the cached scan.")
+    render_disk_usage(host, username, password)
 
 
 def display_linux_process_management_tasks(host, username, password):
@@ -162,9 +348,12 @@ def display_linux_process_management_tasks(host, username, password):
 
     if st.button("List All Processes (ps aux)"):
         st.warning("Listing all processes may require `sudo` to see details for other users/root processes.")
-        output, error = execute_ssh_command(host, username, password, "sudo ps aux")
-        if output: st.code(output)
-        if error: st.error(error)
+        capture_ssh_output(host, username, password, "sudo ps aux", key="linux_ps_output", label="ps aux")
+    render_captured_output("linux_ps_output")
+
+    if st.button("Load Process Table (sortable, filterable)"):
+        load_structured_table(host, username, password, "Processes", sudo=True)
+    render_structured_table(host, "Processes", key="table_processes")
 
     if st.button("View Top Processes (top -bn1 | head -n 10)"):
         st.warning("Viewing top processes may require `sudo` to see full details.")
@@ -172,6 +361,16 @@ def display_linux_process_management_tasks(host, username, password):
         if output: st.code(output)
         if error: st.error(error)
 
+    st.markdown("---")
+    st.write("### Live Monitoring")
+    st.caption("Samples /proc/stat, meminfo, loadavg, net/dev and diskstats over one persistent SSH channel; only the charts refresh.")
+    render_live_metrics(host, username, password)
+    st.markdown("---")
+    st.write("### Performance Capture")
+    st.caption("Runs vmstat, iostat -x, pidstat and sar side by side in one SSH session, aligns their samples on one time axis and saves each capture locally for later comparison.")
+    render_perf_capture(host, username, password)
+    st.markdown("---")
+
     kill_pid = st.text_input("PID to Kill", key="kill_pid")
     if st.button("Kill Process (kill -9)"):
         if kill_pid:
@@ -215,6 +414,11 @@ def display_linux_network_tasks(host, username, password):
         if output: st.code(output)
         if error: st.error(error)
 
+    if st.button("Load Listening Sockets Table (sortable, filterable)"):
+        st.warning("Requires `sudo` to see process names/PIDs.")
+        load_structured_table(host, username, password, "Listening Sockets", sudo=True)
+    render_structured_table(host, "Listening Sockets", key="table_sockets")
+
     if st.button("List Open Ports (netstat -tuln)"):
         output, error = execute_ssh_command(host, username, password, "sudo netstat -tuln")
         if output: st.code(output)
@@ -244,6 +448,11 @@ def display_linux_network_tasks(host, username, password):
         if output: st.code(output)
         if error: st.error(error)
 
+    st.markdown("---")
+    st.write("### Diagnostics Sweep")
+    st.caption("Runs ping, dig and curl against many targets concurrently on the remote host in one SSH session; curl timings are split into connect, TLS and time to first byte.")
+    render_net_sweep(host, username, password)
+
 def display_linux_user_management_tasks(host, username, password):
     st.subheader("Linux User & Group Management")
     st.info("Manage users and groups on the remote Linux machine.")
@@ -323,8 +532,8 @@ def display_linux_package_management_tasks(host, username, password):
     if st.button("Install Package (sudo dnf install -y)"):
         if package_to_install:
             st.warning(f"This will install '{package_to_install}'. Requires `sudo`. Ensure your user has `NOPASSWD` configured for `sudo` to avoid hanging.")
-            output, error = execute_ssh_command(host, username, password, f"sudo dnf install -y {package_to_install}")
-            if output: st.code(output)
+            output, error = render_ssh_stream(host, username, password, f"sudo dnf install -y {package_to_install}",
+                                               label=f"dnf install -y {package_to_install}")
             if error: st.error(error)
             if not error: st.success(f"Package '{package_to_install}' installation command issued.")
         else: st.warning("Please enter a package name.")
@@ -334,8 +543,8 @@ def display_linux_package_management_tasks(host, username, password):
         if package_to_remove:
             st.warning(f"This will remove '{package_to_remove}'. Confirm to proceed. Requires `sudo`. Ensure your user has `NOPASSWD` configured for `sudo` to avoid hanging.")
             if st.checkbox(f"Confirm removal of {package_to_remove}", key=f"confirm_rm_pkg_{package_to_remove}"):
-                output, error = execute_ssh_command(host, username, password, f"sudo dnf remove -y {package_to_remove}")
-                if output: st.code(output)
+                output, error = render_ssh_stream(host, username, password, f"sudo dnf remove -y {package_to_remove}",
+                                                   label=f"dnf remove -y {package_to_remove}")
                 if error: st.error(error)
                 if not error: st.success(f"Package '{package_to_remove}' removal command issued.")
         else: st.warning("Please enter a package name.")
@@ -343,8 +552,7 @@ def display_linux_package_management_tasks(host, username, password):
     if st.button("Update All Packages (sudo dnf update -y)"):
         st.warning("This will update all packages on the system. Requires `sudo` and can take time. Ensure your user has `NOPASSWD` configured for `sudo` to avoid hanging.")
         if st.checkbox("Confirm full system update", key="confirm_dnf_update"):
-            output, error = execute_ssh_command(host, username, password, "sudo dnf update -y")
-            if output: st.code(output)
+            output, error = render_ssh_stream(host, username, password, "sudo dnf update -y", label="dnf update -y")
             if error: st.error(error)
             if not error: st.success("System update command issued.")
 
@@ -367,10 +575,19 @@ def display_linux_package_management_tasks(host, username, password):
         else: st.warning("Please enter a package name.")
 
     if st.button("Check for Available Updates (dnf check-update)"):
-        output, error = execute_ssh_command(host, username, password, "dnf check-update")
-        if output: st.code(output)
+        output, error = render_ssh_stream(host, username, password, "dnf check-update", label="dnf check-update")
         if error: st.error(error)
 
+    st.markdown("---")
+    st.write("### Rolling Update Across Hosts")
+    st.caption("Pre-warms `dnf makecache` on every host in parallel, then updates in waves with limited concurrency and stops once too many hosts have failed.")
+    render_rolling_update(host, username, password)
+
+    st.markdown("---")
+    st.write("### Package Inventory")
+    st.caption("One `rpm -qa --queryformat` snapshot per host; searching, version lookups and host-to-host diffs are answered locally.")
+    render_package_inventory(host, username, password)
+
 def display_linux_service_management_tasks(host, username, password):
     st.subheader("Linux Service Management (systemctl)")
     st.info("Manage system services on the remote Linux machine. Most operations require `sudo`.")
@@ -422,6 +639,11 @@ def display_linux_service_management_tasks(host, username, password):
             if not error: st.success(f"Service '{service_name_action}' disable command issued.")
         else: st.warning("Please enter a service name.")
 
+    st.markdown("---")
+    st.write("### Service Matrix")
+    st.caption("Checks several units on several hosts with one `systemctl show` per host, run concurrently; bulk actions are one `systemctl` call per host.")
+    render_service_matrix(host, username, password)
+
 def display_linux_log_management_tasks(host, username, password):
     st.subheader("Linux Log Management")
 
@@ -437,10 +659,62 @@ def display_linux_log_management_tasks(host, username, password):
         else: st.warning("Please enter a log file path.")
 
     if st.button("View Journalctl Logs (last 20 lines)"):
-        output, error = execute_ssh_command(host, username, password, "sudo journalctl -xe | tail -n 20")
-        if output: st.code(output)
+        output, error = render_ssh_stream(host, username, password, "sudo journalctl -xe -n 20 --no-pager",
+                                           label="journalctl -xe -n 20")
         if error: st.error(error)
 
+    st.markdown("---")
+    st.write("### Journal Follower")
+    st.caption("Polls `journalctl -o json --after-cursor`, so each refresh only transfers entries newer than the last one seen.")
+    render_journal_follower(host, username, password)
+
+    st.markdown("---")
+    st.write("### Merged Tail Across Hosts")
+    st.caption("Follows the same log file or journal unit on several hosts at once and merges the lines into one feed ordered by their timestamps; each host's buffer is bounded.")
+    render_merged_tail(host, username, password)
+
+    st.markdown("---")
+    st.write("### Log Search")
+    st.caption("Filters run on the remote host (awk over the file, or journalctl's own indexes), so only matching lines cross the network.")
+    search_source = st.radio("Search in", ["Log file(s)", "systemd journal"], horizontal=True, key="log_search_source")
+    search_cols = st.columns([3, 1, 1])
+    search_pattern = search_cols[0].text_input("Regex (POSIX extended, blank matches everything)", key="log_search_pattern")
+    search_severity = search_cols[1].selectbox("Severity at least", ["(any)"] + SEVERITY_LEVELS, key="log_search_severity")
+    search_context = search_cols[2].number_input("Context lines", min_value=0, max_value=20, value=2, key="log_search_context")
+    range_cols = st.columns([1, 2, 2])
+    search_range = range_cols[0].selectbox("Time range", ["Any time", "Last hour", "Last 6 hours", "Last 24 hours",
+                                                          "Last 7 days", "Custom"], key="log_search_range")
+    since_hours = {"Last hour": 1, "Last 6 hours": 6, "Last 24 hours": 24, "Last 7 days": 168}.get(search_range)
+    search_since = search_until = None
+    if search_range == "Custom":
+        search_since = range_cols[1].text_input("From (YYYY-MM-DD HH:MM:SS)", key="log_search_since") or None
+        search_until = range_cols[2].text_input("To (YYYY-MM-DD HH:MM:SS)", key="log_search_until") or None
+    option_cols = st.columns([2, 1, 1])
+    if search_source == "Log file(s)":
+        search_path = option_cols[0].text_input("File path or glob (rotated .gz files are read too)",
+                                                value="/var/log/messages*", key="log_search_path")
+    else:
+        search_unit = option_cols[0].text_input("Unit (optional, e.g. sshd)", key="log_search_unit")
+    search_icase = option_cols[1].checkbox("Ignore case", value=True, key="log_search_icase")
+    search_max = option_cols[2].number_input("Max matches", min_value=1, max_value=100000, value=LOG_SEARCH_MAX_MATCHES,
+                                             key="log_search_max")
+
+    if st.button("Search Logs"):
+        severity = None if search_severity == "(any)" else search_severity
+        options = dict(pattern=search_pattern, severity=severity, since=search_since, until=search_until,
+                       context=int(search_context), max_matches=int(search_max), ignore_case=search_icase,
+                       since_hours=since_hours)
+        if search_source == "Log file(s)":
+            if search_path:
+                run_log_search(host, username, password, build_file_search_command(search_path, **options),
+                               key="linux_log_search", label=f"log search in {search_path}")
+            else: st.warning("Please enter a log file path.")
+        else:
+            run_log_search(host, username, password, build_journal_search_command(unit=search_unit or None, **options),
+                           key="linux_log_search", label="journal search")
+    render_search_stats("linux_log_search")
+    render_captured_output("linux_log_search")
+
     st.markdown("---")
     st.write("### Cron Job Management")
     cron_user = st.text_input("User for Cron Jobs (leave blank for current user)", key="cron_user")
@@ -509,13 +783,52 @@ def display_linux_ssh_key_management_tasks(host, username, password):
     if st.button("Add Public Key to authorized_keys"):
         if public_key_to_add:
             st.warning("This will add the provided public key to the current user's `~/.ssh/authorized_keys` file. Requires correct permissions.")
-            cmd = f"mkdir -p ~/.ssh && chmod 700 ~/.ssh && echo '{public_key_to_add}' >> ~/.ssh/authorized_keys && chmod 600 ~/.ssh/authorized_keys"
-            output, error = execute_ssh_command(host, username, password, cmd)
-            if output: st.code(output)
+            error = ""
+            try:
+                with sftp_session(host, username, password) as sftp:
+                    remote_makedirs(sftp, ".ssh")
+                    sftp.chmod(".ssh", 0o700)
+                    with sftp.open(".ssh/authorized_keys", "a") as keys_file:
+                        keys_file.write(public_key_to_add.strip() + "\n")
+                    sftp.chmod(".ssh/authorized_keys", 0o600)
+            except Exception as e:
+                error = f"SFTP error: {e}"
             if error: st.error(error)
             if not error: st.success("Public key added to authorized_keys.")
         else: st.warning("Please paste a public key.")
 
+def display_linux_multi_host_tasks(host, username, password):
+    st.subheader("Multi-Host Command")
+    st.info("Run one command on many hosts at once. All hosts use the SSH username/password entered on the previous page.")
+
+    if not st.session_state.get('ssh_host_group'):
+        st.session_state.ssh_host_group = [host]
+    hosts_text = st.text_area("Target Hosts (one per line, or comma-separated)", key="multi_host_list",
+                              value="\n".join(st.session_state.ssh_host_group), height=150)
+    hosts = parse_host_list(hosts_text)
+    st.session_state.ssh_host_group = hosts
+    st.caption(f"{len(hosts)} host(s) selected.")
+
+    fanout_command = st.text_input("Command to Run", key="multi_host_command", value="uptime")
+    col_mh1, col_mh2 = st.columns(2)
+    with col_mh1:
+        max_workers = st.slider("Max Concurrent Hosts", 1, 64, 16, key="multi_host_workers")
+    with col_mh2:
+        host_timeout = st.slider("Per-Host Timeout (seconds)", 5, 600, 60, key="multi_host_timeout")
+
+    if st.button("Run on All Hosts"):
+        if hosts and fanout_command:
+            df = render_fanout(hosts, username, password, fanout_command, max_workers=max_workers, timeout=host_timeout)
+            st.session_state.multi_host_results = df
+        else: st.warning("Please enter at least one host and a command.")
+
+    df = st.session_state.get('multi_host_results')
+    if df is not None and not df.empty:
+        ok_count = int((df["status"] == "ok").sum())
+        st.success(f"{ok_count}/{len(df)} hosts succeeded. Slowest: {df['latency_s'].max():.2f}s, median: {df['latency_s'].median():.2f}s.")
+        st.dataframe(df, use_container_width=True)
+        st.download_button("Download Results (CSV)", df.to_csv(index=False), file_name="multi_host_results.csv", mime="text/csv")
+
 def display_linux_sub_menu():
     st.title("Linux Tasks Sub-Categories")
     st.write("Enter your SSH connection details for the RHEL9 machine:")
@@ -533,8 +846,25 @@ def display_linux_sub_menu():
     ssh_username = st.text_input("Username", key="ssh_username_input", value=st.session_state.ssh_username)
     ssh_password = st.text_input("Password", type="password", key="ssh_password_input", value=st.session_state.ssh_password)
 
+    profile_names = list(CONNECTION_PROFILES) + ["Custom"]
+    profile_name = st.selectbox("Connection Profile", profile_names, key="ssh_profile_select",
+                                index=profile_names.index(st.session_state.get('ssh_profile', DEFAULT_PROFILE)),
+                                help="Use a WAN profile for hosts behind slow, high-latency links.")
+    if profile_name == "Custom":
+        with st.expander("Custom Profile Settings", expanded=True):
+            custom_compress = st.checkbox("zlib transport compression", value=True, key="ssh_custom_compress")
+            custom_window_mb = st.number_input("Channel window size (MiB)", min_value=1, max_value=64, value=8, key="ssh_custom_window")
+            custom_packet_kb = st.number_input("Max packet size (KiB)", min_value=4, max_value=32, value=32, key="ssh_custom_packet")
+            custom_gzip = st.checkbox("gzip command output on the remote host", value=False, key="ssh_custom_gzip")
+        selected_profile = {"compress": custom_compress, "window_size": int(custom_window_mb) * 1024 * 1024,
+                            "max_packet_size": int(custom_packet_kb) * 1024, "remote_gzip": custom_gzip}
+    else:
+        selected_profile = profile_name
+
     if st.button("Connect to Linux Machine", key="connect_linux_btn"):
         if ssh_host and ssh_username and ssh_password:
+            set_host_profile(ssh_host, selected_profile)
+            st.session_state.ssh_profile = profile_name
             test_output, test_error = execute_ssh_command(ssh_host, ssh_username, ssh_password, "echo 'Connection Test Successful'")
             if not test_error:
                 st.session_state.ssh_host = ssh_host
@@ -548,6 +878,21 @@ def display_linux_sub_menu():
         else:
             st.error("Please provide all SSH connection details.")
 
+    if st.session_state.ssh_connected:
+        with st.expander("Benchmark Connection Profiles"):
+            st.caption("Runs a read-only command once per profile over fresh connections and compares throughput.")
+            bench_command = st.text_input("Benchmark Command", value="journalctl -n 20000 --no-pager", key="profile_bench_command")
+            bench_rounds = st.number_input("Rounds per profile", min_value=1, max_value=10, value=3, key="profile_bench_rounds")
+            if st.button("Run Profile Benchmark", key="run_profile_bench_btn"):
+                try:
+                    with st.spinner("Benchmarking connection profiles..."):
+                        bench_df = benchmark_connection_profiles(st.session_state.ssh_host, st.session_state.ssh_username,
+                                                                 st.session_state.ssh_password, bench_command, rounds=int(bench_rounds))
+                    st.dataframe(bench_df, use_container_width=True)
+                    st.bar_chart(bench_df.set_index("profile")["throughput_kib_s"])
+                except Exception as e:
+                    st.error(f"Benchmark failed: {e}")
+
     st.markdown("---")
     st.write("Select a sub-category to view specific tasks.")
 
@@ -615,12 +960,17 @@ def display_linux_sub_menu():
             st.session_state.selected_sub_category = "Firewall Management"
             st.rerun()
 
-    col_l1_r4, _, _ = st.columns(3)
+    col_l1_r4, col_l2_r4, _ = st.columns(3)
     with col_l1_r4:
         if st.button("SSH Key Management", key="linux_ssh_key_mgmt_sub_btn", disabled=not st.session_state.ssh_connected):
             st.session_state.current_view = "linux_tasks_detail"
             st.session_state.selected_sub_category = "SSH Key Management"
             st.rerun()
+    with col_l2_r4:
+        if st.button("Multi-Host Command", key="linux_multi_host_sub_btn", disabled=not st.session_state.ssh_connected):
+            st.session_state.current_view = "linux_tasks_detail"
+            st.session_state.selected_sub_category = "Multi-Host Command"
+            st.rerun()
 
 def display_linux_tasks_detail():
     st.title(f"{st.session_state.selected_category} - {st.session_state.selected_sub_category}")
@@ -640,6 +990,9 @@ def display_linux_tasks_detail():
     username = st.session_state.ssh_username
     password = st.session_state.ssh_password
 
+    render_cache_panel()
+    render_perf_panel()
+
     if st.session_state.selected_sub_category == "System Information":
         display_linux_system_info_tasks(host, username, password)
     elif st.session_state.selected_sub_category == "File System Management":
@@ -659,4 +1012,6 @@ def display_linux_tasks_detail():
     elif st.session_state.selected_sub_category == "Firewall Management":
         display_linux_firewall_tasks(host, username, password)
     elif st.session_state.selected_sub_category == "SSH Key Management":
-        display_linux_ssh_key_management_tasks(host, username, password)
\ No newline at end of file
+        display_linux_ssh_key_management_tasks(host, username, password)
+    elif st.session_state.selected_sub_category == "Multi-Host Command":
+        display_linux_multi_host_tasks(host, username, password)
\ No newline at end of file